@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmarky generatoru prikladu, rozvrzeni listu a ukladani workbooku.
+
+Meri:
+    - gen_add, gen_sub, gen_mul, gen_div na jeden priklad pro max_digits 1-5,
+      bez omezeni a s max_result / no_zero / no_one
+    - make_problem_text na jeden priklad
+    - rozvrzeni a zarovnani mrizky (layout_grid) pro matice count x cols
+    - ulozeni workbooku (wb.save) pro matice count x cols
+
+Vysledky se zapisuji jako JSON. Rezim porovnani oznaci zpomaleni oproti
+ulozenemu baseline vetsi nez zadany prah a skonci s navratovym kodem 1.
+
+Pouziti:
+    python benchmarks/bench.py
+    python benchmarks/bench.py --out vysledky.json
+    python benchmarks/bench.py --compare benchmarks/baseline.json --threshold 0.2
+    python benchmarks/bench.py --update-baseline
+    python benchmarks/bench.py --filter gen/mul --quick
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+import cli  # noqa: E402
+
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+
+GENERATORS = {
+    "add": cli.gen_add,
+    "sub": cli.gen_sub,
+    "mul": cli.gen_mul,
+    "div": cli.gen_div,
+}
+
+# Varianty omezeni: nazev -> funkce vracejici kwargs pro dany pocet cislic
+VARIANTS = {
+    "plain": lambda digits: {},
+    "max": lambda digits: {"max_result": 10 ** digits // 2},
+    "no_zero": lambda digits: {"no_zero": True},
+    "no_one": lambda digits: {"no_one": True},
+}
+
+LAYOUT_MATRIX = [(500, 3), (5000, 3), (5000, 10), (50000, 10)]
+SAVE_MATRIX = [(500, 3), (5000, 3), (20000, 10)]
+
+
+def _problems(count, seed=0):
+    """Pripravi priklady (ProblemSet) pro benchmarky rozvrzeni a ukladani."""
+    plan = cli.GenerationPlan(list("+-*/"), max_digits=3)
+    rng = random.Random(seed)
+    return cli.ProblemSet.from_records(plan.sample_many(count, rng))
+
+
+def _cases():
+    """
+    Sestavi seznam benchmarku.
+
+    Returns:
+        List trojic (nazev, setup, pocet prikladu na volani); setup() vrati
+        merenou funkci bez argumentu (priprava dat se tak dela jen pro
+        benchmarky, ktere se skutecne spusti)
+    """
+    cases = []
+    for op, gen in GENERATORS.items():
+        for digits in range(1, 6):
+            for variant, kwargs_for in VARIANTS.items():
+                kwargs = dict(kwargs_for(digits), max_digits=digits, rng=random.Random(0))
+                cases.append((f"gen/{op}/d{digits}/{variant}", lambda gen=gen, kw=kwargs: lambda: gen(**kw), 1))
+
+    for digits in range(1, 6):
+        kwargs = {"max_digits": digits, "rng": random.Random(0)}
+        cases.append((
+            f"make_problem_text/d{digits}",
+            lambda kw=kwargs: lambda: cli.make_problem_text(list("+-*/"), **kw),
+            1,
+        ))
+
+    for count, cols in LAYOUT_MATRIX:
+        for fill in ("down", "across"):
+            cases.append((f"layout/{count}x{cols}/{fill}", _layout_case(count, cols, fill), count))
+
+    for count, cols in SAVE_MATRIX:
+        cases.append((f"save/{count}x{cols}", lambda n=count, c=cols: _save_case(n, c), count))
+    return cases
+
+
+def _layout_case(count, cols, fill):
+    """Vrati setup pro benchmark rozvrzeni mrizky."""
+    def setup():
+        problems = _problems(count)
+        return lambda: cli.layout_grid(problems, cols, fill)
+
+    return setup
+
+
+def _save_case(count, cols):
+    """Vrati funkci, ktera ulozi predem sestaveny workbook (meri jen wb.save)."""
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    cli._register_styles(wb)
+    cli._write_sheet(wb.active, _problems(count), cols, "down", "Benchmark")
+    path = os.path.join(tempfile.gettempdir(), f"bench_save_{count}x{cols}.xlsx")
+    return lambda: wb.save(path)
+
+
+def run(name_filter=None, repeat=5):
+    """
+    Spusti benchmarky.
+
+    Args:
+        name_filter: Volitelny podretezec nazvu benchmarku
+        repeat: Pocet opakovani mereni; pouzije se nejlepsi cas
+
+    Returns:
+        Slovnik nazev -> {"us_per_problem", "us_per_call", "calls"}
+    """
+    results = {}
+    for name, setup, problems_per_call in _cases():
+        if name_filter and name_filter not in name:
+            continue
+        timer = timeit.Timer(setup())
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+        results[name] = {
+            "us_per_problem": round(best * 1e6 / problems_per_call, 4),
+            "us_per_call": round(best * 1e6, 2),
+            "calls": number,
+        }
+        print(f"{name:40s} {results[name]['us_per_problem']:12.3f} us/priklad")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Porovna vysledky s baseline.
+
+    Args:
+        results: Vysledky aktualniho behu (viz run)
+        baseline: Vysledky baseline ve stejnem formatu
+        threshold: Povolene relativni zpomaleni (napr. 0.2 = 20 %)
+
+    Returns:
+        List nazvu benchmarku, ktere se zpomalily vic nez o threshold
+    """
+    regressions = []
+    print(f"\n{'benchmark':40s} {'baseline':>12s} {'aktualne':>12s} {'zmena':>8s}")
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]["us_per_problem"]
+        new = current["us_per_problem"]
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  ZPOMALENI"
+            regressions.append(name)
+        print(f"{name:40s} {old:12.3f} {new:12.3f} {change:+7.1%}{flag}")
+    return regressions
+
+
+def parse_args(argv=None):
+    """
+    Parsuje argumenty benchmarku.
+
+    Returns:
+        Namespace s argumenty
+    """
+    p = argparse.ArgumentParser(
+        prog="python benchmarks/bench.py",
+        description=f"Benchmarky generatoru matematickych prikladu | v{cli.__version__}",
+    )
+    p.add_argument("--out", type=str, default=None, metavar="SOUBOR", help="Ulozit vysledky jako JSON")
+    p.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        metavar="SOUBOR",
+        help="Porovnat s ulozenym baseline (JSON) a oznacit zpomaleni",
+    )
+    p.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        metavar="PODIL",
+        help="Povolene relativni zpomaleni pri porovnani. Vychozi: 0.2 (20 %%)",
+    )
+    p.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help=f"Prepsat ulozeny baseline ({os.path.relpath(BASELINE_FILE)}) aktualnimi vysledky",
+    )
+    p.add_argument("--filter", type=str, default=None, metavar="TEXT", help="Spustit jen benchmarky obsahujici TEXT")
+    p.add_argument("--quick", action="store_true", help="Rychle mereni (1 opakovani misto 5)")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    """Hlavni entry point benchmarku."""
+    args = parse_args(argv)
+    results = run(name_filter=args.filter, repeat=1 if args.quick else 5)
+    report = {
+        "meta": {
+            "version": cli.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    for path in filter(None, [args.out, BASELINE_FILE if args.update_baseline else None]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Vysledky ulozeny: {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nZpomaleni nad {args.threshold:.0%}: {len(regressions)} benchmarku")
+            sys.exit(1)
+        print("\nBez zpomaleni.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Zatezovy test lokalni HTTP sluzby (python src/main.py serve).
+
+Posila na /generate zadany pocet pozadavku se zadanou soubeznosti (asyncio,
+jen standardni knihovna) a vypise propustnost, latence a pocty odpovedi
+podle HTTP kodu. Na konci nacte /metrics serveru pro porovnani.
+
+Pouziti:
+    python src/main.py serve --port 8000 &
+    python benchmarks/load_server.py
+    python benchmarks/load_server.py --requests 500 --concurrency 16 --params "count=200&writer=fast"
+    python benchmarks/load_server.py --out zatez.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+async def request(host, port, target, timeout):
+    """
+    Posle jeden GET pozadavek a precte celou odpoved.
+
+    Returns:
+        Tuple (HTTP kod, telo odpovedi)
+    """
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    status = int(data.split(b" ", 2)[1]) if data.startswith(b"HTTP/") else 0
+    return status, data.partition(b"\r\n\r\n")[2]
+
+
+async def run_load(url, params, total, concurrency, timeout):
+    """
+    Spusti zatezovy test.
+
+    Args:
+        url: Zakladni URL serveru (napr. http://127.0.0.1:8000)
+        params: Query string pro /generate (bez seed - ten se lisi pro kazdy pozadavek)
+        total: Celkovy pocet pozadavku
+        concurrency: Pocet soubeznych klientu
+        timeout: Casovy limit jednoho pozadavku v sekundach
+
+    Returns:
+        Slovnik s vysledky (propustnost, latence, kody odpovedi, /metrics serveru)
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    latencies = []
+    statuses = {}
+    received = 0
+    next_index = iter(range(total))
+
+    async def worker():
+        nonlocal received
+        for i in next_index:
+            target = f"/generate?{params}&seed={i}" if params else f"/generate?seed={i}"
+            start = time.perf_counter()
+            try:
+                status, body = await request(host, port, target, timeout)
+            except (OSError, asyncio.TimeoutError):
+                status, body = 0, b""
+            latencies.append(time.perf_counter() - start)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            received += len(body)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+
+    def percentile(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4) if ordered else None
+
+    _, metrics = await request(host, port, "/metrics", timeout)
+
+    return {
+        "url": url,
+        "params": params,
+        "requests": total,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 4),
+        "requests_per_second": round(total / wall, 2) if wall else 0.0,
+        "megabytes_received": round(received / 1e6, 3),
+        "statuses": statuses,
+        "latency_seconds": {
+            "mean": round(sum(ordered) / len(ordered), 4) if ordered else None,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": round(ordered[-1], 4) if ordered else None,
+        },
+        "server_metrics": json.loads(metrics),
+    }
+
+
+def parse_args(argv=None):
+    """
+    Parsuje argumenty zatezoveho testu.
+
+    Returns:
+        Namespace s argumenty
+    """
+    p = argparse.ArgumentParser(
+        prog="python benchmarks/load_server.py",
+        description="Zatezovy test lokalni HTTP sluzby generatoru prikladu",
+    )
+    p.add_argument("--url", type=str, default="http://127.0.0.1:8000", help="Adresa serveru. Vychozi: http://127.0.0.1:8000")
+    p.add_argument("--requests", type=int, default=200, metavar="CISLO", help="Celkovy pocet pozadavku. Vychozi: 200")
+    p.add_argument("--concurrency", type=int, default=8, metavar="CISLO", help="Pocet soubeznych klientu. Vychozi: 8")
+    p.add_argument(
+        "--params",
+        type=str,
+        default="count=90",
+        metavar="QUERY",
+        help="Parametry /generate jako query string. Vychozi: 'count=90'",
+    )
+    p.add_argument("--timeout", type=float, default=120.0, metavar="SEKUNDY", help="Limit jednoho pozadavku. Vychozi: 120")
+    p.add_argument("--out", type=str, default=None, metavar="SOUBOR", help="Ulozit vysledky jako JSON")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    """Hlavni entry point zatezoveho testu."""
+    args = parse_args(argv)
+    try:
+        report = asyncio.run(run_load(args.url, args.params, args.requests, args.concurrency, args.timeout))
+    except OSError as e:
+        print(f"Chyba: server {args.url} neodpovida ({e})", file=sys.stderr)
+        sys.exit(2)
+
+    latency = report["latency_seconds"]
+    print(f"Pozadavku: {report['requests']} ({report['concurrency']} soubezne) za {report['wall_seconds']:.2f} s "
+          f"= {report['requests_per_second']:.1f} pozadavku/s")
+    print(f"Latence: prumer {latency['mean']} s, p50 {latency['p50']} s, p95 {latency['p95']} s, "
+          f"p99 {latency['p99']} s, max {latency['max']} s")
+    print(f"Odpovedi: {report['statuses']}, prijato {report['megabytes_received']} MB")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Vysledky ulozeny: {args.out}")
+    if set(report["statuses"]) != {"200"}:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
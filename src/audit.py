@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+Audit generatoru: rozlozeni, opakovani, poruseni omezeni a propustnost.
+
+Pro kazdou operaci (a pro jejich smes) vygeneruje miliony prikladu stejnou
+cestou jako generate_sheet pri streamovani (GenerationPlan, bloky po
+STREAM_CHUNK_ROWS, engine python nebo numpy) a prubezne je agreguje:
+histogramy operandu a vysledku, rozlozeni poctu cislic, prenosu
+u scitani a vypujcek u odcitani, opakovani prikladu v ramci listu,
+odhad poctu ruznych prikladu (HyperLogLog), poruseni omezeni a pruchody
+nahradnimi vetvemi generatoru. Priklady se nikam neukladaji - pamet
+zavisi jen na poctu binu histogramu, velikosti listu a jednom bloku,
+takze i 10 milionu prikladu se vejde do nekolika MB.
+
+Omezeni se kontroluji nezavisle na generatorech podle dokumentovanych
+pravidel (viz README, "Jak funguji --digits a --max spolecne"):
+operandy (u deleni i vysledek) maji nejvyse max_digits cislic, zadne
+cislo prikladu neni vetsi nez max_result, vysledky jsou nezaporne a
+spravne (deleni beze zbytku), no_zero a no_one vylucuji nulu a jednicku.
+
+Pouziti:
+    python src/main.py audit --ops +-*/ --digits 2 --draws 1000000
+    python src/main.py audit --ops * --digits 1 --max 3 --no-one --json audit.json
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+from cli import (
+    OP_SYMBOLS, SAMPLER_MAP, STREAM_CHUNK_ROWS, GenerationPlan, _chunks, _python_take, borrow_count, carry_count,
+    digit_count, numpy_available, numpy_fits, use_numpy_engine, __version__,
+)
+
+# Pocet registru odhadu ruznych prikladu je 2**DISTINCT_PRECISION (jeden bajt na registr)
+DISTINCT_PRECISION = 14
+
+# Nejvyse tolik prikladu se uklada jako ukazka kazdeho druhu poruseni
+VIOLATION_EXAMPLES = 5
+
+# Druhy poruseni omezeni v poradi vypisu
+VIOLATIONS = ("wrong_result", "negative", "over_max_digits", "over_max_result", "zero", "one")
+
+_MASK64 = (1 << 64) - 1
+
+
+class DistinctCounter:
+    """
+    Odhad poctu ruznych hodnot (HyperLogLog) s pevnou pameti.
+
+    Hodnoty se predavaji jako 64bitove hashe (viz mix64); relativni chyba
+    odhadu je priblizne 1.04 / sqrt(2**precision), pro vychozi presnost 0.8 %.
+
+    Args:
+        precision: Pocet bitu indexu registru (pamet je 2**precision bajtu)
+    """
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision=DISTINCT_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, h):
+        """Zapocita hodnotu s 64bitovym hashem h."""
+        rest = 64 - self.precision
+        index = h >> rest
+        rank = rest - (h & ((1 << rest) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self):
+        """Vrati odhad poctu ruznych zapocitanych hodnot."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        # Pro male pocty je presnejsi linearni odhad podle prazdnych registru
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+
+def mix64(h):
+    """Promicha bity 64bitove hodnoty (finalizer splitmix64) pro DistinctCounter."""
+    h &= _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return h ^ (h >> 31)
+
+
+def constraint_limits(max_result=None, max_digits=None):
+    """
+    Vrati meze, ktere musi splnovat kazdy priklad (nezavisle na generatorech).
+
+    Returns:
+        Tuple (max_number, max_result); None znamena bez omezeni. Bez obou
+        parametru plati vychozi 2 cislice jako u generatoru.
+    """
+    if max_result is None and max_digits is None:
+        return 99, 99
+    max_number = 10 ** max_digits - 1 if max_digits is not None else None
+    return max_number, max_result
+
+
+def histogram_bound(ops, max_result=None, max_digits=None):
+    """
+    Vrati horni meze histogramu operandu a vysledku pro dane operace.
+
+    Returns:
+        Tuple (mez operandu, mez vysledku); hodnoty nad mezi se v histogramu
+        pocitaji jako "outside"
+    """
+    max_number, max_result = constraint_limits(max_result, max_digits)
+    if max_result is not None:
+        operand = max_result if max_number is None else min(max_number, max_result)
+        return operand, max_result
+    results = {"+": 2 * max_number, "-": max_number, "×": max_number * max_number, "/": max_number}
+    return max_number, max(results[SAMPLER_MAP[o].symbol] for o in ops)
+
+
+class ColumnStats:
+    """
+    Prubezne statistiky jednoho sloupce (operand nebo vysledek).
+
+    Args:
+        bound: Horni mez histogramu (viz histogram_bound)
+        bins: Pocet binu histogramu stejne sirky nad intervalem 0 .. bound
+    """
+
+    __slots__ = ("low", "high", "total", "width", "counts", "outside", "digits")
+
+    def __init__(self, bound, bins):
+        self.low = None
+        self.high = None
+        self.total = 0
+        self.width = max(1, -(-(bound + 1) // bins))
+        self.counts = [0] * bins
+        self.outside = 0
+        self.digits = {}
+
+    def add_many(self, values):
+        """
+        Zapocita vsechny hodnoty bloku.
+
+        Returns:
+            Tuple (minimum, maximum) bloku; pro prazdny blok (0, 0)
+        """
+        if not values:
+            return 0, 0
+        low = min(values)
+        high = max(values)
+        self.low = low if self.low is None else min(self.low, low)
+        self.high = high if self.high is None else max(self.high, high)
+        self.total += sum(values)
+        width = self.width
+        counts = self.counts
+        bins = len(counts)
+        digits = self.digits
+        for v in values:
+            i = v // width
+            if 0 <= i < bins:
+                counts[i] += 1
+            else:
+                self.outside += 1
+            d = digit_count(v) if v >= 0 else 0
+            digits[d] = digits.get(d, 0) + 1
+        return low, high
+
+    def report(self, n):
+        """Vrati statistiky jako slovnik serializovatelny do JSON."""
+        return {
+            "min": self.low,
+            "max": self.high,
+            "mean": round(self.total / n, 4) if n else None,
+            "digits": {str(d): c for d, c in sorted(self.digits.items())},
+            "histogram": {"bin_width": self.width, "counts": self.counts, "outside": self.outside},
+        }
+
+
+class ConfigAudit:
+    """
+    Prubezna agregace prikladu jedne konfigurace (plan s danymi operacemi).
+
+    Args:
+        plan: GenerationPlan auditovane konfigurace
+        sheet_size: Pocet prikladu na listu (pro opakovani v ramci listu)
+        max_result: Maximalni vysledek (jako u generate_sheet)
+        max_digits: Maximalni pocet cislic (jako u generate_sheet)
+        no_zero: Kontrolovat, ze priklady neobsahuji nulu
+        no_one: Kontrolovat, ze nasobeni a deleni neobsahuji jednicku
+        bins: Pocet binu histogramu
+    """
+
+    def __init__(self, plan, sheet_size, max_result=None, max_digits=None, no_zero=False, no_one=False, bins=20):
+        self.plan = plan
+        self.sheet_size = max(1, sheet_size)
+        self.max_number, self.max_result = constraint_limits(max_result, max_digits)
+        self.no_zero = no_zero
+        self.no_one = no_one
+        operand_bound, result_bound = histogram_bound(plan.ops, max_result, max_digits)
+        self.columns = {
+            "a": ColumnStats(operand_bound, bins),
+            "b": ColumnStats(operand_bound, bins),
+            "result": ColumnStats(result_bound, bins),
+        }
+        self.draws = 0
+        self.ops = {}
+        self.carries = {}
+        self.borrows = {}
+        self.violations = dict.fromkeys(VIOLATIONS, 0)
+        self.examples = {}
+        self.sheet_duplicates = 0
+        self.distinct = DistinctCounter()
+        self._sheet = set()
+        self._position = 0
+
+    def add(self, problems):
+        """
+        Zapocita blok prikladu.
+
+        Args:
+            problems: ProblemSet (blok z take stejne jako pri streamovani)
+        """
+        low_a, high_a = self.columns["a"].add_many(problems.a)
+        low_b, high_b = self.columns["b"].add_many(problems.b)
+        low_r, high_r = self.columns["result"].add_many(problems.result)
+        if not len(problems):
+            return
+
+        # Meze se overi pro cely blok najednou; po jednom se priklady kontroluji
+        # jen v bloku, ktery je porusuje (a vzdy spravnost vysledku a jednicka)
+        max_number = self.max_number
+        suspect = (
+            min(low_a, low_b, low_r) < (1 if self.no_zero else 0)
+            or (max_number is not None and (max(high_a, high_b) > max_number
+                                            or (high_r > max_number and 3 in problems.op)))
+            or (self.max_result is not None and max(high_a, high_b, high_r) > self.max_result)
+        )
+        no_one = self.no_one
+        ops = self.ops
+        carries = self.carries
+        borrows = self.borrows
+        sheet = self._sheet
+        sheet_size = self.sheet_size
+        position = self._position
+        duplicates = self.sheet_duplicates
+        add_distinct = self.distinct.add
+        check = self._check
+        for a, o, b, r in zip(problems.a, problems.op, problems.b, problems.result):
+            ops[o] = ops.get(o, 0) + 1
+            if o == 0:
+                k = carry_count(a, b) if a >= 0 and b >= 0 else -1
+                carries[k] = carries.get(k, 0) + 1
+                ok = a + b == r
+            elif o == 1:
+                k = borrow_count(a, b) if a >= b >= 0 else -1
+                borrows[k] = borrows.get(k, 0) + 1
+                ok = a - b == r
+            elif o == 2:
+                ok = a * b == r and not (no_one and (a == 1 or b == 1))
+            else:
+                ok = b != 0 and a == b * r and not (no_one and b == 1)
+            if suspect or not ok:
+                check(a, o, b, r)
+
+            # Opakovani v ramci listu: mnozina se vyprazdni na zacatku kazdeho listu
+            key = (a, o, b)
+            if position == sheet_size:
+                sheet.clear()
+                position = 0
+            position += 1
+            if key in sheet:
+                duplicates += 1
+            else:
+                sheet.add(key)
+            add_distinct(mix64(hash(key)))
+        self._position = position
+        self.sheet_duplicates = duplicates
+        self.draws += len(problems)
+
+    def _check(self, a, o, b, r):
+        """Zapocita poruseni omezeni jednoho prikladu."""
+        symbol = OP_SYMBOLS[o]
+        found = []
+        if o == 0:
+            correct = a + b == r
+        elif o == 1:
+            correct = a - b == r
+        elif o == 2:
+            correct = a * b == r
+        else:
+            correct = b != 0 and a == b * r
+        if not correct:
+            found.append("wrong_result")
+        if a < 0 or b < 0 or r < 0:
+            found.append("negative")
+        max_number = self.max_number
+        if max_number is not None and (a > max_number or b > max_number or (o == 3 and r > max_number)):
+            found.append("over_max_digits")
+        if self.max_result is not None and max(a, b, r) > self.max_result:
+            found.append("over_max_result")
+        if self.no_zero and (a == 0 or b == 0 or r == 0):
+            found.append("zero")
+        if self.no_one and ((o == 2 and (a == 1 or b == 1)) or (o == 3 and b == 1)):
+            found.append("one")
+        for name in found:
+            self.violations[name] += 1
+            examples = self.examples.setdefault(name, [])
+            text = f"{a} {symbol} {b} = {r}"
+            if len(examples) < VIOLATION_EXAMPLES and text not in examples:
+                examples.append(text)
+
+    def report(self, sampling_seconds, audit_seconds):
+        """
+        Sestavi report konfigurace.
+
+        Args:
+            sampling_seconds: Cas straveny jen generovanim prikladu
+            audit_seconds: Celkovy cas auditu konfigurace vcetne agregace
+
+        Returns:
+            Slovnik serializovatelny do JSON
+        """
+        n = self.draws
+        space = self.plan.space().size
+        full, rest = divmod(n, self.sheet_size)
+        expected_duplicates = full * _expected_repeats(space, self.sheet_size) + _expected_repeats(space, rest)
+        return {
+            "ops": "".join(dict.fromkeys(SAMPLER_MAP[o].symbol for o in self.plan.ops)),
+            "draws": n,
+            "sampling_seconds": round(sampling_seconds, 4),
+            "problems_per_second": round(n / sampling_seconds, 1) if sampling_seconds > 0 else None,
+            "audit_seconds": round(audit_seconds, 4),
+            "space_size": space,
+            "distinct_estimate": round(self.distinct.estimate()),
+            "distinct_expected_if_uniform": round(_expected_distinct(space, n)),
+            "sheet_size": self.sheet_size,
+            "sheet_duplicate_rate": round(self.sheet_duplicates / n, 6) if n else None,
+            "sheet_duplicate_rate_if_uniform": round(expected_duplicates / n, 6) if n else None,
+            "ops_share": {OP_SYMBOLS[o]: round(c / n, 6) for o, c in sorted(self.ops.items())},
+            "carries": {str(k): c for k, c in sorted(self.carries.items())},
+            "borrows": {str(k): c for k, c in sorted(self.borrows.items())},
+            "columns": {name: column.report(n) for name, column in self.columns.items()},
+            "violations": self.violations,
+            "violation_examples": self.examples,
+            "fallbacks": self.plan.fallback_counts(),
+        }
+
+
+def _expected_distinct(space, n):
+    """Ocekavany pocet ruznych prikladu z n tahu rovnomerne ze space moznosti."""
+    if space <= 0:
+        return 0.0
+    return space * -math.expm1(n * math.log1p(-1 / space)) if space > 1 else min(n, 1)
+
+
+def _expected_repeats(space, n):
+    """Ocekavany pocet opakovani na listu s n priklady pri rovnomernem vyberu."""
+    return n - _expected_distinct(space, n)
+
+
+def audit_config(
+    ops, draws, sheet_size=90, max_result=None, max_digits=None, no_zero=False, no_one=False,
+    engine="python", seed=None, bins=20, difficulty=None,
+):
+    """
+    Vygeneruje a zagreguje draws prikladu jedne konfigurace.
+
+    Priklady vznikaji stejne jako pri streamovanem generate_sheet: plan
+    se vytvori jednou a po blocich STREAM_CHUNK_ROWS se vola take (cisty
+    Python nebo NumPy engine). Meri se zvlast cas generovani a celkovy cas.
+
+    Args:
+        ops: Seznam operaci ('+', '-', '*', '/')
+        draws: Pocet prikladu
+        sheet_size: Pocet prikladu na listu (pro opakovani v ramci listu)
+        engine: "python" nebo "numpy" (bez NumPy nebo pri mezich nad int64
+            se pouzije "python")
+        seed: Volitelny seed pro reprodukovatelny audit
+        bins: Pocet binu histogramu
+        difficulty: Volitelna obtiznost (viz difficulty.py); generuje se
+            pak vzdy cistym Python enginem jako v generate_sheet
+
+    Returns:
+        Report konfigurace (viz ConfigAudit.report)
+
+    Raises:
+        ValueError: Pokud nejsou zadany platne operace nebo pro limity
+            neexistuje zadny priklad
+    """
+    start = time.perf_counter()
+    plan = GenerationPlan(
+        ops, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one, difficulty=difficulty,
+    )
+    if engine == "numpy" and numpy_available() and plan.difficulty is None and numpy_fits(plan):
+        import numpy_engine
+
+        source = numpy_engine.make_generator(seed)
+        take = numpy_engine.problem_sampler(plan)
+    else:
+        source = random.Random(seed)
+        take = _python_take(plan)
+
+    stats = ConfigAudit(plan, sheet_size, max_result, max_digits, no_zero, no_one, bins)
+    sampling = 0.0
+    for n in _chunks(draws, STREAM_CHUNK_ROWS):
+        t = time.perf_counter()
+        problems = take(source, n)
+        sampling += time.perf_counter() - t
+        stats.add(problems)
+    return stats.report(sampling, time.perf_counter() - start)
+
+
+def run_audit(
+    ops, draws, sheet_size=90, max_result=None, max_digits=None, no_zero=False, no_one=False,
+    engine="python", seed=None, bins=20, difficulty=None,
+):
+    """
+    Audituje kazdou operaci zvlast a pri vice operacich i jejich smes.
+
+    Returns:
+        Slovnik s parametry auditu a reporty konfiguraci (viz audit_config)
+
+    Raises:
+        ValueError: Stejne jako audit_config
+    """
+    symbols = list(dict.fromkeys(SAMPLER_MAP[o].symbol for o in ops if o in SAMPLER_MAP))
+    # Symbol nasobeni "×" neni klicem SAMPLER_MAP, plany se tvori z kanonickych klicu
+    keys = {"+": "+", "-": "-", "×": "*", "/": "/"}
+    configs = [[keys[s]] for s in symbols]
+    if len(configs) > 1:
+        configs.append(list(ops))
+    if not configs:
+        raise ValueError("Zadna platna operace (+ - * /).")
+
+    kwargs = dict(
+        sheet_size=sheet_size, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one,
+        engine=engine, seed=seed, bins=bins, difficulty=difficulty,
+    )
+    return {
+        "version": __version__,
+        "engine": (
+            "numpy" if engine == "numpy" and not difficulty
+            and use_numpy_engine(ops, max_result, max_digits, no_zero, no_one) else "python"
+        ),
+        "seed": seed,
+        "params": {"ops": "".join(ops), "max_result": max_result, "max_digits": max_digits,
+                   "no_zero": no_zero, "no_one": no_one, "difficulty": difficulty},
+        "configs": [audit_config(config, draws, **kwargs) for config in configs],
+    }
+
+
+def _percent(part, whole):
+    return f"{100 * part / whole:.2f} %" if whole else "-"
+
+
+def format_report(report):
+    """
+    Vytvori citelny souhrn reportu auditu.
+
+    Returns:
+        List radku textu
+    """
+    lines = []
+    for c in report["configs"]:
+        n = c["draws"]
+        lines.append(
+            f"{c['ops']}: {n} prikladu, generovani {c['problems_per_second']:.0f} prikladu/s "
+            f"(audit celkem {c['audit_seconds']:.2f} s)"
+        )
+        lines.append(
+            f"    ruznych ~{c['distinct_estimate']} z {c['space_size']} moznych "
+            f"(pri rovnomernem vyberu {c['distinct_expected_if_uniform']}), "
+            f"opakovani na listu {100 * c['sheet_duplicate_rate']:.2f} % "
+            f"(pri rovnomernem vyberu {100 * c['sheet_duplicate_rate_if_uniform']:.2f} %)"
+        )
+        result = c["columns"]["result"]
+        lines.append(
+            f"    vysledek {result['min']} .. {result['max']}, prumer {result['mean']}, "
+            f"cislic: {', '.join(f'{d}: {_percent(k, n)}' for d, k in result['digits'].items())}"
+        )
+        for name, label in (("carries", "prenosy"), ("borrows", "vypujcky")):
+            total = sum(c[name].values())
+            if total:
+                lines.append(f"    {label}: {', '.join(f'{k}: {_percent(v, total)}' for k, v in c[name].items())}")
+        used = {k: v for k, v in c["fallbacks"].items() if v}
+        if used:
+            lines.append(f"    nahradni vetve: {', '.join(f'{k} {v}x' for k, v in used.items())}")
+        for name, count in c["violations"].items():
+            if count:
+                lines.append(
+                    f"    PORUSENI {name}: {count}x ({_percent(count, n)}), "
+                    f"napr. {'; '.join(c['violation_examples'][name])}"
+                )
+    return lines
+
+
+def parse_args(argv=None):
+    """
+    Parsuje argumenty prikazu audit.
+
+    Returns:
+        Namespace s argumenty
+    """
+    p = argparse.ArgumentParser(
+        prog="python src/main.py audit",
+        description=f"Audit generatoru: rozlozeni, opakovani, poruseni omezeni a propustnost | v{__version__}",
+    )
+    p.add_argument("--ops", type=str, default="+-*/", metavar="OPERACE", help="Auditovane operace. Vychozi: '+-*/'")
+    p.add_argument("--digits", type=int, default=2, metavar="CISLO", help="Maximalni pocet cislic v cislech. Vychozi: 2")
+    p.add_argument("--max", type=int, default=None, metavar="CISLO", help="Maximalni vysledek prikladu")
+    p.add_argument("--no-zero", action="store_true", help="Vyloucit cislo 0 z prikladu")
+    p.add_argument("--no-one", action="store_true", help="Vyloucit cislo 1 z nasobeni a deleni")
+    p.add_argument(
+        "--difficulty",
+        type=str,
+        default=None,
+        metavar="OBTIZNOST",
+        help="Obtiznost prikladu jako v CLI, napr. 'carries=1' nebo 'digits=2,table=3'",
+    )
+    p.add_argument(
+        "--engine",
+        type=str,
+        default="python",
+        choices=["python", "numpy"],
+        metavar="ENGINE",
+        help="Zpusob generovani: 'python' nebo 'numpy'. Vychozi: 'python'",
+    )
+    p.add_argument(
+        "--draws",
+        type=int,
+        default=1_000_000,
+        metavar="CISLO",
+        help="Pocet prikladu na kazdou konfiguraci (operaci a smes operaci). Vychozi: 1000000",
+    )
+    p.add_argument(
+        "--count",
+        type=int,
+        default=90,
+        metavar="CISLO",
+        help="Pocet prikladu na listu pro mereni opakovani v ramci listu. Vychozi: 90",
+    )
+    p.add_argument("--seed", type=int, default=None, metavar="CISLO", help="Seed pro reprodukovatelny audit")
+    p.add_argument("--bins", type=int, default=20, metavar="CISLO", help="Pocet binu histogramu. Vychozi: 20")
+    p.add_argument("--json", type=str, default=None, metavar="SOUBOR", help="Ulozit cely report (histogramy) jako JSON")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    """Hlavni entry point auditu generatoru."""
+    args = parse_args(argv)
+    if args.draws < 1 or args.count < 1 or args.bins < 1:
+        print("Chyba: --draws, --count a --bins musi byt kladna cisla.", file=sys.stderr)
+        sys.exit(2)
+    if args.engine == "numpy" and not numpy_available():
+        print("Upozorneni: NumPy neni nainstalovano, pouzije se engine 'python'.", file=sys.stderr)
+    try:
+        report = run_audit(
+            list(args.ops), args.draws, sheet_size=args.count, max_result=args.max, max_digits=args.digits,
+            no_zero=args.no_zero, no_one=args.no_one, engine=args.engine, seed=args.seed, bins=args.bins,
+            difficulty=args.difficulty,
+        )
+    except ValueError as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    for line in format_report(report):
+        print(line)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Report ulozen: {args.json}")
+    # Nenulovy navratovy kod pri poruseni omezeni (pro pouziti ve skriptech a CI)
+    if any(sum(c["violations"].values()) for c in report["configs"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Hromadne generovani vice Excel souboru podle manifestu.
+
+Manifest je JSON (seznam objektu nebo objekt s klicem "jobs") nebo CSV
+s hlavickou. Kazda uloha obsahuje parametry stejne jako CLI:
+ops, digits, max, count, cols, fill, seed, title, out, no_zero, no_one,
+engine, stream, unique, answers, writer, difficulty, terms, workers,
+rng_mode, cache, cache_size.
+Chybejici hodnoty se doplni vychozimi hodnotami CLI; parametry jen pro
+jedno spusteni CLI (BATCH_EXCLUDED_KEYS) manifest odmitne.
+
+Ulohy se rozdeli mezi procesy (concurrent.futures.ProcessPoolExecutor),
+takze se start interpretu a import openpyxl plati jen jednou na proces.
+Kazda uloha generuje ve svem procesu samostatne, seedovane ulohy proto
+davaji presne stejne priklady jako pri samostatnem spusteni.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from cli import ANSWER_MODES, RNG_MODES, WRITERS, answer_file_name, build_parser, generate_sheet, __version__
+from difficulty import parse_difficulty
+
+# Klice manifestu, ktere odpovidaji celociselnym argumentum CLI
+INT_KEYS = ("digits", "max", "count", "cols", "seed", "cache_size", "terms", "workers")
+BOOL_KEYS = ("no_zero", "no_one", "stream", "unique")
+
+# Parametry CLI, ktere manifest neprijima (profil se tiskne jen pro jedno spusteni)
+BATCH_EXCLUDED_KEYS = ("profile",)
+
+
+def _cli_defaults():
+    """Vrati vychozi hodnoty argumentu CLI jako slovnik."""
+    return vars(build_parser().parse_args([]))
+
+
+def _parse_bool(value):
+    """Prevede hodnotu z manifestu (bool, cislo nebo text) na bool."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "ano", "y")
+    return bool(value)
+
+
+def normalize_job(raw, defaults):
+    """
+    Doplni a prevede parametry jedne ulohy z manifestu.
+
+    Args:
+        raw: Slovnik parametru z manifestu
+        defaults: Vychozi hodnoty CLI (viz _cli_defaults)
+
+    Returns:
+        Slovnik se vsemi parametry CLI
+
+    Raises:
+        ValueError: Pokud uloha obsahuje neznamy klic nebo neplatnou hodnotu
+    """
+    unknown = set(raw) - set(defaults)
+    if unknown:
+        raise ValueError(f"Neznamy parametr v manifestu: {', '.join(sorted(unknown))}")
+
+    job = dict(defaults)
+    for key, value in raw.items():
+        # Prazdne bunky v CSV znamenaji vychozi hodnotu
+        if value is None or (isinstance(value, str) and value.strip() == ""):
+            continue
+        if key in INT_KEYS:
+            job[key] = int(value)
+        elif key in BOOL_KEYS:
+            job[key] = _parse_bool(value)
+        else:
+            job[key] = value
+    if job["fill"] not in ("down", "across"):
+        raise ValueError(f"Neplatny zpusob vyplnovani: {job['fill']}")
+    if job["answers"] is not None and job["answers"] not in ANSWER_MODES:
+        raise ValueError(f"Neplatny rezim reseni: {job['answers']}")
+    if job["writer"] not in WRITERS:
+        raise ValueError(f"Neplatny zapisovac: {job['writer']}")
+    if job["rng_mode"] not in RNG_MODES:
+        raise ValueError(f"Neplatny zdroj nahody: {job['rng_mode']}")
+    if job["difficulty"] is not None:
+        level = parse_difficulty(str(job["difficulty"]))
+        job["difficulty"] = str(level) if level else None
+    return job
+
+
+def load_manifest(path):
+    """
+    Nacte manifest uloh z JSON nebo CSV souboru.
+
+    Args:
+        path: Cesta k manifestu (.json nebo .csv)
+
+    Returns:
+        List normalizovanych uloh
+
+    Raises:
+        ValueError: Pokud manifest nema platny format nebo ulohy koliduji
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            raw_jobs = list(csv.DictReader(f))
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        raw_jobs = data.get("jobs") if isinstance(data, dict) else data
+        if not isinstance(raw_jobs, list):
+            raise ValueError("Manifest musi byt seznam uloh nebo objekt s klicem 'jobs'.")
+
+    defaults = {k: v for k, v in _cli_defaults().items() if k not in BATCH_EXCLUDED_KEYS}
+    jobs = []
+    for i, raw in enumerate(raw_jobs, 1):
+        try:
+            excluded = sorted(set(raw) & set(BATCH_EXCLUDED_KEYS))
+            if excluded:
+                raise ValueError(f"Parametr neni v manifestu povolen: {', '.join(excluded)}")
+            jobs.append(normalize_job(raw, defaults))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Uloha {i}: {e}") from None
+
+    # Dve ulohy nesmi zapisovat do stejneho souboru (vcetne souboru s resenim)
+    outs = [os.path.abspath(job["out"]) for job in jobs]
+    outs += [os.path.abspath(answer_file_name(job["out"])) for job in jobs if job["answers"] == "file"]
+    if len(set(outs)) != len(outs):
+        raise ValueError("Vice uloh v manifestu ma stejny vystupni soubor ('out').")
+    return jobs
+
+
+def generate_kwargs(job):
+    """
+    Prevede normalizovanou ulohu na argumenty generate_sheet (bez file_name a cache).
+
+    Args:
+        job: Normalizovana uloha (viz normalize_job)
+
+    Returns:
+        Slovnik klicovych argumentu pro generate_sheet
+    """
+    return {
+        "ops": list(job["ops"]),
+        "count": job["count"],
+        "max_result": job["max"],
+        "max_digits": job["digits"],
+        "seed": job["seed"],
+        "title": job["title"],
+        "cols": job["cols"],
+        "fill_mode": job["fill"],
+        "no_zero": job["no_zero"],
+        "no_one": job["no_one"],
+        "engine": job["engine"],
+        "stream": job["stream"],
+        "unique": job["unique"],
+        "answers": job["answers"],
+        "writer": job["writer"],
+        "difficulty": job["difficulty"],
+        "terms": job["terms"],
+        # Server klic workers nepreda (procesy si pozadavek nesmi vynutit)
+        "workers": job.get("workers", 1),
+        "rng_mode": job["rng_mode"],
+    }
+
+
+def run_job(index, job):
+    """
+    Vygeneruje jeden soubor podle ulohy a zmeri cas.
+
+    Funkce bezi v pracovnim procesu, proto nevyhazuje vyjimky - chybu
+    vrati ve vysledku, aby jedna chybna uloha nezastavila ostatni.
+
+    Args:
+        index: Poradi ulohy v manifestu (od 1)
+        job: Normalizovana uloha (viz normalize_job)
+
+    Returns:
+        Slovnik s vysledkem ulohy (index, out, status, seconds, count, error)
+    """
+    start = time.perf_counter()
+    result = {"index": index, "out": job["out"], "count": job["count"], "seed": job["seed"]}
+    if job["answers"] == "file":
+        result["answers_out"] = answer_file_name(job["out"])
+    try:
+        cache = None
+        if job["cache"]:
+            from cache import SheetCache
+
+            cache = SheetCache(job["cache"], job["cache_size"] * 1024 * 1024)
+        generate_sheet(file_name=job["out"], cache=cache, **generate_kwargs(job))
+        result["status"] = "ok"
+        result["error"] = None
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def run_batch(jobs, workers=None):
+    """
+    Spusti vsechny ulohy, pripadne paralelne v procesech.
+
+    Args:
+        jobs: List normalizovanych uloh
+        workers: Pocet pracovnich procesu (default: None = pocet CPU);
+            pri 1 se ulohy spusti postupne v aktualnim procesu
+
+    Returns:
+        Slovnik se souhrnem (pocty, celkovy cas) a vysledky uloh v poradi manifestu
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        results = [run_job(i, job) for i, job in enumerate(jobs, 1)]
+    else:
+        # Import az zde - multiprocessing je drahy a pri jedne uloze zbytecny
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            results = list(executor.map(run_job, range(1, len(jobs) + 1), jobs))
+    wall = time.perf_counter() - start
+
+    failed = sum(1 for r in results if r["status"] != "ok")
+    return {
+        "version": __version__,
+        "workers": workers,
+        "jobs": len(jobs),
+        "ok": len(jobs) - failed,
+        "failed": failed,
+        "wall_seconds": round(wall, 4),
+        "job_seconds": round(sum(r["seconds"] for r in results), 4),
+        "results": results,
+    }
+
+
+def parse_args(argv=None):
+    """
+    Parsuje argumenty prikazu batch.
+
+    Returns:
+        Namespace s argumenty
+    """
+    p = argparse.ArgumentParser(
+        prog="python src/main.py batch",
+        description=f"Hromadne generovani podle manifestu | v{__version__}",
+    )
+    p.add_argument(
+        "manifest",
+        metavar="MANIFEST",
+        help="JSON nebo CSV soubor s ulohami (klice: ops, digits, max, count, cols, fill, seed, title, out, ...)",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="CISLO",
+        help="Pocet pracovnich procesu. Vychozi: pocet CPU",
+    )
+    p.add_argument(
+        "--report",
+        type=str,
+        default="batch_report.json",
+        metavar="SOUBOR",
+        help="Soubor se souhrnnou zpravou (JSON) s casem kazde ulohy. Vychozi: 'batch_report.json'",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    """Hlavni entry point pro hromadne generovani."""
+    args = parse_args(argv)
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    report = run_batch(jobs, workers=args.workers)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for r in report["results"]:
+        if r["status"] != "ok":
+            print(f"Chyba v uloze {r['index']} ({r['out']}): {r['error']}", file=sys.stderr)
+    print(
+        f"Hotovo: {report['ok']}/{report['jobs']} souboru za {report['wall_seconds']:.2f} s "
+        f"({report['workers']} procesu), zprava: {args.report}"
+    )
+    if report["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Obsahove adresovana cache vygenerovanych sesitu na disku.
+
+Seedovane generovani je deterministicke a vystup je bajtove stabilni, takze
+stejne parametry (vcetne seedu a verze programu) davaji vzdy stejny soubor.
+Klic zaznamu je SHA-256 normalizovanych parametru generate_sheet (viz
+cli.cache_params) a __version__; zaznam je primo hotovy soubor .xlsx
+(pripadne i soubor s resenim).
+
+Zapis je atomicky: soubor se zkopiruje do docasneho souboru ve stejnem
+adresari a prejmenuje pres os.replace, takze soubezni zapisovatele (procesy
+batch, serveru) nikdy neuvidi rozepsany zaznam. Velikost cache je omezena;
+pri prekroceni se mazou nejdele nepouzite zaznamy (LRU podle casu zmeny,
+ktery se pri kazdem zasahu obnovi).
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from cli import __version__
+
+# Vychozi limit velikosti cache (512 MB)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+ENTRY_SUFFIX = ".xlsx"
+ANSWER_SUFFIX = "_reseni.xlsx"
+TEMP_SUFFIX = ".tmp"
+
+
+class SheetCache:
+    """
+    Cache hotovych souboru .xlsx v jednom adresari.
+
+    Args:
+        directory: Adresar cache (vytvori se, pokud neexistuje)
+        max_bytes: Nejvyssi celkova velikost zaznamu v bajtech
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, params):
+        """
+        Vrati klic zaznamu pro normalizovane parametry.
+
+        Args:
+            params: Slovnik parametru (viz cli.cache_params)
+
+        Returns:
+            Hex retezec SHA-256
+        """
+        data = json.dumps({"version": __version__, "params": params}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _paths(self, key, answers):
+        paths = [os.path.join(self.directory, key + ENTRY_SUFFIX)]
+        if answers:
+            paths.append(os.path.join(self.directory, key + ANSWER_SUFFIX))
+        return paths
+
+    def lookup(self, key, answers=False):
+        """
+        Najde zaznam a oznaci ho jako prave pouzity.
+
+        Args:
+            key: Klic zaznamu (viz key)
+            answers: Pokud True, zaznam musi obsahovat i soubor s resenim
+
+        Returns:
+            List cest k souborum v cache (sesit, pripadne reseni) nebo None
+        """
+        paths = self._paths(key, answers)
+        try:
+            for path in paths:
+                os.utime(path)
+        except FileNotFoundError:
+            return None
+        return paths
+
+    def fetch(self, key, file_name, answer_name=None):
+        """
+        Zkopiruje zaznam do vystupnich souboru.
+
+        Args:
+            key: Klic zaznamu
+            file_name: Cilovy soubor sesitu nebo zapisovatelny binarni proud
+            answer_name: Volitelny cilovy soubor s resenim
+
+        Returns:
+            True pri zasahu, False pokud zaznam v cache neni
+        """
+        paths = self.lookup(key, answer_name is not None)
+        if paths is None:
+            return False
+        try:
+            for src, dst in zip(paths, [file_name, answer_name]):
+                if hasattr(dst, "write"):
+                    with open(src, "rb") as f:
+                        shutil.copyfileobj(f, dst, 1 << 20)
+                else:
+                    shutil.copyfile(src, dst)
+        except FileNotFoundError:
+            # Zaznam mezitim smazal jiny proces (eviction) - chova se jako minuti
+            return False
+        return True
+
+    def store(self, key, file_name, answer_name=None):
+        """
+        Atomicky ulozi vygenerovane soubory jako zaznam a pripadne uvolni misto.
+
+        Args:
+            key: Klic zaznamu
+            file_name: Vygenerovany sesit - cesta nebo obsah souboru
+                (bytes, memoryview) pri generovani do pameti
+            answer_name: Volitelny vygenerovany soubor s resenim
+        """
+        sources = [file_name] if answer_name is None else [file_name, answer_name]
+        # Sesit se zapisuje posledni - lookup ho hleda prvni, zaznam je tak uplny
+        for src, dst in reversed(list(zip(sources, self._paths(key, answer_name is not None)))):
+            fd, tmp = tempfile.mkstemp(suffix=TEMP_SUFFIX, dir=self.directory)
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    if isinstance(src, (bytes, bytearray, memoryview)):
+                        out.write(src)
+                    else:
+                        with open(src, "rb") as f:
+                            shutil.copyfileobj(f, out, 1 << 20)
+                os.replace(tmp, dst)
+            except BaseException:
+                os.remove(tmp)
+                raise
+        self.evict()
+
+    def evict(self):
+        """
+        Smaze nejdele nepouzite zaznamy, dokud celkova velikost presahuje max_bytes.
+
+        Returns:
+            Pocet smazanych souboru
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                # Uz smazano jinym procesem, nebo soubor prave nekdo cte (Windows)
+                pass
+            total -= size
+        return removed
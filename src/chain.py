@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Retezove priklady s vice operandy, napr. "12 + 7 - 5" nebo "3 × 4 + 8".
+
+Retezec se vyhodnocuje zleva doprava; pokud by za scitanim nebo odcitanim
+nasledovalo nasobeni ci deleni, zapise se dosavadni cast do zavorek
+("(3 + 4) × 5"), takze zapis odpovida poradi vypoctu. Pro kazdy retezec
+plati stejne meze jako pro dvojice:
+
+- kazdy operand ma nejvyse max_digits cislic, s no_zero neni nulovy,
+  s no_one neni cinitel ani delitel roven jedne,
+- kazdy mezivysledek i vysledek je v intervalu 0 .. max_result (s no_zero
+  1 .. max_result), takze nikde nevznikne zaporne cislo,
+- kazde deleni je beze zbytku.
+
+Retezce se negeneruji a nezamitaji cele. Pro kazdou priponu operaci se
+zprava doleva spocita mnozina hodnot, ze kterych lze retezec platne
+dokoncit (bajtova mapa 0/1 pres 0 .. max_result, posuny a prolozeni se
+pocitaji nad celou mapou najednou jako s velkym celym cislem). Pri tahu se
+pak kazdy operand vybira rovnomerne primo z hodnot, po kterych mezivysledek
+zustane v mnozine dokoncitelnych hodnot - tah nikdy neuvizne a nic se
+neopakuje. Posloupnost operaci se vybira rovnomerne z tech, pro ktere
+nejaky platny retezec existuje.
+
+Mnozina dokoncitelnych hodnot je casto interval (vzdy po scitani
+a odcitani, po nasobeni a deleni pri obvyklych mezich); ten se spocita
+primo z mezi operandu a mapa se z nej jen vyplni. Obecne prolozeni se
+pocita jen tam, kde interval byt nemusi. Mapy se pocitaji az pro
+posloupnosti, ktere se opravdu vylosuji, a drzi se v LRU cache omezene
+velikosti (FEASIBLE_CACHE_BYTES) podle obsahu, takze pripony se stejnou
+mnozinou sdili jednu mapu; pro kazdou vylosovanou posloupnost si
+generator pamatuje jen pocet platnych prvnich operandu a pripadne jejich
+kompaktni index. Vytvoreni generatoru tak stoji jen nalezeni jedne platne
+posloupnosti, ne mapy pro vsechny; plan listu (cli.GenerationPlan) si
+generator bere predem pripraveny a sdileny (prepare, cli._shared_chain).
+"""
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from hashlib import blake2b
+from itertools import compress, islice, product
+from math import isqrt
+
+# Nejvyssi podporovana delka retezce (pocet operandu)
+MAX_TERMS = 5
+
+# Nejvyssi podporovany mezivysledek (velikost map dokoncitelnych hodnot)
+MAX_VALUE = 1000000
+
+# Nejvyssi celkova velikost map dokoncitelnych hodnot drzenych v cache
+FEASIBLE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Velikost bloku indexu platnych prvnich operandu
+FIRST_BLOCK = 1024
+
+# Operace, pred kterymi se dosavadni soucet nebo rozdil uzavre do zavorek
+_TIGHT = ("×", "/")
+
+
+def chain_text(operands, symbols):
+    """
+    Vytvori levou cast retezce, napr. "(3 + 4) × 5".
+
+    Args:
+        operands: Operandy retezce
+        symbols: Operace mezi operandy (o jednu kratsi nez operands)
+
+    Returns:
+        Text retezce bez " = ___"
+    """
+    text = str(operands[0])
+    loose = False
+    for symbol, x in zip(symbols, operands[1:]):
+        if loose and symbol in _TIGHT:
+            text = f"({text})"
+            loose = False
+        text = f"{text} {symbol} {x}"
+        if symbol not in _TIGHT:
+            loose = True
+    return text
+
+
+def _shift(bits, n):
+    """Posune bitovou mapu o n bitu doleva (n < 0 doprava)."""
+    return bits << n if n >= 0 else bits >> -n
+
+
+def _spread(bits, width, step):
+    """Vrati OR posunu bits o 0, step, ..., (width - 1) * step bitu (O(log width) operaci)."""
+    result = 0
+    span = 0
+    for digit in bin(width)[2:]:
+        result |= _shift(result, span * step)
+        span *= 2
+        if digit == "1":
+            result = bits | _shift(result, step)
+            span += 1
+    return result
+
+
+def implied_max_result(ops, terms, max_number):
+    """
+    Vrati nejvetsi vysledek retezce odvozeny jen z max_number (bez --max).
+
+    Je to nejvetsi soucet vsech operandu, s nasobenim nebo delenim soucin
+    dvou nejvetsich cisel. ChainSampler ho omezi na MAX_VALUE.
+
+    Args:
+        ops: Symboly operaci ("+", "-", "×", "/")
+        terms: Pocet operandu retezce
+        max_number: Nejvetsi operand
+
+    Returns:
+        Nejvetsi vysledek pred omezenim na MAX_VALUE
+    """
+    tight = any(o in _TIGHT for o in ops)
+    return max_number * (max_number if tight else terms)
+
+
+class ChainSampler:
+    """
+    Generator retezu s vice operandy s propagaci mezi zleva doprava.
+
+    Args:
+        ops: Symboly operaci ("+", "-", "×", "/"); opakovani zvysuji
+            pravdepodobnost operace stejne jako u GenerationPlan
+        terms: Pocet operandu retezce (3 az MAX_TERMS)
+        max_result: Maximalni mezivysledek a vysledek; bez nej se odvodi
+            z max_digits (implied_max_result) a omezi na MAX_VALUE
+        max_digits: Maximalni pocet cislic v operandech
+        no_zero: Pokud True, vyloucit nulu z operandu i mezivysledku (default: False)
+        no_one: Pokud True, vyloucit jednicku z cinitelu a delitelu (default: False)
+
+    Raises:
+        ValueError: Pri neplatne delce retezce, prilis velkem max_result nebo
+            pokud pro zadane limity neexistuje zadny platny retezec
+    """
+
+    symbol = "chain"
+
+    FALLBACKS = ()
+
+    __slots__ = (
+        "terms", "max_result", "max_number", "low", "no_one", "ops", "_ranges", "_intervals", "_feasible",
+        "_cached_bytes", "_idents", "_firsts", "_windows",
+    )
+
+    def __init__(self, ops, terms, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        if not 3 <= terms <= MAX_TERMS:
+            raise ValueError(f"Delka retezce musi byt 3-{MAX_TERMS} operandu.")
+        ops = list(ops)
+
+        # Urceni maximalni hodnoty pro jednotliva cisla
+        max_number = None
+        if max_digits is not None:
+            max_number = 10 ** max_digits - 1
+
+        # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
+        if max_result is None and max_number is None:
+            max_result = 99
+            max_number = 99
+        elif max_number is None:
+            max_number = max_result
+        elif max_result is None:
+            # Mapy dokoncitelnych hodnot maji nejvyse MAX_VALUE + 1 prvku (CLI na omezeni upozorni)
+            max_result = min(MAX_VALUE, implied_max_result(ops, terms, max_number))
+        if max_result > MAX_VALUE:
+            raise ValueError(f"Maximalni vysledek retezce muze byt nejvyse {MAX_VALUE}.")
+
+        min_val = 1 if no_zero else 0
+        self.terms = terms
+        self.max_result = max_result
+        self.max_number = max_number
+        self.low = min_val
+        self.no_one = no_one
+        self.ops = ops
+        # Intervaly operandu za jednotlivymi operacemi
+        self._ranges = {
+            "+": (min_val, max_number),
+            "-": (min_val, max_number),
+            "×": (2 if no_one else min_val, max_number),
+            "/": (2 if no_one else 1, max_number),
+        }
+        self._intervals = {}
+        self._feasible = OrderedDict()
+        self._cached_bytes = 0
+        self._idents = {}
+        self._firsts = {}
+        self._windows = {}
+
+        # Staci jedna posloupnost operaci s platnym retezcem; ostatni se overi az pri tahu
+        if not any(self._first_values(seq)[1] for seq in product(ops, repeat=terms - 1)):
+            raise ValueError("Pro retezce s temito limity neexistuje zadny platny priklad.")
+
+    def _interval(self, suffix):
+        """
+        Vrati interval hodnot, ze kterych lze retezec dokoncit operacemi suffix.
+
+        Returns:
+            Tuple (lo, hi) (prazdny pri lo > hi), nebo None, pokud mnozina
+            nemusi byt interval (pak plati jen mapa z feasible)
+        """
+        cache = self._intervals
+        if suffix in cache:
+            return cache[suffix]
+        if not suffix:
+            span = (self.low, self.max_result)
+        else:
+            target = self._interval(suffix[1:])
+            span = None if target is None else self._back_interval(suffix[0], *target)
+        cache[suffix] = span
+        return span
+
+    def _back_interval(self, symbol, lo, hi):
+        """Vrati interval hodnot v, pro ktere existuje operand x s v symbol x v lo .. hi (nebo None)."""
+        low, high = self._ranges[symbol]
+        if high < low or lo > hi:
+            return 1, 0
+        if symbol == "+":
+            # v + x v lo .. hi pro nektere x z low .. high
+            lo, hi = lo - high, hi - low
+        elif symbol == "-":
+            lo, hi = lo + low, hi + high
+        elif symbol == "×":
+            if low == 0 and lo == 0:
+                lo, hi = 0, self.max_result  # v × 0 = 0 pro kazde v
+            else:
+                first = max(low, 1)
+                if high < first:
+                    return 1, 0  # jediny cinitel je 0 a 0 neni v cili
+                if lo > first:
+                    return None  # soucin muze cil preskocit - mezery
+                # Nejmensi soucin v * first je >= lo, staci v * first <= hi; v = 0 jen s 0 v cili
+                lo, hi = (0 if lo == 0 else 1), hi // first
+        else:  # "/"
+            if low > 1 or hi < self.max_result:
+                return None  # bez delitele 1 chybi napr. prvocisla
+            # v / 1 = v pokryva lo .. max_result, mensi delenec nez lo nedava podil v cili
+        return max(lo, self.low), min(hi, self.max_result)
+
+    def feasible(self, suffix):
+        """
+        Vrati mapu hodnot, ze kterych lze retezec dokoncit operacemi suffix.
+
+        Args:
+            suffix: Tuple zbyvajicich operaci
+
+        Returns:
+            bytearray delky max_result + 1; na indexu v je 1, pokud z hodnoty
+            v existuje platne dokonceni
+
+        Note:
+            Do cache se ukladaji jen mapy mnozin, ktere nejsou interval;
+            mapa intervalu se pokazde levne vyplni znovu.
+        """
+        span = self._interval(suffix)
+        if span is not None:
+            lo, hi = span
+            result = bytearray(self.max_result + 1)
+            if lo <= hi:
+                result[lo:hi + 1] = b"\x01" * (hi - lo + 1)
+            return result
+        # Cache je podle obsahu (operace a identita cilove mnoziny): ruzne
+        # pripony maji casto stejnou mapu a ta se pak pocita i drzi jen jednou
+        cache = self._feasible
+        key = (suffix[0], self._ident(suffix[1:]))
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+            return cached
+        result = self._back(suffix[0], self.feasible(suffix[1:]))
+        cache[key] = result
+        self._cached_bytes += len(result)
+        # Nejdele nepouzite mapy se zahodi (pri dalsi potrebe se spocitaji znovu)
+        while self._cached_bytes > FEASIBLE_CACHE_BYTES and len(cache) > 1:
+            _, old = cache.popitem(last=False)
+            self._cached_bytes -= len(old)
+        return result
+
+    def _ident(self, suffix):
+        """
+        Vrati identitu mnoziny dokoncitelnych hodnot pro suffix (klic cache podle obsahu).
+
+        Returns:
+            Interval (lo, hi) z _interval, nebo otisk mapy z feasible
+            (spocita se jednou pro kazdou priponu)
+        """
+        span = self._interval(suffix)
+        if span is not None:
+            return span
+        ident = self._idents.get(suffix)
+        if ident is None:
+            ident = self._idents[suffix] = blake2b(self.feasible(suffix), digest_size=16).digest()
+        return ident
+
+    def _back(self, symbol, target, size=None):
+        """
+        Vrati hodnoty v, pro ktere existuje operand x s v symbol x v mnozine target.
+
+        Args:
+            symbol: Operace
+            target: Mapa cilovych hodnot (delky max_result + 1)
+            size: Pocitat jen hodnoty v < size (default: max_result + 1)
+        """
+        full = self.max_result + 1
+        size = full if size is None else size
+        low, high = self._ranges[symbol]
+        if high < low:
+            return bytearray(size)
+        if symbol == "+":
+            # v + x je v target <=> v je v target posunutem o x doleva
+            bits = int.from_bytes(target[:size + high], "little")
+            reach = _spread(bits >> 8 * low, high - low + 1, -8) & ((1 << 8 * size) - 1)
+        elif symbol == "-":
+            bits = int.from_bytes(target[:size], "little")
+            reach = _spread(bits << 8 * low, high - low + 1, 8) & ((1 << 8 * size) - 1)
+        elif symbol == "×":
+            values = bytearray(size)
+            if low == 0 and target[0]:
+                values = bytearray(b"\x01" * size)  # v × 0 = 0 pro kazde v
+            if high >= max(low, 1):
+                values[0] |= target[0]  # 0 × x = 0
+            # Male cinitele po celych prolozenich mapy, velke po hodnotach v (v * x < full => v < full / x)
+            root = isqrt(full - 1)
+            for x in range(max(low, 1), min(high, root) + 1):
+                # Prvky target na nasobcich x: v je platne, pokud target[v * x]
+                part = target[:x * (size - 1) + 1:x]
+                count = len(part)
+                merged = int.from_bytes(values[:count], "little") | int.from_bytes(part, "little")
+                values[:count] = merged.to_bytes(count, "little")
+            first = max(low, root + 1)
+            for v in range(1, min(size - 1, (full - 1) // first) + 1 if first < full else 1):
+                last = min(high, (full - 1) // v)
+                if last >= first and 1 in target[v * first:v * last + 1:v]:
+                    values[v] = 1
+            reach = int.from_bytes(values, "little")
+        else:  # "/"
+            values = bytearray(size)
+            if high >= low:
+                values[0] |= target[0]  # 0 / x = 0
+            # Male delitele po celych prolozenich mapy, velke po podilech q (q * x < size => q < size / x)
+            root = isqrt(size - 1)
+            for x in range(low, min(high, root) + 1):
+                # Delenec v = q * x pro kazdy platny podil q
+                count = (size - 1) // x + 1
+                merged = int.from_bytes(values[::x], "little") | int.from_bytes(target[:count], "little")
+                values[::x] = merged.to_bytes(count, "little")
+            first = max(low, root + 1)
+            for q in range(1, (size - 1) // first + 1 if first < size else 1):
+                last = min(high, (size - 1) // q)
+                if last >= first and target[q]:
+                    values[q * first:q * last + 1:q] = b"\x01" * (last - first + 1)
+            reach = int.from_bytes(values, "little")
+        result = bytearray(reach.to_bytes(size, "little"))
+        result[:self.low] = bytes(self.low)
+        return result
+
+    def _first_values(self, seq):
+        """
+        Vrati index platnych prvnich operandu retezce s operacemi seq.
+
+        Returns:
+            Tuple (low, count, window, cums): count platnych hodnot od low;
+            pokud nejsou platne vsechny hodnoty low .. low + count - 1, je
+            window mapa platnosti a cums kumulativni pocty po blocich
+            FIRST_BLOCK (jinak None, None)
+        """
+        cached = self._firsts.get(seq)
+        if cached is not None:
+            return cached
+        low = 2 if self.no_one and seq[0] == "×" else self.low
+        high = min(self.max_number, self.max_result)
+        span = self._interval(seq)
+        if span is not None:
+            # Platne prvni operandy jsou souvisly usek - mapa neni potreba
+            low, high = max(low, span[0]), min(high, span[1])
+            result = (low, max(0, high - low + 1), None, None)
+            self._firsts[seq] = result
+            return result
+        # Ruzne pripony maji casto stejnou mapu - stejny index se pak sdili
+        key = (seq[0], low, high, self._ident(seq[1:]))
+        result = self._windows.get(key)
+        if result is not None:
+            self._firsts[seq] = result
+            return result
+        # Staci mapa do high (nejvyse max_number); do cache map se neuklada
+        window = bytes(self._back(seq[0], self.feasible(seq[1:]), high + 1)[low:]) if high >= low else b""
+        count = window.count(1)
+        cums = None
+        if count == len(window):
+            window = None
+        else:
+            cums = array("q")
+            total = 0
+            for i in range(0, len(window), FIRST_BLOCK):
+                total += window.count(1, i, i + FIRST_BLOCK)
+                cums.append(total)
+        result = (low, count, window, cums)
+        self._firsts[seq] = result
+        self._windows[key] = result
+        return result
+
+    def prepare(self):
+        """
+        Spocita predem index prvnich operandu pro vsechny posloupnosti operaci.
+
+        Jinak se mapy pocitaji postupne, jak se posloupnosti vylosuji, a kazdy
+        dalsi list je muze platit znovu (viz cli._shared_chain).
+        """
+        for seq in product(dict.fromkeys(self.ops), repeat=self.terms - 1):
+            self._first_values(seq)
+
+    def _first(self, seq, rng):
+        """Vybere rovnomerne platny prvni operand retezce s operacemi seq."""
+        low, count, window, cums = self._first_values(seq)
+        k = rng.randrange(count)
+        if window is None:
+            return low + k
+        # k-ta platna hodnota: blok podle kumulativnich poctu, v bloku primo
+        block = bisect_right(cums, k)
+        if block:
+            k -= cums[block - 1]
+        start = block * FIRST_BLOCK
+        offsets = compress(range(start, start + FIRST_BLOCK), window[start:start + FIRST_BLOCK])
+        return low + next(islice(offsets, k, None))
+
+    def _sequence(self, rng):
+        """Vybere rovnomerne posloupnost operaci, pro kterou existuje platny retezec."""
+        ops = self.ops
+        n = len(ops)
+        steps = self.terms - 1
+        while True:
+            # Index do product(ops, repeat=steps) - posledni operace se meni nejrychleji
+            index = rng.randrange(n ** steps)
+            seq = []
+            for _ in range(steps):
+                index, digit = divmod(index, n)
+                seq.append(ops[digit])
+            seq = tuple(reversed(seq))
+            if self._first_values(seq)[1]:
+                return seq
+
+    def _target(self, suffix):
+        """Vrati cil pro _operand: interval (lo, hi), nebo mapu z feasible, pokud mnozina neni interval."""
+        span = self._interval(suffix)
+        return span if span is not None else self.feasible(suffix)
+
+    def _operand(self, v, symbol, target, rng):
+        """Vybere rovnomerne operand x, pro ktery je v symbol x v mnozine target (mapa nebo interval)."""
+        if type(target) is tuple:
+            return self._operand_in(v, symbol, target, rng)
+        low, high = self._ranges[symbol]
+        if symbol == "+":
+            high = min(high, self.max_result - v)
+            window = target[v + low:v + high + 1]
+            values = range(low, high + 1)
+        elif symbol == "-":
+            high = min(high, v)
+            # target[v - x] pro x = high .. low
+            window = target[v - high:v - low + 1]
+            values = range(high, low - 1, -1)
+        elif v == 0:
+            # 0 × x = 0 / x = 0 pro kazde x (0 je v target, jinak by v nebylo platne)
+            return rng.randint(low, high)
+        elif symbol == "×":
+            high = min(high, self.max_result // v)
+            window = target[v * low:v * high + 1:v]
+            values = range(low, high + 1)
+        else:  # "/"
+            candidates = []
+            for d in range(1, isqrt(v) + 1):
+                if v % d == 0:
+                    for x in (d, v // d):
+                        if low <= x <= high and target[v // x]:
+                            candidates.append(x)
+            return rng.choice(sorted(set(candidates)))
+        # Obvykle je platny cely interval - pak staci jeden randint bez seznamu kandidatu
+        if window.count(1) == len(window):
+            return values[rng.randrange(len(values))]
+        return rng.choice(list(compress(values, window)))
+
+    def _operand_in(self, v, symbol, span, rng):
+        """
+        Vybere operand jako _operand pro cilovy interval span = (lo, hi) primo z mezi.
+
+        Platne operandy tvori souvisly usek; vybira se stejnym tahem a ve
+        stejnem poradi jako z mapy, vysledek je tedy stejny.
+        """
+        lo, hi = span
+        low, high = self._ranges[symbol]
+        if symbol == "+":
+            first, last = max(low, lo - v), min(high, hi - v)
+            return first + rng.randrange(last - first + 1)
+        if symbol == "-":
+            # Poradi kandidatu je v _operand sestupne
+            first, last = max(low, v - hi), min(high, v - lo)
+            return last - rng.randrange(last - first + 1)
+        if v == 0:
+            return rng.randint(low, high)
+        if symbol == "×":
+            first, last = max(low, -(-lo // v)), min(high, hi // v)
+            return first + rng.randrange(last - first + 1)
+        candidates = []
+        for d in range(1, isqrt(v) + 1):
+            if v % d == 0:
+                for x in (d, v // d):
+                    if low <= x <= high and lo <= v // x <= hi:
+                        candidates.append(x)
+        return rng.choice(sorted(set(candidates)))
+
+    def sample(self, rng):
+        """
+        Vygeneruje jeden retezec.
+
+        Args:
+            rng: Zdroj nahody s metodami choice a randint (napr. modul random)
+
+        Returns:
+            Tuple (x0, op1, x1, op2, x2, ..., vysledek)
+        """
+        seq = self._sequence(rng)
+        v = self._first(seq, rng)
+        record = [v]
+        for k, symbol in enumerate(seq):
+            x = self._operand(v, symbol, self._target(seq[k + 1:]), rng)
+            if symbol == "+":
+                v += x
+            elif symbol == "-":
+                v -= x
+            elif symbol == "×":
+                v *= x
+            else:
+                v //= x
+            record += (symbol, x)
+        record.append(v)
+        return tuple(record)
+
+    def sample_many(self, n, rng):
+        """Vygeneruje seznam n retezcu (viz sample)."""
+        sample = self.sample
+        return [sample(rng) for _ in range(n)]
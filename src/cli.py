@@ -4,272 +4,2284 @@ Generator matematickych prikladu do Excel souboru.
 Podporuje scitani, odcitani, nasobeni a deleni s konfigurovatelnym max vysledkem.
 """
 import random
-import argparse
 import math
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font
-from openpyxl.utils import get_column_letter
+import importlib
+import io
+import sys
+import os
+import copy
+import time
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from array import array
+from bisect import bisect_right
+from itertools import chain, zip_longest
 
 __version__ = "1.1.1"
 
 
+# ----------------------------
+# Predkompilovane generatory
+# ----------------------------
+# Prostory s nejvyse tolika ruznymi priklady se pro --unique vyjmenuji cele
+UNIQUE_ENUMERATE_LIMIT = 100000
+
+# Max. pocet pokusu na jeden priklad pri odmitani opakovani v rezimu --unique
+UNIQUE_MAX_ATTEMPTS = 20
+
+# Nejvyssi pocet bloku delitelu, pro ktere DivSampler stavi presny index
+# (delence zhruba do 10^8); pri vetsich limitech vybira se zamitanim
+DIV_INDEX_LIMIT = 20000
+
+
+def _capped_series(first, count, cap):
+    """
+    Secte delky radku klesajici rady: max(0, min(cap, first - k)) pro k = 0 .. count - 1.
+
+    Pouziva space_size scitani a odcitani, aby se prostor nemusel vyjmenovat.
+    """
+    if count <= 0 or cap <= 0:
+        return 0
+    # Cleny oriznute na cap, pak aritmeticka rada kladnych clenu
+    full = min(count, max(0, first - cap + 1))
+    total = full * cap
+    last = min(count - 1, first - 1)
+    if last >= full:
+        total += (2 * first - full - last) * (last - full + 1) // 2
+    return total
+
+
+class AddSampler:
+    """
+    Generator scitani s mezemi vypocitanymi jednou pri vytvoreni.
+
+    Args:
+        max_result: Maximalni vysledek operace (omezuje vysledek a+b)
+        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
+        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
+        no_one: Nepoužíváno pro sčítání (zachováno pro konzistenci API)
+    """
+
+    # Symbol operace ve vystupu (pouziva i vektorovy engine pro vyber implementace)
+    symbol = "+"
+
+    # Citace nahradnich vetvi (viz GenerationPlan.fallback_counts)
+    FALLBACKS = ("fallback_retry_a",)
+
+    __slots__ = ("max_result", "max_number", "min_val", "max_a") + FALLBACKS
+
+    def __init__(self, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        # Urceni maximalni hodnoty pro jednotliva cisla
+        max_number = None
+        if max_digits is not None:
+            max_number = 10 ** max_digits - 1
+
+        # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
+        if max_result is None and max_number is None:
+            max_result = 99
+            max_number = 99
+        elif max_number is None:
+            max_number = max_result
+        elif max_result is None:
+            max_result = max_number * 2  # soucet dvou max cisel
+
+        self.max_result = max_result
+        self.max_number = max_number
+        self.min_val = 1 if no_zero else 0
+        self.max_a = min(max_number, max_result)
+        self.fallback_retry_a = 0
+
+    def sample(self, rng):
+        """
+        Vygeneruje jeden priklad.
+
+        Args:
+            rng: Zdroj nahody s metodou randint (napr. modul random)
+
+        Returns:
+            Tuple (a, "+", b, vysledek)
+        """
+        randint = rng.randint
+        min_val = self.min_val
+        max_number = self.max_number
+        max_result = self.max_result
+        a = randint(min_val, self.max_a)
+        max_b = min(max_number, max_result - a)
+        # Zajistit, ze max_b je alespon min_val
+        if max_b < min_val:
+            # Pokud max_b je moc male, zkusime mensi a
+            self.fallback_retry_a += 1
+            a = randint(min_val, min(max_number, max_result - min_val))
+            max_b = min(max_number, max_result - a)
+        b = randint(min_val, max_b)
+        return a, "+", b, a + b
+
+    def sample_many(self, n, rng):
+        """Vygeneruje seznam n prikladu (viz sample)."""
+        sample = self.sample
+        return [sample(rng) for _ in range(n)]
+
+    def space_rows(self):
+        """
+        Popise mnozinu vsech ruznych prikladu, ktere muze sample vratit.
+
+        Returns:
+            List trojic (a, min_b, max_b); pro kazde a je platne kazde b z intervalu
+        """
+        min_val = self.min_val
+        rows = []
+        for a in range(min_val, self.max_a + 1):
+            max_b = min(self.max_number, self.max_result - a)
+            if max_b >= min_val:
+                rows.append((a, min_val, max_b))
+        return rows
+
+    def space_size(self, cap=None):
+        """Vrati pocet ruznych prikladu (viz space_rows) bez jejich vyjmenovani."""
+        min_val = self.min_val
+        return _capped_series(
+            self.max_result - 2 * min_val + 1, self.max_a - min_val + 1, self.max_number - min_val + 1
+        )
+
+    @staticmethod
+    def build(a, b):
+        """Sestavi priklad z operandu (viz space_rows)."""
+        return a, "+", b, a + b
+
+
+class SubSampler:
+    """
+    Generator odcitani s mezemi vypocitanymi jednou pri vytvoreni.
+
+    Args:
+        max_result: Maximalni hodnota mensence (omezuje a)
+        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
+        no_zero: Pokud True, vyloucit nulu z cisel a vysledku (default: False)
+        no_one: Nepoužíváno pro odčítání (zachováno pro konzistenci API)
+    """
+
+    symbol = "-"
+
+    FALLBACKS = ()
+
+    __slots__ = ("max_number", "min_val", "min_a", "max_a", "b_offset")
+
+    def __init__(self, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        # Urceni maximalni hodnoty pro jednotliva cisla
+        max_number = None
+        if max_digits is not None:
+            max_number = 10 ** max_digits - 1
+
+        # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
+        if max_result is None and max_number is None:
+            max_result = 99
+            max_number = 99
+        elif max_number is None:
+            max_number = max_result
+        elif max_result is None:
+            max_result = max_number
+
+        self.max_number = max_number
+        self.min_val = 1 if no_zero else 0
+        # Pokud no_zero, a musi byt alespon 2, aby b mohlo byt alespon 1 a vysledek != 0
+        self.min_a = 2 if no_zero else self.min_val
+        self.max_a = min(max_number, max_result)
+        # Pokud no_zero, b musi byt alespon o 1 mensi nez a, aby vysledek nebyl 0
+        self.b_offset = 1 if no_zero else 0
+
+    def sample(self, rng):
+        """
+        Vygeneruje jeden priklad.
+
+        Args:
+            rng: Zdroj nahody s metodou randint (napr. modul random)
+
+        Returns:
+            Tuple (a, "-", b, vysledek)
+        """
+        randint = rng.randint
+        a = randint(self.min_a, self.max_a)
+        b = randint(self.min_val, min(self.max_number, a - self.b_offset))
+        return a, "-", b, a - b
+
+    def sample_many(self, n, rng):
+        """Vygeneruje seznam n prikladu (viz sample)."""
+        sample = self.sample
+        return [sample(rng) for _ in range(n)]
+
+    def space_rows(self):
+        """
+        Popise mnozinu vsech ruznych prikladu, ktere muze sample vratit.
+
+        Returns:
+            List trojic (a, min_b, max_b); pro kazde a je platne kazde b z intervalu
+        """
+        return [
+            (a, self.min_val, min(self.max_number, a - self.b_offset))
+            for a in range(self.min_a, self.max_a + 1)
+        ]
+
+    def space_size(self, cap=None):
+        """Vrati pocet ruznych prikladu (viz space_rows) bez jejich vyjmenovani."""
+        # Delky radku rostou s a; od nejvetsiho a tvori klesajici radu
+        return _capped_series(
+            self.max_a - self.b_offset - self.min_val + 1,
+            self.max_a - self.min_a + 1,
+            self.max_number - self.min_val + 1,
+        )
+
+    @staticmethod
+    def build(a, b):
+        """Sestavi priklad z operandu (viz space_rows)."""
+        return a, "-", b, a - b
+
+
+class MulSampler:
+    """
+    Generator nasobeni s mezemi vypocitanymi jednou pri vytvoreni.
+
+    Args:
+        max_result: Maximalni vysledek operace (omezuje vysledek a*b)
+        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
+        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
+        no_one: Pokud True, vyloucit jednicku z cisel (default: False)
+    """
+
+    symbol = "×"
+
+    FALLBACKS = ("fallback_no_valid_a",)
+
+    __slots__ = ("max_result", "max_number", "min_val", "hi") + FALLBACKS
+
+    def __init__(self, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        # Urceni maximalni hodnoty pro jednotliva cisla
+        max_number = None
+        if max_digits is not None:
+            max_number = 10 ** max_digits - 1
+
+        # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
+        if max_result is None and max_number is None:
+            max_result = 99
+            max_number = 99
+        elif max_number is None:
+            max_number = max_result
+        elif max_result is None:
+            max_result = max_number * max_number  # soucin dvou max cisel
+
+        # Urceni min_val na zaklade no_zero a no_one
+        if no_one:
+            min_val = 2  # vyloucit 0 a 1
+        elif no_zero:
+            min_val = 1  # vyloucit pouze 0
+        else:
+            min_val = 0  # povolit vse
+        # Pro a > 0 plati stejne dolni omezeni i pro b
+        min_b = min_val
+
+        max_a = min(max_number, max_result)
+        # Zajistit, ze max_a je alespon min_val
+        if max_a < min_val:
+            max_a = min_val
+
+        # Platna a tvori souvisly interval [min_val, hi]: pro a > 0 je max_b = max_result // a
+        # nerostouci, takze podminka max_b >= min_b plati prave pro a <= max_result // min_b.
+        # Pro a = 0 je jediny kandidat 0 × 0, ktery je vzdy platny.
+        hi = max_a
+        if min_b > 0:
+            hi = min(hi, max_result // min_b)
+        if max_number < min_b:
+            hi = min_val - 1
+
+        self.max_result = max_result
+        self.max_number = max_number
+        self.min_val = min_val
+        self.hi = hi
+        self.fallback_no_valid_a = 0
+
+    def sample(self, rng):
+        """
+        Vygeneruje jeden priklad.
+
+        Args:
+            rng: Zdroj nahody s metodou randint (napr. modul random)
+
+        Returns:
+            Tuple (a, "×", b, vysledek)
+        """
+        min_val = self.min_val
+        # Fallback pokud neexistuje zadne platne a
+        if self.hi < min_val:
+            self.fallback_no_valid_a += 1
+            return (min_val, "×", min_val, min_val * min_val)
+
+        # Rovnomerne rozlozeni pres platna a, b rovnomerne v povolenem rozsahu
+        randint = rng.randint
+        a = randint(min_val, self.hi)
+        if a == 0:
+            return (0, "×", 0, 0)
+        b = randint(min_val, min(self.max_result // a, self.max_number))
+        return (a, "×", b, a * b)
+
+    def sample_many(self, n, rng):
+        """Vygeneruje seznam n prikladu (viz sample)."""
+        sample = self.sample
+        return [sample(rng) for _ in range(n)]
+
+    def space_rows(self):
+        """
+        Popise mnozinu vsech ruznych prikladu, ktere muze sample vratit.
+
+        Returns:
+            List trojic (a, min_b, max_b); pro kazde a je platne kazde b z intervalu
+        """
+        min_val = self.min_val
+        if self.hi < min_val:
+            return [(min_val, min_val, min_val)]
+        rows = []
+        for a in range(min_val, self.hi + 1):
+            if a == 0:
+                rows.append((0, 0, 0))
+            else:
+                rows.append((a, min_val, min(self.max_result // a, self.max_number)))
+        return rows
+
+    def space_size(self, cap=None):
+        """
+        Vrati pocet ruznych prikladu (viz space_rows) bez jejich vyjmenovani.
+
+        Cinitele se stejnym max_result // a se sectou po blocich (O(sqrt)
+        bloku); pri prekroceni cap se skonci drive a vrati se mezisoucet.
+        """
+        min_val = self.min_val
+        if self.hi < min_val:
+            return 1
+        total = 1 if min_val == 0 else 0
+        a = max(min_val, 1)
+        while a <= self.hi and (cap is None or total <= cap):
+            q = self.max_result // a
+            if q >= self.max_number:
+                last = min(self.hi, self.max_result // self.max_number)
+                width = self.max_number - min_val + 1
+            else:
+                last = min(self.hi, self.max_result // q)
+                width = q - min_val + 1
+            total += (last - a + 1) * width
+            a = last + 1
+        return total
+
+    @staticmethod
+    def build(a, b):
+        """Sestavi priklad z operandu (viz space_rows)."""
+        return a, "×", b, a * b
+
+
+class DivSampler:
+    """
+    Generator deleni vybirajici rovnomerne ze vsech platnych prikladu.
+
+    Platny priklad je trojice (delenec a, delitel b, vysledek c), kde
+    a = b * c, min_b <= b <= max_b, min_val <= c a a <= max_a. Pro delitele b
+    je tedy platnych max_a // b - min_val + 1 vysledku. Delitele se stejnym
+    max_a // b tvori blok se stejnym poctem vysledku; bloku je jen
+    O(sqrt(max_a)). Pokud jich je nejvyse DIV_INDEX_LIMIT, spocitaji se pri
+    vytvoreni kumulativni pocty prikladu po blocich a kazdy tah je jedno
+    rng.randrange a binarni vyhledani bloku.
+
+    Pri vetsich limitech by stavba indexu trvala prilis dlouho, delitele se
+    proto rozdeli jen do O(log max_a) pasem [2^k, 2^(k+1)). Pasmo pokryva
+    obdelnik delitelu a vysledku, ve kterem lezi vsechny jeho platne priklady
+    a ktery je nejvyse zhruba dvakrat vetsi; tah vybere rovnomerne bod
+    sjednoceni obdelniku a neplatne body se zamitnou. Vysledek je stale
+    rovnomerny, v prumeru staci mene nez dva tahy.
+
+    Args:
+        max_result: Maximalni hodnota vysledku (omezuje vysledek a/b)
+        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
+        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
+        no_one: Pokud True, vyloucit jednicku z delitele (default: False)
+
+    Raises:
+        ValueError: Pokud pro zadane limity neexistuje zadny platny priklad
+    """
+
+    symbol = "/"
+
+    FALLBACKS = ()
+
+    __slots__ = (
+        "max_result", "max_number", "min_val", "min_b", "max_a", "max_c", "max_b", "no_zero",
+        "size", "indexed", "_firsts", "_widths", "_starts", "_ends",
+    )
+
+    def __init__(self, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        (
+            self.max_result, self.max_number, self.min_b, self.max_b, self.min_val, self.max_c, self.max_a,
+        ) = self.limits(max_result, max_digits, no_zero, no_one)
+        self.no_zero = no_zero
+
+        # Bloky (presny index) nebo pasma (zamitani): prvni delitel, pocet
+        # vysledku a kumulativni pocet bodu pred a za blokem. Pocty mohou
+        # presahnout 64 bitu (operandy nad 9 cislic), proto listy.
+        self.indexed = 2 * math.isqrt(max(self.max_a, 0)) <= DIV_INDEX_LIMIT
+        self._firsts = []
+        self._widths = []
+        self._starts = []
+        self._ends = []
+        total = 0
+        for first, last, width in (self._blocks() if self.indexed else self._bands()):
+            self._firsts.append(first)
+            self._widths.append(width)
+            self._starts.append(total)
+            total += (last - first + 1) * width
+            self._ends.append(total)
+        # Pocet platnych prikladu (bez indexu velikost sjednoceni pasem)
+        self.size = total
+        if not total:
+            raise ValueError("Pro deleni s temito limity neexistuje zadny platny priklad.")
+
+    @staticmethod
+    def limits(max_result=None, max_digits=None, no_zero=False, no_one=False):
+        """
+        Vypocita meze deleni bez stavby indexu (pouziva i difficulty.py).
+
+        Returns:
+            Tuple (max_result, max_number, min_b, max_b, min_val, max_c, max_a)
+        """
+        # Urceni maximalni hodnoty pro jednotliva cisla
+        max_number = None
+        if max_digits is not None:
+            max_number = 10 ** max_digits - 1
+
+        # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
+        if max_result is None and max_number is None:
+            max_result = 99
+            max_number = 99
+        elif max_number is None:
+            max_number = max_result * max_result  # deleni muze mit velke delence
+        elif max_result is None:
+            max_result = max_number
+
+        # Urceni min_b (delitel) na zaklade no_one
+        min_b = 2 if no_one else 1
+        min_val = 1 if no_zero else 0
+        max_c = min(max_number, max_result)
+        max_b = min(max_number, max(min_b, max_result))
+        # Chceme zajistit, ze VSECHNA cisla (a, b, c) jsou v limitech
+        max_a = min(max_number, max_result)
+        return max_result, max_number, min_b, max_b, min_val, max_c, max_a
+
+    def _blocks(self):
+        """
+        Projde delitele po blocich se stejnym poctem vysledku.
+
+        Yields:
+            Trojice (prvni delitel, posledni delitel, pocet vysledku)
+        """
+        b = self.min_b
+        while b <= self.max_b:
+            q = self.max_a // b  # nejvetsi vysledek pro delitele b (max_c >= max_a)
+            if q < self.min_val:
+                break  # vetsi delitele uz zadny vysledek nemaji
+            last = min(self.max_b, self.max_a // q) if q else self.max_b
+            yield b, last, q - self.min_val + 1
+            b = last + 1
+
+    def _bands(self):
+        """
+        Projde delitele po pasmech [2^k, 2^(k+1)) pro vyber se zamitanim.
+
+        Yields:
+            Trojice (prvni delitel, posledni delitel, pocet vysledku prvniho
+            delitele pasma); vysledky ostatnich delitelu jsou podmnozinou
+        """
+        b = self.min_b
+        while b <= self.max_b:
+            q = self.max_a // b
+            if q < self.min_val:
+                break
+            last = min(self.max_b, (1 << b.bit_length()) - 1)
+            yield b, last, q - self.min_val + 1
+            b = last + 1
+
+    def sample(self, rng):
+        """
+        Vygeneruje jeden priklad.
+
+        Args:
+            rng: Zdroj nahody s metodou randrange (napr. modul random)
+
+        Returns:
+            Tuple (a, "/", b, vysledek)
+        """
+        while True:
+            i = rng.randrange(self.size)
+            block = bisect_right(self._ends, i)
+            b, c = divmod(i - self._starts[block], self._widths[block])
+            b += self._firsts[block]
+            c += self.min_val
+            # V indexu je platny kazdy bod, v pasmech jen ten pod hyperbolou
+            if self.indexed or b * c <= self.max_a:
+                return b * c, "/", b, c
+
+    def sample_many(self, n, rng):
+        """Vygeneruje seznam n prikladu (viz sample)."""
+        sample = self.sample
+        return [sample(rng) for _ in range(n)]
+
+    def space_rows(self):
+        """
+        Popise mnozinu vsech ruznych prikladu, ktere muze sample vratit.
+
+        Returns:
+            List trojic (b, min_c, max_c); pro kazdeho delitele b je platny
+            kazdy vysledek c z intervalu (delenec je b * c)
+        """
+        rows = []
+        for first, last, width in self._blocks():
+            for b in range(first, last + 1):
+                rows.append((b, self.min_val, self.min_val + width - 1))
+        return rows
+
+    def space_size(self, cap=None):
+        """
+        Vrati pocet ruznych prikladu (viz space_rows) bez jejich vyjmenovani.
+
+        S indexem je to size; jinak se sectou bloky, pri prekroceni cap se
+        skonci drive a vrati se mezisoucet.
+        """
+        if self.indexed:
+            return self.size
+        total = 0
+        for first, last, width in self._blocks():
+            total += (last - first + 1) * width
+            if cap is not None and total > cap:
+                break
+        return total
+
+    @staticmethod
+    def build(b, c):
+        """Sestavi priklad z delitele a vysledku (viz space_rows)."""
+        return b * c, "/", b, c
+
+
+class ProblemSpace:
+    """
+    Kompaktni index vsech ruznych platnych prikladu planu.
+
+    Priklady se neukladaji - pro kazdy radek (prvni operand a interval
+    druheho operandu) se ulozi jen kumulativni pocet, takze priklad s danym
+    poradim lze sestavit binarnim vyhledanim. Generatory, ktere umi priklad
+    s danym poradim sestavit samy (size a problem(index), viz difficulty),
+    tvori jeden radek. Priklady kazdeho generatoru tvori souvisly usek
+    poradi (ranges), takze lze vybirat bez opakovani i v ramci jedne operace.
+
+    Args:
+        samplers: Ruzne generatory operaci (AddSampler, SubSampler, ...)
+    """
+
+    __slots__ = ("_samplers", "_ranked", "_owners", "_firsts", "_lows", "_ends", "size", "ranges")
+
+    def __init__(self, samplers):
+        self._samplers = list(samplers)
+        self._ranked = [hasattr(sampler, "problem") for sampler in self._samplers]
+        self._owners = array("b")
+        self._firsts = array("q")
+        self._lows = array("q")
+        self._ends = array("q")
+        # Usek poradi prikladu kazdeho generatoru {generator: range}
+        self.ranges = {}
+        total = 0
+        for i, sampler in enumerate(self._samplers):
+            start = total
+            rows = [(0, 0, sampler.size - 1)] if self._ranked[i] else sampler.space_rows()
+            for first, low, high in rows:
+                if high < low:
+                    continue
+                total += high - low + 1
+                self._owners.append(i)
+                self._firsts.append(first)
+                self._lows.append(low)
+                self._ends.append(total)
+            self.ranges[sampler] = range(start, total)
+        self.size = total
+
+    def problem(self, index):
+        """
+        Vrati priklad s danym poradim.
+
+        Args:
+            index: Poradi prikladu v rozsahu 0 .. size - 1
+
+        Returns:
+            Tuple (a, op, b, vysledek)
+        """
+        row = bisect_right(self._ends, index)
+        start = self._ends[row - 1] if row else 0
+        owner = self._owners[row]
+        if self._ranked[owner]:
+            return self._samplers[owner].problem(index - start)
+        return self._samplers[owner].build(self._firsts[row], self._lows[row] + index - start)
+
+
+# Mapovani operacnich symbolu na predkompilovane generatory
+# Podporuje aliasy: 'x' pro '*' a '÷' pro '/'
+SAMPLER_MAP = {
+    "+": AddSampler,
+    "-": SubSampler,
+    "*": MulSampler,
+    "x": MulSampler,
+    "/": DivSampler,
+    "÷": DivSampler,
+}
+
+
+class GenerationPlan:
+    """
+    Predkompilovany plan generovani pro cely list.
+
+    Meze vsech operaci (max_digits, max_result, no_zero, no_one) se vyhodnoti
+    jen jednou pri vytvoreni planu; samotne generovani pak provadi pouze
+    nahodne tahy a aritmetiku.
+
+    Args:
+        ops: Seznam operaci k pouziti ('+', '-', '*', '/')
+        max_result: Maximalni vysledek prikladu
+        max_digits: Maximalni pocet cislic v cislech
+        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
+        no_one: Pokud True, vyloucit jednicku z nasobeni/deleni (default: False)
+        difficulty: Volitelna obtiznost jako text (napr. "carries=1") nebo
+            difficulty.Difficulty; operace, ktere omezuje, pouziji generatory
+            obtiznosti (viz difficulty.py) (default: None)
+        terms: Pocet operandu prikladu; od 3 se generuji retezce jako
+            "a + b - c" s operacemi z ops (viz chain.py) (default: 2)
+
+    Raises:
+        ValueError: Pokud nejsou zadany platne operace, pri neplatne
+            obtiznosti nebo delce retezce, pokud s obtiznosti nebo retezci
+            neexistuje zadny priklad, nebo pri kombinaci obtiznosti s retezci
+    """
+
+    def __init__(self, ops, max_result=None, max_digits=None, no_zero=False, no_one=False, difficulty=None, terms=2):
+        # Filtrace platnych operaci
+        ops = [o for o in ops if o in SAMPLER_MAP]
+        if not ops:
+            raise ValueError("Zadna platna operace (+ - * /).")
+
+        self.ops = ops
+        self.terms = terms
+        if terms != 2:
+            if difficulty is not None:
+                raise ValueError("Obtiznost (difficulty) nelze kombinovat s retezci (terms).")
+            # Jeden generator retezcu pro vsechny operace; poradi a opakovani ops urcuji vahy
+            chain = _shared_chain(
+                tuple(SAMPLER_MAP[o].symbol for o in ops), terms,
+                max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one,
+            )
+            self.difficulty = None
+            self.samplers = {o: chain for o in ops}
+            self._choices = [chain]
+            return
+
+        level = None
+        if difficulty is not None:
+            # Import az zde - bez obtiznosti se modul vubec nenacita
+            from difficulty import DIFFICULTY_SAMPLERS, parse_difficulty
+
+            level = parse_difficulty(difficulty)
+
+        # Jeden generator pro kazdy typ operace (aliasy sdili instanci)
+        by_class = {}
+        for o in ops:
+            cls = SAMPLER_MAP[o]
+            if cls not in by_class:
+                if level is not None and level.applies_to(cls.symbol):
+                    by_class[cls] = DIFFICULTY_SAMPLERS[cls.symbol](
+                        level, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one,
+                    )
+                else:
+                    by_class[cls] = cls(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+
+        self.difficulty = level
+        self.samplers = {o: by_class[SAMPLER_MAP[o]] for o in ops}
+        # Poradi odpovida ops, takze rng.choice vybira stejne jako drive random.choice(ops)
+        self._choices = [self.samplers[o] for o in ops]
+
+    def sampler(self, op_key):
+        """Vrati predkompilovany generator pro danou operaci."""
+        return self.samplers[op_key]
+
+    def sample(self, rng):
+        """
+        Vygeneruje jeden priklad s nahodne zvolenou operaci.
+
+        Args:
+            rng: Zdroj nahody s metodami choice a randint (napr. modul random)
+
+        Returns:
+            Tuple (a, op, b, vysledek); u retezcu (x0, op1, x1, ..., vysledek)
+        """
+        return rng.choice(self._choices).sample(rng)
+
+    def sample_many(self, n, rng):
+        """
+        Vygeneruje seznam n prikladu s nahodne zvolenymi operacemi.
+
+        Args:
+            n: Pocet prikladu
+            rng: Zdroj nahody s metodami choice a randint (napr. modul random)
+
+        Returns:
+            List tuplu (a, op, b, vysledek)
+        """
+        choice = rng.choice
+        choices = self._choices
+        return [choice(choices).sample(rng) for _ in range(n)]
+
+    def fallback_counts(self):
+        """
+        Vrati pocty pruchodu nahradnimi vetvemi generatoru od vytvoreni planu.
+
+        Returns:
+            Slovnik {"op.vetev": pocet}, napr. {"+.retry_a": 3, "×.no_valid_a": 0}
+        """
+        counts = {}
+        for sampler in dict.fromkeys(self._choices):
+            for name in sampler.FALLBACKS:
+                counts[f"{sampler.symbol}.{name[len('fallback_'):]}"] = getattr(sampler, name)
+        return counts
+
+    def space(self):
+        """
+        Vrati ProblemSpace vsech ruznych platnych prikladu planu.
+
+        Raises:
+            ValueError: U retezcu, jejichz prostor se nevyjmenovava
+        """
+        if self.terms != 2:
+            raise ValueError("Prostor retezcu nelze vyjmenovat.")
+        return ProblemSpace(dict.fromkeys(self._choices))
+
+    def space_size(self, cap=None):
+        """
+        Vrati pocet ruznych platnych prikladu planu bez stavby indexu.
+
+        Args:
+            cap: Pokud je zadano, muze se pocitani po prekroceni cap ukoncit;
+                vysledek je pak jen nejaka hodnota vetsi nez cap
+        """
+        total = 0
+        for sampler in dict.fromkeys(self._choices):
+            left = None if cap is None else cap - total
+            total += sampler.space_size(left)
+            if cap is not None and total > cap:
+                break
+        return total
+
+    def sample_unique(self, n, rng):
+        """
+        Vygeneruje n navzajem ruznych prikladu (podle klice a, op, b).
+
+        Nejdrive se bez vyjmenovani spocita velikost prostoru (space_size).
+        Male prostory prikladu se vyjmenuji a vybira se z nich bez
+        opakovani (viz _draw_unique). U velkych prostoru se generuje bezne
+        a opakovani se odmitaji pomoci mnoziny klicu; pocet pokusu je omezen
+        a po jeho vycerpani se index postavi a zbytek se vybere stejne jako
+        u malych prostoru.
+        Operace se v obou pripadech vybira s vahami planu jako v sample.
+        Retezce (terms > 2) se vzdy jen odmitaji podle klice vsech operandu
+        a operaci.
+
+        Args:
+            n: Pocet prikladu
+            rng: Zdroj nahody s metodami choice, randint, randrange a sample
+
+        Returns:
+            List tuplu (a, op, b, vysledek)
+
+        Raises:
+            ValueError: Pokud ruznych platnych prikladu je mene nez n
+                (u retezcu pokud se je nepodari najit ve vycerpanych pokusech)
+        """
+        if self.terms != 2:
+            return self._sample_unique_chains(n, rng)
+        # Presna velikost je potreba jen do meze, nad kterou se vzdy odmita
+        size = self.space_size(max(UNIQUE_ENUMERATE_LIMIT, 2 * n))
+        if n > size:
+            raise ValueError(
+                f"Nelze vygenerovat {n} ruznych prikladu, pri tomto nastaveni jich existuje jen {size}."
+            )
+
+        seen = set()
+        problems = []
+        # Maly nebo temer vycerpany prostor: vyber bez opakovani z indexu
+        if size <= UNIQUE_ENUMERATE_LIMIT or 2 * n > size:
+            return self._draw_unique(self.space(), n, rng, seen, problems)
+
+        # Operace se vybira jednou pro kazdy priklad; opakovani se zkousi znovu v ramci teze operace
+        choice = rng.choice
+        choices = self._choices
+        attempts = n * UNIQUE_MAX_ATTEMPTS
+        while len(problems) < n and attempts > 0:
+            sampler = choice(choices)
+            while attempts > 0:
+                attempts -= 1
+                p = sampler.sample(rng)
+                key = p[:3]
+                if key not in seen:
+                    seen.add(key)
+                    problems.append(p)
+                    break
+
+        if len(problems) == n:
+            return problems
+        # Pokusy vycerpany: zbytek z indexu (aspon polovina prostoru je volna)
+        return self._draw_unique(self.space(), n, rng, seen, problems)
+
+    def _draw_unique(self, space, n, rng, seen, problems):
+        """
+        Doplni problems na n ruznych prikladu vyberem z indexu space.
+
+        Operace se vybira s vahami planu (rng.choice z _choices, stejne jako
+        v sample) a priklad rovnomerne bez opakovani z jejiho useku indexu
+        (castecne Fisher-Yatesovo michani, zapamatuji se jen prohozene
+        pozice); priklady uz obsazene v seen se v ramci teze operace
+        preskoci. Jina operace se vylosuje jen tehdy, kdyz je usek
+        vylosovane operace vycerpany.
+
+        Args:
+            space: ProblemSpace planu
+            n: Pozadovany pocet prikladu (nejvyse space.size)
+            rng: Zdroj nahody s metodami choice a randrange
+            seen: Mnozina klicu (a, op, b) jiz vybranych prikladu (doplnuje se)
+            problems: List jiz vybranych prikladu (doplnuje se)
+
+        Returns:
+            List problems
+        """
+        ranges = space.ranges
+        choices = [sampler for sampler in self._choices if ranges[sampler]]
+        left = {sampler: len(span) for sampler, span in ranges.items()}
+        moved = {sampler: {} for sampler in ranges}
+        problem = space.problem
+        while len(problems) < n:
+            sampler = rng.choice(choices)
+            start = ranges[sampler].start
+            swaps = moved[sampler]
+            last = left[sampler]
+            while last:
+                last -= 1
+                j = rng.randrange(last + 1)
+                pick = swaps.get(j, j)
+                swaps[j] = swaps.get(last, last)
+                p = problem(start + pick)
+                key = p[:3]
+                if key not in seen:
+                    seen.add(key)
+                    problems.append(p)
+                    break
+            left[sampler] = last
+            if not last:
+                # Usek vycerpany: dale jen ostatni operace (v puvodnim pomeru vah)
+                choices = [other for other in choices if other is not sampler]
+        return problems
+
+    def _sample_unique_chains(self, n, rng):
+        """Vygeneruje n ruznych retezcu odmitanim opakovani (viz sample_unique)."""
+        seen = set()
+        problems = []
+        sample = self.sample
+        attempts = n * UNIQUE_MAX_ATTEMPTS
+        while len(problems) < n and attempts > 0:
+            attempts -= 1
+            p = sample(rng)
+            key = p[:-1]
+            if key not in seen:
+                seen.add(key)
+                problems.append(p)
+        if len(problems) < n:
+            raise ValueError(
+                f"Nepodarilo se vygenerovat {n} ruznych retezcu, nalezeno jen {len(problems)}; "
+                "zvyste limity nebo snizte pocet prikladu."
+            )
+        return problems
+
+
+@lru_cache(maxsize=16)
+def _shared_plan(ops, max_result=None, max_digits=None, no_zero=False, no_one=False, difficulty=None, terms=2):
+    """
+    Vrati sdileny GenerationPlan pro dane nastaveni (ops jako tuple).
+
+    Pro opakovane male davky se stejnym nastavenim (zivy nahled v GUI,
+    make_problem_text), kde by se jinak plan i s indexy generatoru stavel
+    pri kazdem volani. Citace nahradnich vetvi sdileneho planu se scitaji
+    pres vsechna volani,
+    proto se nepouziva tam, kde se hlasi (generate_sheet, audit).
+    """
+    return GenerationPlan(
+        ops, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one, difficulty=difficulty,
+        terms=terms,
+    )
+
+
+@lru_cache(maxsize=4)
+def _shared_chain(ops, terms, max_result=None, max_digits=None, no_zero=False, no_one=False):
+    """
+    Vrati sdileny a predem pripraveny ChainSampler (viz ChainSampler.prepare).
+
+    Mapy dokoncitelnych hodnot se pri velkych mezich pocitaji desitky ms
+    pro kazdou posloupnost operaci; sdilenim mezi plany se spocitaji jednou
+    pro vsechny listy i nahledy se stejnym nastavenim. Generator retezcu
+    nema citace nahradnich vetvi, takze ho muze sdilet i generate_sheet.
+    """
+    # Import az zde - bez retezcu se modul vubec nenacita
+    from chain import ChainSampler
+
+    chain = ChainSampler(
+        list(ops), terms, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one
+    )
+    chain.prepare()
+    return chain
+
+
+# ----------------------------
+# Zaznamy prikladu
+# ----------------------------
+# Kody operaci ve sloupci op odpovidaji indexum v teto tabulce
+OP_SYMBOLS = ("+", "-", "×", "/")
+OP_CODES = {symbol: code for code, symbol in enumerate(OP_SYMBOLS)}
+
+# Hranice pro pocet cislic: digit_count(n) = pocet hranic <= n, plus jedna
+_DIGIT_BOUNDS = [10 ** k for k in range(1, 64)]
+
+
+def digit_count(n):
+    """Vrati pocet cislic nezaporneho cisla n (bez prevodu na text)."""
+    return bisect_right(_DIGIT_BOUNDS, n) + 1
+
+
+def carry_count(a, b):
+    """Vrati pocet prenosu pri pisemnem scitani nezapornych cisel a + b."""
+    carries = carry = 0
+    while a or b:
+        carry = a % 10 + b % 10 + carry >= 10
+        carries += carry
+        a //= 10
+        b //= 10
+    return carries
+
+
+def borrow_count(a, b):
+    """Vrati pocet vypujcek pri pisemnem odcitani a - b (pro a >= b >= 0)."""
+    borrows = borrow = 0
+    while a and (b or borrow):
+        borrow = a % 10 - borrow < b % 10
+        borrows += borrow
+        a //= 10
+        b //= 10
+    return borrows
+
+
+def _int_column(values):
+    """Ulozi cela cisla do kompaktniho pole; cisla mimo int64 zustanou v listu."""
+    try:
+        return array("q", values)
+    except OverflowError:
+        return list(values)
+
+
+def _concat_column(columns, typecode="q"):
+    """Spoji sloupce (pole nebo listy z _int_column) do jednoho kompaktniho sloupce."""
+    try:
+        merged = array(typecode)
+        for column in columns:
+            merged.extend(column)
+        return merged
+    except OverflowError:
+        return list(chain.from_iterable(columns))
+
+
+class ProblemSet:
+    """
+    Kompaktni sloupcove ulozeni prikladu.
+
+    Operandy a vysledky jsou v polich array("q"), operace jako kody do
+    OP_SYMBOLS v array("b") - priklad tak zabira 25 bajtu misto tuplu
+    a textu. Texty se vytvari az pri zapisu (render), sirky sloupcu se
+    pocitaji z poctu cislic operandu.
+
+    Retezce s vice operandy (viz chain.py) maji dalsi dvojice sloupcu
+    (kody operaci, operandy) v tail; vsechny priklady sady maji stejny pocet
+    operandu.
+
+    Indexovani vraci tuple (a, op, b, vysledek) stejne jako
+    GenerationPlan.sample, vyrez vraci novy ProblemSet.
+
+    Args:
+        a: Sloupec prvnich operandu
+        op: Sloupec kodu operaci (indexy do OP_SYMBOLS)
+        b: Sloupec druhych operandu
+        result: Sloupec vysledku
+        tail: Dvojice sloupcu (kody operaci, operandy) dalsich clenu retezcu
+    """
+
+    __slots__ = ("a", "op", "b", "result", "tail")
+
+    def __init__(self, a=(), op=(), b=(), result=(), tail=()):
+        self.a = _int_column(a)
+        self.op = array("b", op)
+        self.b = _int_column(b)
+        self.result = _int_column(result)
+        self.tail = tuple((array("b", o), _int_column(x)) for o, x in tail)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Vytvori ProblemSet z tuplu (a, op, b, vysledek).
+
+        Args:
+            records: Iterovatelne tuply, napr. z GenerationPlan.sample_many;
+                retezce jako (x0, op1, x1, op2, x2, ..., vysledek)
+        """
+        records = list(records)
+        if not records:
+            return cls()
+        a, ops, b, *rest, result = zip(*records)
+        codes = OP_CODES.__getitem__
+        tail = [(map(codes, o), x) for o, x in zip(rest[::2], rest[1::2])]
+        return cls(a, map(codes, ops), b, result, tail)
+
+    @classmethod
+    def concat(cls, parts):
+        """
+        Spoji sady prikladu za sebe v danem poradi.
+
+        Args:
+            parts: ProblemSety se stejnym poctem operandu
+
+        Returns:
+            Novy ProblemSet; sloupce se spojuji jako pole (bez prevodu na tuply)
+        """
+        parts = list(parts)
+        merged = cls.__new__(cls)
+        merged.a = _concat_column([p.a for p in parts])
+        merged.op = _concat_column([p.op for p in parts], "b")
+        merged.b = _concat_column([p.b for p in parts])
+        merged.result = _concat_column([p.result for p in parts])
+        terms = len(parts[0].tail) if parts else 0
+        merged.tail = tuple(
+            (_concat_column([p.tail[k][0] for p in parts], "b"), _concat_column([p.tail[k][1] for p in parts]))
+            for k in range(terms)
+        )
+        return merged
+
+    def __len__(self):
+        return len(self.op)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            part = ProblemSet.__new__(ProblemSet)
+            part.a = self.a[index]
+            part.op = self.op[index]
+            part.b = self.b[index]
+            part.result = self.result[index]
+            part.tail = tuple((o[index], x[index]) for o, x in self.tail)
+            return part
+        record = (self.a[index], OP_SYMBOLS[self.op[index]], self.b[index])
+        for o, x in self.tail:
+            record += (OP_SYMBOLS[o[index]], x[index])
+        return record + (self.result[index],)
+
+    def __iter__(self):
+        if self.tail:
+            for i in range(len(self)):
+                yield self[i]
+            return
+        symbols = OP_SYMBOLS
+        for a, o, b, r in zip(self.a, self.op, self.b, self.result):
+            yield a, symbols[o], b, r
+
+    def left_widths(self):
+        """Vrati delky levych casti "a op b" vsech prikladu (z poctu cislic)."""
+        if self.tail:
+            return [len(text) for text in self._chain_lefts(slice(None))]
+        # digit_count rozepsany primo do smycky: 2 cislice navic + " op " = 5
+        bounds = _DIGIT_BOUNDS
+        return [bisect_right(bounds, a) + bisect_right(bounds, b) + 5 for a, b in zip(self.a, self.b)]
+
+    def _chain_lefts(self, index):
+        """Vrati leve casti retezcu ve vyrezu index (se zavorkami, viz chain.chain_text)."""
+        from chain import chain_text
+
+        symbols = OP_SYMBOLS
+        operands = zip(self.a[index], self.b[index], *(x[index] for _, x in self.tail))
+        codes = zip(self.op[index], *(o[index] for o, _ in self.tail))
+        return [chain_text(xs, [symbols[o] for o in os]) for xs, os in zip(operands, codes)]
+
+    def render(self, index, width, answer=False):
+        """
+        Vytvori text prikladu zarovnany tak, aby "=" bylo na pozici width.
+
+        Args:
+            index: Index prikladu
+            width: Sirka leve casti "a op b" (mezery se doplni zleva)
+            answer: Pokud True, misto "___" se doplni vysledek (default: False)
+
+        Returns:
+            String ve formatu "  a op b = ___" (nebo "  a op b = vysledek")
+        """
+        if self.tail:
+            left_part = self._chain_lefts(slice(index, index + 1))[0]
+        else:
+            left_part = f"{self.a[index]} {OP_SYMBOLS[self.op[index]]} {self.b[index]}"
+        return f"{left_part:>{width}} = {self.result[index] if answer else '___'}"
+
+    def render_many(self, index, width, answer=False):
+        """
+        Vytvori zarovnane texty vsech prikladu ve vyrezu (viz render).
+
+        Args:
+            index: slice vybirajici priklady (napr. jeden sloupec rozlozeni)
+            width: Sirka leve casti "a op b"
+            answer: Pokud True, misto "___" se doplni vysledek (default: False)
+
+        Returns:
+            List textu ve formatu "  a op b = ___" (nebo "  a op b = vysledek")
+        """
+        if self.tail:
+            lefts = zip(self._chain_lefts(index), self.result[index])
+            if answer:
+                return [f"{left:>{width}} = {r}" for left, r in lefts]
+            return [f"{left:>{width}} = ___" for left, _ in lefts]
+        symbols = OP_SYMBOLS
+        rows = zip(self.a[index], self.op[index], self.b[index], self.result[index])
+        if answer:
+            return [f"{f'{a} {symbols[o]} {b}':>{width}} = {r}" for a, o, b, r in rows]
+        return [f"{f'{a} {symbols[o]} {b}':>{width}} = ___" for a, o, b, _ in rows]
+
+
 # ----------------------------
 # Generovani prikladu
 # ----------------------------
-def gen_add(max_result=None, max_digits=None, no_zero=False, no_one=False):
+def gen_add(max_result=None, max_digits=None, no_zero=False, no_one=False, rng=None):
     """
     Generuje priklad na scitani.
 
     Args:
-        max_result: Maximalni vysledek operace (omezuje vysledek a+b)
-        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
-        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
-        no_one: Nepoužíváno pro sčítání (zachováno pro konzistenci API)
+        max_result: Maximalni vysledek operace (omezuje vysledek a+b)
+        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
+        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
+        no_one: Nepoužíváno pro sčítání (zachováno pro konzistenci API)
+        rng: Zdroj nahody (napr. random.Random); default: globalni modul random
+
+    Returns:
+        Tuple (a, "+", b, vysledek) kde a + b <= max_result
+
+    Note:
+        Pokud jsou zadany oba parametry, pouzije se prisnejsi limit.
+        max_digits omezuje jednotliva cisla, max_result omezuje vysledek.
+    """
+    return AddSampler(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one).sample(random if rng is None else rng)
+
+
+def gen_sub(max_result=None, max_digits=None, no_zero=False, no_one=False, rng=None):
+    """
+    Generuje priklad na odcitani.
+
+    Args:
+        max_result: Maximalni hodnota mensence (omezuje a)
+        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
+        no_zero: Pokud True, vyloucit nulu z cisel a vysledku (default: False)
+        no_one: Nepoužíváno pro odčítání (zachováno pro konzistenci API)
+        rng: Zdroj nahody (napr. random.Random); default: globalni modul random
+
+    Returns:
+        Tuple (a, "-", b, vysledek) kde a >= b (nezaporne vysledky)
+
+    Note:
+        Pokud jsou zadany oba parametry, pouzije se prisnejsi limit.
+    """
+    return SubSampler(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one).sample(random if rng is None else rng)
+
+
+def gen_mul(max_result=None, max_digits=None, no_zero=False, no_one=False, rng=None):
+    """
+    Generuje priklad na nasobeni.
+
+    Args:
+        max_result: Maximalni vysledek operace (omezuje vysledek a*b)
+        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
+        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
+        no_one: Pokud True, vyloucit jednicku z cisel (default: False)
+        rng: Zdroj nahody (napr. random.Random); default: globalni modul random
+
+    Returns:
+        Tuple (a, "*", b, vysledek) kde a * b <= max_result
+
+    Note:
+        Operand a je vybran rovnomerne ze vsech platnych hodnot primo (bez
+        sestavovani seznamu kandidatu), cena jednoho prikladu tedy nezavisi
+        na max_digits.
+        Pokud jsou zadany oba parametry, pouzije se prisnejsi limit.
+    """
+    return MulSampler(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one).sample(random if rng is None else rng)
+
+
+def gen_div(max_result=None, max_digits=None, no_zero=False, no_one=False, rng=None):
+    """
+    Generuje priklad na deleni.
+
+    Args:
+        max_result: Maximalni hodnota vysledku (omezuje vysledek a/b)
+        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
+        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
+        no_one: Pokud True, vyloucit jednicku z delitele (default: False)
+        rng: Zdroj nahody (napr. random.Random); default: globalni modul random
+
+    Returns:
+        Tuple (a, "/", b, vysledek) kde a / b = cely vysledek bez zbytku
+
+    Raises:
+        ValueError: Pokud pro zadane limity neexistuje zadny platny priklad
+
+    Note:
+        Vysledek je vzdy cele cislo (a = b * vysledek), vsechny platne
+        priklady jsou stejne pravdepodobne.
+        Pokud jsou zadany oba parametry, pouzije se prisnejsi limit.
+    """
+    return _div_sampler(max_result, max_digits, no_zero, no_one).sample(random if rng is None else rng)
+
+
+@lru_cache(maxsize=32)
+def _div_sampler(max_result, max_digits, no_zero, no_one):
+    """Vrati sdileny DivSampler (index bloku se pro stejne limity stavi jen jednou)."""
+    return DivSampler(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+
+
+# Mapovani operacnich symbolu na generatory
+# Podporuje aliasy: 'x' pro '*' a '÷' pro '/'
+GEN_MAP = {
+    "+": gen_add,
+    "-": gen_sub,
+    "*": gen_mul,
+    "x": gen_mul,
+    "/": gen_div,
+    "÷": gen_div,
+}
+
+
+def make_problem_text(ops, max_result=None, max_digits=None, no_zero=False, no_one=False, rng=None):
+    """
+    Vytvori textovou reprezentaci prikladu.
+
+    Args:
+        ops: Seznam operaci k pouziti
+        max_result: Maximalni vysledek pro generovani (deprecated)
+        max_digits: Maximalni pocet cislic v cislech (doporuceno)
+        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
+        no_one: Pokud True, vyloucit jednicku z nasobeni/deleni (default: False)
+        rng: Zdroj nahody (napr. random.Random); default: globalni modul random
+
+    Returns:
+        String ve formatu "a op b = ___"
+
+    Note:
+        Plan se pro stejne nastaveni sdili mezi volanimi (_shared_plan);
+        pro vice prikladu je presto vyhodnejsi vytvorit GenerationPlan
+        jednou a volat jeho metodu sample.
+    """
+    plan = _shared_plan(tuple(ops), max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+    a, op_sym, b, _ = plan.sample(random if rng is None else rng)
+    return f"{a} {op_sym} {b} = ___"
+
+
+# ----------------------------
+# Zapis Excel listu
+# ----------------------------
+def numpy_available():
+    """
+    Zjisti, zda je k dispozici volitelny NumPy engine.
+
+    Returns:
+        True pokud lze pouzit engine="numpy"
+    """
+    try:
+        import numpy_engine
+    except ImportError:
+        return False
+    return numpy_engine.is_available()
+
+
+# Sloupce NumPy enginu jsou int64; vetsi meze zvladne jen Python engine
+NUMPY_INT_MAX = 2 ** 63 - 1
+
+# Meze generatoru, ktere musi NumPy engine reprezentovat (operandy,
+# vysledky a u deleni pocet bodu indexu)
+NUMPY_BOUNDS = ("max_result", "max_number", "max_a", "max_b", "size")
+
+
+def numpy_fits(plan):
+    """
+    Zjisti, zda se vsechny meze planu vejdou do int64 sloupcu NumPy enginu.
+
+    Args:
+        plan: GenerationPlan
+
+    Returns:
+        True pokud lze plan generovat NumPy enginem bez preteceni
+    """
+    return all(
+        getattr(sampler, name, 0) <= NUMPY_INT_MAX
+        for sampler in dict.fromkeys(plan._choices)
+        for name in NUMPY_BOUNDS
+    )
+
+
+def use_numpy_engine(ops, max_result=None, max_digits=None, no_zero=False, no_one=False):
+    """
+    Zjisti, zda se pro dane limity pouzije vyzadany NumPy engine.
+
+    Bez NumPy nebo pri mezich nad int64 (viz numpy_fits) generate_sheet
+    pouzije Python engine. Neplatne limity se tu neposuzuji (vraci True),
+    generate_sheet je odmitne sam.
+
+    Returns:
+        True pokud je NumPy k dispozici a meze se vejdou do int64
+    """
+    if not numpy_available():
+        return False
+    try:
+        plan = _shared_plan(tuple(ops), max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+    except ValueError:
+        return True
+    return numpy_fits(plan)
+
+
+# Maximalni pocet radku jednoho listu v Excelu
+EXCEL_MAX_ROWS = 1048576
+
+# Pocet radku zpracovanych najednou ve streamovacim rezimu
+STREAM_CHUNK_ROWS = 4096
+
+# Rozvrzeni listu
+EXCEL_WIDTH = 29  # cca 200 px
+ROW_HEIGHT = 24
+
+# Uzke okraje (narrow margins) pro tisk, hodnoty jsou v palcich
+PAGE_MARGINS = (("left", 0.25), ("right", 0.25), ("top", 0.75), ("bottom", 0.75), ("header", 0.3), ("footer", 0.3))
+
+# Nazvy sdilenych stylu sesitu (NamedStyle) pro priklady a titulek
+PROBLEM_STYLE = "Priklad"
+TITLE_STYLE = "Nadpis"
+
+# Zaklad nazvu listu s priklady a s resenim
+PROBLEM_SHEET = "Priklady"
+ANSWER_SHEET = "Reseni"
+
+# Mozne hodnoty parametru answers u generate_sheet
+ANSWER_MODES = ("sheet", "file")
+
+# Zapisovace XLSX: openpyxl (obecny) nebo primy zapis XML (xlsx_writer)
+WRITERS = ("openpyxl", "fast")
+
+# Zdroje nahody seedovaneho listu: jedna posloupnost Mersenne Twisteru
+# (puvodni chovani --seed) nebo citacovy generator (viz counter_rng.py)
+RNG_MODES = ("sequential", "counter")
+
+
+class SheetProfiler:
+    """
+    Mereni fazi generate_sheet (zapina se parametrem profile=True).
+
+    Meri cas jednotlivych fazi (vzorkovani, mrizka, zarovnani, bunky, ulozeni),
+    celkovy cas, spicku alokovane pameti (tracemalloc) a pocty pruchodu
+    nahradnimi vetvemi generatoru. tracemalloc samotny vypocet zpomaluje,
+    proto se zapina jen pri profilovani.
+
+    Lenive importovane moduly zapisovace a enginu (openpyxl pri prvnim
+    volani trva i sekundu) se nactou predem - jejich cas se hlasi zvlast
+    jako import_seconds a nezapocita se do celkoveho casu ani spicky pameti.
+
+    Args:
+        writer: Zapisovac generate_sheet ("openpyxl" nebo "fast")
+        engine: Engine generate_sheet ("python" nebo "numpy")
+    """
+
+    def __init__(self, writer="openpyxl", engine="python"):
+        # Import az zde - tracemalloc neni potreba pri beznem behu a zdrzuje start
+        import tracemalloc
+
+        start = time.perf_counter()
+        if writer == "fast":
+            # Jen nacteni modulu; zapis si ho naimportuje znovu ze sys.modules
+            importlib.import_module("xlsx_writer")
+        else:
+            warm_up()
+        if engine == "numpy":
+            numpy_available()
+        self.import_seconds = time.perf_counter() - start
+
+        self.phases = {}
+        self._own_tracing = not tracemalloc.is_tracing()
+        if self._own_tracing:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """Pricte dobu behu bloku k fazi name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def finish(self, count, plan, **info):
+        """
+        Ukonci mereni a sestavi report.
+
+        Args:
+            count: Pocet vygenerovanych prikladu
+            plan: Pouzity GenerationPlan (pro pocty nahradnich vetvi)
+            **info: Dalsi polozky reportu (engine, stream, ...)
+
+        Returns:
+            Slovnik serializovatelny do JSON
+        """
+        import tracemalloc
+
+        wall = time.perf_counter() - self._start
+        peak = tracemalloc.get_traced_memory()[1]
+        if self._own_tracing:
+            tracemalloc.stop()
+        report = {
+            "problems": count,
+            "import_seconds": round(self.import_seconds, 6),
+            "wall_seconds": round(wall, 6),
+            "problems_per_second": round(count / wall, 1) if wall > 0 else None,
+            "peak_memory_bytes": peak,
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "fallbacks": plan.fallback_counts(),
+        }
+        report.update(info)
+        return report
+
+
+class _NoProfiler:
+    """Vypnute profilovani - kazda faze je prazdny kontext bez mereni."""
+
+    _NULL = nullcontext()
+
+    def phase(self, name):
+        return self._NULL
+
+
+NO_PROFILER = _NoProfiler()
+
+
+class GenerationCancelled(Exception):
+    """Generovani bylo zruseno pres parametr cancel u generate_sheet."""
+
+
+class ProgressReporter:
+    """
+    Hlaseni prubehu generate_sheet a kooperativni zruseni.
+
+    Po kazdem bloku prikladu zavola callback(stage, done, total) a zkontroluje
+    priznak zruseni. Etapy: "sampling" (generovani), "writing" (zapis bunek
+    vcetne reseni; pri streamovani oba pruchody) a "saving" (ulozeni; hlasi
+    se jen zacatek, done = total = 0, a uz ho nelze zrusit).
+
+    Args:
+        callback: Funkce callback(stage, done, total) nebo None
+        cancel: Objekt s metodou is_set() (napr. threading.Event) nebo None
+    """
+
+    __slots__ = ("callback", "cancel", "stage", "done", "total")
+
+    def __init__(self, callback=None, cancel=None):
+        self.callback = callback
+        self.cancel = cancel
+        self.stage = None
+        self.done = 0
+        self.total = 0
+
+    def start(self, stage, total):
+        """Zacne novou etapu s total jednotkami prace."""
+        self.stage = stage
+        self.done = 0
+        self.total = total
+        self._report()
+
+    def advance(self, n):
+        """Zapocita n hotovych prikladu v aktualni etape."""
+        self.done += n
+        self._report()
+
+    def _report(self):
+        if self.cancel is not None and self.cancel.is_set():
+            raise GenerationCancelled("Generovani bylo zruseno.")
+        if self.callback is not None:
+            self.callback(self.stage, self.done, self.total)
+
+
+class _NoProgress:
+    """Vypnute hlaseni prubehu - metody nic nedelaji."""
+
+    def start(self, stage, total):
+        pass
+
+    def advance(self, n):
+        pass
+
+
+NO_PROGRESS = _NoProgress()
+
+
+def _sheet_counts(count, cols, start_row):
+    """
+    Rozdeli priklady do listu tak, aby zadny neprekrocil limit radku Excelu.
+
+    Args:
+        count: Celkovy pocet prikladu
+        cols: Pocet sloupcu v rozlozeni
+        start_row: Prvni radek s priklady (za titulkem)
+
+    Returns:
+        List poctu prikladu na jednotlivych listech
+    """
+    per_sheet = (EXCEL_MAX_ROWS - start_row + 1) * cols
+    counts = []
+    while count > 0:
+        counts.append(min(count, per_sheet))
+        count -= counts[-1]
+    return counts or [0]
+
+
+def _sheet_title(index, base=PROBLEM_SHEET):
+    """Vrati nazev listu podle poradi (Priklady, Priklady 2, ...)."""
+    return base if index == 0 else f"{base} {index + 1}"
+
+
+def _answer_title(title):
+    """Vrati titulek listu s resenim (nebo None, pokud list titulek nema)."""
+    return f"{title} - reseni" if title else None
+
+
+def answer_file_name(file_name):
+    """
+    Vrati nazev souboru s resenim pro answers="file".
+
+    Args:
+        file_name: Nazev souboru s priklady (napr. "priklady.xlsx")
+
+    Returns:
+        Nazev souboru s resenim (napr. "priklady_reseni.xlsx")
+    """
+    root, ext = os.path.splitext(file_name)
+    return f"{root}_reseni{ext or '.xlsx'}"
+
+
+def warm_up():
+    """
+    Predem naimportuje openpyxl (a dalsi moduly potrebne pro zapis).
+
+    Import openpyxl je nejdrazsi cast startu, proto se neprovadi pri importu
+    tohoto modulu, ale az pri prvnim zapisu workbooku. GUI muze tuto funkci
+    zavolat ve vlakne na pozadi, aby prvni generovani nemuselo cekat.
+    """
+    # Jen nacteni modulu (WriteOnlyCell, styly); zapis je pak bere ze sys.modules
+    for name in ("openpyxl", "openpyxl.cell", "openpyxl.styles"):
+        importlib.import_module(name)
+
+
+def _register_styles(wb):
+    """
+    Zaregistruje v sesitu sdilene styly pro priklady a titulek.
+
+    Bunky pak odkazuji na styl jen jmenem - openpyxl neporovnava font
+    a zarovnani u kazde bunky zvlast a tabulka stylu ve vystupu obsahuje
+    jen tyto dva zaznamy.
+    """
+    from openpyxl.styles import Alignment, Font, NamedStyle
+
+    # Monospace font pro spravne zarovnani "=" pod sebou
+    wb.add_named_style(NamedStyle(
+        name=PROBLEM_STYLE,
+        font=Font(name="Consolas", size=16),
+        alignment=Alignment(horizontal="left", vertical="center"),
+    ))
+    wb.add_named_style(NamedStyle(name=TITLE_STYLE, font=Font(name="Calibri", size=18, bold=True)))
+
+
+def _setup_worksheet(ws, cols):
+    """Nastavi sirku sloupcu, vysku radku a uzke okraje pro tisk."""
+    from openpyxl.utils import get_column_letter
+
+    # Nastaveni jednotne sirky sloupcu
+    for c in range(1, cols + 1):
+        ws.column_dimensions[get_column_letter(c)].width = EXCEL_WIDTH
+
+    # Jednotna vyska vsech radku pres vychozi format listu (bez zaznamu pro kazdy radek)
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+
+    # Nastaveni uzkych okraju (narrow margins) pro tisk
+    for side, inches in PAGE_MARGINS:
+        setattr(ws.page_margins, side, inches)
+
+
+def column_slices(count, cols, fill_mode):
+    """
+    Vrati pro kazdy sloupec rozlozeni slice indexu prikladu, ktere do nej patri.
+
+    Args:
+        count: Pocet prikladu
+        cols: Pocet sloupcu v rozlozeni
+        fill_mode: "down" (po sloupcich) nebo "across" (po radcich)
+
+    Returns:
+        List cols objektu slice; i-ty prvek vyrezu je priklad v i-tem radku
+    """
+    if fill_mode == "down":
+        # Column-major: sloupec c obsahuje souvisly usek prikladu
+        rows_needed = math.ceil(count / cols)
+        return [slice(c * rows_needed, (c + 1) * rows_needed) for c in range(cols)]
+    # Row-major: sloupec c obsahuje kazdy cols-ty priklad
+    return [slice(c, None, cols) for c in range(cols)]
+
+
+def column_widths(problems, slices):
+    """
+    Spocita sirku leve casti "a op b" pro kazdy sloupec rozlozeni.
+
+    Args:
+        problems: ProblemSet s priklady
+        slices: Sloupce rozlozeni z column_slices
+
+    Returns:
+        List sirek; "=" bude v kazdem sloupci na stejne pozici
+    """
+    widths = problems.left_widths()
+    return [max(widths[sl], default=0) for sl in slices]
+
+
+def layout_columns(problems, cols, fill_mode):
+    """
+    Rozmisti priklady do sloupcu a zarovna je podle "=" v kazdem sloupci.
+
+    Args:
+        problems: ProblemSet s priklady
+        cols: Pocet sloupcu v rozlozeni
+        fill_mode: "down" (po sloupcich) nebo "across" (po radcich)
 
     Returns:
-        Tuple (a, "+", b, vysledek) kde a + b <= max_result
+        List cols sloupcu; kazdy sloupec je list zarovnanych textu shora dolu
+    """
+    slices = column_slices(len(problems), cols, fill_mode)
+    widths = column_widths(problems, slices)
+    return [problems.render_many(sl, width) for sl, width in zip(slices, widths)]
 
-    Note:
-        Pokud jsou zadany oba parametry, pouzije se prisnejsi limit.
-        max_digits omezuje jednotliva cisla, max_result omezuje vysledek.
+
+def layout_grid(problems, cols, fill_mode):
     """
-    # Urceni maximalni hodnoty pro jednotliva cisla
-    max_number = None
-    if max_digits is not None:
-        max_number = 10 ** max_digits - 1
-
-    # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
-    if max_result is None and max_number is None:
-        max_result = 99
-        max_number = 99
-    elif max_number is None:
-        max_number = max_result
-    elif max_result is None:
-        max_result = max_number * 2  # soucet dvou max cisel
-
-    min_val = 1 if no_zero else 0
-    a = random.randint(min_val, min(max_number, max_result))
-    max_b_result = max_result - a
-    max_b = min(max_number, max_b_result)
-    # Zajistit, ze max_b je alespon min_val
-    if max_b < min_val:
-        # Pokud max_b je moc male, zkusime mensi a
-        a = random.randint(min_val, min(max_number, max_result - min_val))
-        max_b = min(max_number, max_result - a)
-    b = random.randint(min_val, max_b)
-    return a, "+", b, a + b
+    Rozmisti priklady do mrizky a zarovna je podle "=" v kazdem sloupci.
 
+    Args:
+        problems: ProblemSet s priklady
+        cols: Pocet sloupcu v rozlozeni
+        fill_mode: "down" (po sloupcich) nebo "across" (po radcich)
 
-def gen_sub(max_result=None, max_digits=None, no_zero=False, no_one=False):
+    Returns:
+        List radku; kazdy radek je list cols zarovnanych textu (nebo None)
     """
-    Generuje priklad na odcitani.
+    return [list(row) for row in zip_longest(*layout_columns(problems, cols, fill_mode))]
+
+
+def preview_lines(
+    ops, count, rows, max_result=None, max_digits=None, seed=None, cols=2, fill_mode="down", no_zero=False, no_one=False,
+    rng=None, difficulty=None, terms=2
+):
+    """
+    Vygeneruje jen viditelny zacatek listu jako zarovnane textove radky.
+
+    Generuji se pouze priklady v prvnich rows radcich rozlozeni (u "down"
+    zacatky vsech sloupcu), zarovnane podle "=" stejne jako na listu.
+    Nepouziva openpyxl, takze je vhodna pro zivy nahled v GUI.
 
     Args:
-        max_result: Maximalni hodnota mensence (omezuje a)
-        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
-        no_zero: Pokud True, vyloucit nulu z cisel a vysledku (default: False)
-        no_one: Nepoužíváno pro odčítání (zachováno pro konzistenci API)
+        ops: Seznam operaci k pouziti
+        count: Celkovy pocet prikladu listu (urcuje delku sloupcu u "down")
+        rows: Pocet zobrazenych radku
+        max_result, max_digits, seed, cols, fill_mode, no_zero, no_one, rng, difficulty, terms:
+            Stejne jako u generate_sheet
 
     Returns:
-        Tuple (a, "-", b, vysledek) kde a >= b (nezaporne vysledky)
+        List textovych radku nahledu (sloupce oddelene mezerami)
+
+    Raises:
+        ValueError: Pokud nejsou zadany platne operace, obtiznost nebo delka retezce
+    """
+    # Plan se pri zmenach nahledu (seed, pocet, rozlozeni) nestavi znovu
+    plan = _shared_plan(
+        tuple(ops), max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one,
+        difficulty=difficulty, terms=terms,
+    )
+    rng = random.Random(seed) if rng is None else rng
+    cols = max(1, cols)
+    rows_needed = math.ceil(count / cols)
+    visible = min(rows, rows_needed)
+
+    if fill_mode == "down":
+        # Zacatek kazdeho sloupce; posledni sloupce mohou byt kratsi nebo prazdne
+        sizes = [max(0, min(visible, count - c * rows_needed)) for c in range(cols)]
+        problems = ProblemSet.from_records(plan.sample_many(sum(sizes), rng))
+        slices = []
+        start = 0
+        for n in sizes:
+            slices.append(slice(start, start + n))
+            start += n
+    else:  # across
+        problems = ProblemSet.from_records(plan.sample_many(min(count, visible * cols), rng))
+        slices = column_slices(len(problems), cols, "across")
+
+    widths = column_widths(problems, slices)
+    columns = [problems.render_many(sl, width) for sl, width in zip(slices, widths)]
+    # Sirka textu ve sloupci = leva cast + " = ___"
+    return [
+        "   ".join((text or "").ljust(width + 6) for text, width in zip(row, widths)).rstrip()
+        for row in zip_longest(*columns)
+    ]
+
+
+def _write_sheet(ws, problems, cols, fill_mode, title, profiler=None, answer=False, progress=None, widths=None):
+    """
+    Zapise jeden list s priklady do bezneho (in-memory) workbooku.
+
+    Args:
+        ws: Cilovy list
+        problems: ProblemSet s priklady
+        cols: Pocet sloupcu v rozlozeni
+        fill_mode: "down" nebo "across"
+        title: Volitelny titulek listu
+        profiler: Volitelny SheetProfiler pro mereni fazi
+        answer: Pokud True, zapise se list s resenim - stejne rozlozeni,
+            misto "___" vysledky ulozene v problems (default: False)
+        progress: Volitelny ProgressReporter; hlasi se po blocich radku
+        widths: Predem spocitane sirky sloupcu (napr. z dilu, viz
+            _sample_sharded); None = spocitat z problems
 
     Note:
-        Pokud jsou zadany oba parametry, pouzije se prisnejsi limit.
+        Sesit musi mit zaregistrovane styly (viz _register_styles).
     """
-    # Urceni maximalni hodnoty pro jednotliva cisla
-    max_number = None
-    if max_digits is not None:
-        max_number = 10 ** max_digits - 1
+    profiler = profiler or NO_PROFILER
+    progress = progress or NO_PROGRESS
+
+    # Hlavicka / titulek
+    start_row = 1
+    if title:
+        ws.cell(row=start_row, column=1, value=title).style = TITLE_STYLE
+        start_row += 2
 
-    # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
-    if max_result is None and max_number is None:
-        max_result = 99
-        max_number = 99
-    elif max_number is None:
-        max_number = max_result
-    elif max_result is None:
-        max_result = max_number
+    with profiler.phase("widths"):
+        slices = column_slices(len(problems), cols, fill_mode)
+        if widths is None:
+            widths = column_widths(problems, slices)
 
-    min_val = 1 if no_zero else 0
-    # Pokud no_zero, a musi byt alespon 2, aby b mohlo byt alespon 1 a vysledek != 0
-    min_a = 2 if no_zero else min_val
-    a = random.randint(min_a, min(max_number, max_result))
-    # Pokud no_zero, b musi byt alespon o 1 mensi nez a, aby vysledek nebyl 0
-    max_b = a - 1 if no_zero else a
-    b = random.randint(min_val, min(max_number, max_b))
-    return a, "-", b, a - b
+    # Zapsani zarovnanych prikladu do buniek - texty vznikaji az tady, jednou
+    with profiler.phase("cells"):
+        for c, (sl, width) in enumerate(zip(slices, widths)):
+            column = problems[sl]
+            for block_start in range(0, len(column), STREAM_CHUNK_ROWS):
+                texts = column.render_many(slice(block_start, block_start + STREAM_CHUNK_ROWS), width, answer)
+                for r, text in enumerate(texts, start_row + block_start):
+                    ws.cell(row=r, column=1 + c, value=text).style = PROBLEM_STYLE
+                progress.advance(len(texts))
 
+    _setup_worksheet(ws, cols)
 
-def gen_mul(max_result=None, max_digits=None, no_zero=False, no_one=False):
+
+class _WriteOnlySheet:
     """
-    Generuje priklad na nasobeni.
+    Obal write-only listu openpyxl s rozhranim begin(cols, title) / append(texts).
+
+    Stejne rozhrani ma xlsx_writer.Worksheet, takze streamovany zapis
+    (_stream_sheet) i zapis po radcich (_append_sheet) funguje s obema
+    zapisovaci.
+    """
+
+    def __init__(self, ws):
+        from openpyxl.cell import WriteOnlyCell
+
+        self.ws = ws
+        self._cell = WriteOnlyCell
+
+    def begin(self, cols, title=None):
+        """Nastavi list a zapise pripadny titulek (priklady pak zacinaji na radku 3)."""
+        _setup_worksheet(self.ws, cols)
+        if title:
+            title_cell = self._cell(self.ws, value=title)
+            title_cell.style = TITLE_STYLE
+            self.ws.append([title_cell])
+            self.ws.append([])
+
+    def append(self, texts):
+        """Zapise jeden radek textu do sloupcu zleva."""
+        row = []
+        for text in texts:
+            cell = self._cell(self.ws, value=text)
+            cell.style = PROBLEM_STYLE
+            row.append(cell)
+        self.ws.append(row)
+
+
+def _append_sheet(sheet, problems, cols, fill_mode, title, profiler=None, answer=False, progress=None, widths=None):
+    """
+    Zapise jeden list s priklady po radcich (pro zapisovac "fast").
+
+    Obdoba _write_sheet pro listy, ktere se plni jen postupne odshora dolu
+    (xlsx_writer.Worksheet): texty se vykresli po blocich pro kazdy sloupec
+    a pak se poskladaji do radku.
 
     Args:
-        max_result: Maximalni vysledek operace (omezuje vysledek a*b)
-        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
-        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
-        no_one: Pokud True, vyloucit jednicku z cisel (default: False)
+        sheet: Cilovy list s metodami begin(cols, title) a append(texts)
+        problems: ProblemSet s priklady
+        cols: Pocet sloupcu v rozlozeni
+        fill_mode: "down" nebo "across"
+        title: Volitelny titulek listu
+        profiler: Volitelny SheetProfiler pro mereni fazi
+        answer: Pokud True, zapise se list s resenim (default: False)
+        progress: Volitelny ProgressReporter; hlasi se po blocich radku
+        widths: Predem spocitane sirky sloupcu; None = spocitat z problems
+    """
+    profiler = profiler or NO_PROFILER
+    progress = progress or NO_PROGRESS
+    sheet.begin(cols, title)
 
-    Returns:
-        Tuple (a, "*", b, vysledek) kde a * b <= max_result
+    with profiler.phase("widths"):
+        slices = column_slices(len(problems), cols, fill_mode)
+        if widths is None:
+            widths = column_widths(problems, slices)
+        columns = [problems[sl] for sl in slices]
 
-    Note:
-        Pouziva kandidatsky pristup pro rovnomernou distribuci operandu.
-        Pokud jsou zadany oba parametry, pouzije se prisnejsi limit.
+    with profiler.phase("cells"):
+        rows_needed = max((len(column) for column in columns), default=0)
+        for block_start in range(0, rows_needed, STREAM_CHUNK_ROWS):
+            block = slice(block_start, block_start + STREAM_CHUNK_ROWS)
+            texts = [column.render_many(block, width, answer) for column, width in zip(columns, widths)]
+            for row in zip_longest(*texts):
+                # Kratsi sloupce konci jen na konci radku (viz column_slices)
+                sheet.append([text for text in row if text is not None])
+            progress.advance(sum(map(len, texts)))
+
+
+def _chunks(total, size):
+    """Vrati velikosti po sobe jdoucich bloku o velikosti nejvyse size."""
+    return [min(size, total - i) for i in range(0, total, size)]
+
+
+def _stream_sheet(ws, source, take, count, cols, fill_mode, title, profiler=None, answer_ws=None, progress=None):
+    """
+    Streamovane zapise jeden list s priklady do write-only workbooku.
+
+    Priklady se nikde neukladaji cele. V prvnim pruchodu se z kopie stavu
+    generatoru spocita maximalni delka leve casti v kazdem sloupci (a pro
+    rezim "down" se ulozi stav generatoru na zacatku kazdeho sloupce), ve
+    druhem pruchodu se stejne priklady vygeneruji znovu a rovnou zapisuji
+    po radcich. Pamet je tak omezena velikosti bloku, ne poctem prikladu.
+
+    Args:
+        ws: Cilovy list s metodami begin(cols, title) a append(texts)
+            (_WriteOnlySheet nebo xlsx_writer.Worksheet)
+        source: Stav generatoru (random.Random nebo numpy Generator)
+        take: Funkce take(source, n) vracejici ProblemSet s n priklady
+        count: Pocet prikladu na tomto listu
+        cols: Pocet sloupcu v rozlozeni
+        fill_mode: "down" nebo "across"
+        title: Volitelny titulek listu
+        profiler: Volitelny SheetProfiler pro mereni fazi
+        answer_ws: Volitelny list pro reseni (stejne rozhrani jako ws); plni se ve stejnem
+            pruchodu ze stejnych bloku prikladu (bez dalsiho generovani)
+        progress: Volitelny ProgressReporter; hlasi se po blocich prikladu
+
+    Returns:
+        Stav generatoru po poslednim prikladu listu (zacatek dalsiho listu)
     """
-    # Urceni maximalni hodnoty pro jednotliva cisla
-    max_number = None
-    if max_digits is not None:
-        max_number = 10 ** max_digits - 1
-
-    # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
-    if max_result is None and max_number is None:
-        max_result = 99
-        max_number = 99
-    elif max_number is None:
-        max_number = max_result
-    elif max_result is None:
-        max_result = max_number * max_number  # soucin dvou max cisel
-
-    # Urceni min_val na zaklade no_zero a no_one
-    if no_one:
-        min_val = 2  # vyloucit 0 a 1
-    elif no_zero:
-        min_val = 1  # vyloucit pouze 0
+    profiler = profiler or NO_PROFILER
+    progress = progress or NO_PROGRESS
+    rows_needed = math.ceil(count / cols)
+    max_lens = [0] * cols
+
+    # Prvni pruchod: sirky sloupcu (a stavy generatoru na zacatku sloupcu)
+    with profiler.phase("prepass"):
+        if fill_mode == "down":
+            col_counts = [max(0, min(rows_needed, count - c * rows_needed)) for c in range(cols)]
+            col_sources = []
+            for c in range(cols):
+                col_sources.append(copy.deepcopy(source))
+                for n in _chunks(col_counts[c], STREAM_CHUNK_ROWS):
+                    max_lens[c] = max(max_lens[c], max(take(source, n).left_widths()))
+                    progress.advance(n)
+        else:  # across
+            start = copy.deepcopy(source)
+            # Bloky maji delku nasobku cols, takze sloupec c zacina v kazdem bloku na indexu c
+            for n in _chunks(count, STREAM_CHUNK_ROWS * cols):
+                widths = take(source, n).left_widths()
+                for c in range(cols):
+                    max_lens[c] = max(max_lens[c], max(widths[c::cols], default=0))
+                progress.advance(n)
+
+    targets = [(ws, title, False)]
+    if answer_ws is not None:
+        targets.append((answer_ws, _answer_title(title), True))
+
+    for sheet, sheet_title, _ in targets:
+        sheet.begin(cols, sheet_title)
+
+    def append_row(cells):
+        """Zapise radek bunek (c, blok, index) na list s priklady i s resenim."""
+        for sheet, _, answer in targets:
+            sheet.append([block.render(i, max_lens[c], answer) for c, block, i in cells])
+
+    # Druhy pruchod: zapis po radcich
+    with profiler.phase("write"):
+        if fill_mode == "down":
+            for block_start in range(0, rows_needed, STREAM_CHUNK_ROWS):
+                columns = []
+                for c in range(cols):
+                    n = min(STREAM_CHUNK_ROWS, col_counts[c] - block_start)
+                    columns.append(take(col_sources[c], n) if n > 0 else ProblemSet())
+                for r in range(min(STREAM_CHUNK_ROWS, rows_needed - block_start)):
+                    append_row([(c, columns[c], r) for c in range(cols) if r < len(columns[c])])
+                progress.advance(sum(len(column) for column in columns))
+        else:  # across
+            for n in _chunks(count, STREAM_CHUNK_ROWS * cols):
+                block = take(start, n)
+                for r in range(0, n, cols):
+                    append_row([(c, block, r + c) for c in range(min(cols, n - r))])
+                progress.advance(n)
+
+    return source
+
+
+def _python_take(plan):
+    """Vrati funkci take(rng, n) pro cisty Python engine."""
+    return lambda rng, n: ProblemSet.from_records(plan.sample_many(n, rng))
+
+
+def _counter_take(plan):
+    """Vrati funkci take(cursor, n) pro citacovy generator (cursor je counter_rng.CounterStream)."""
+    return lambda cursor, n: ProblemSet.from_records(cursor.sample_many(plan, n))
+
+
+# ----------------------------
+# Generovani Excel listu
+# ----------------------------
+def _new_workbook(write_only=False, writer="openpyxl"):
+    """Vytvori prazdny sesit se zaregistrovanymi styly (bez vychoziho listu)."""
+    if writer == "fast":
+        import xlsx_writer
+
+        # Styly jsou v predpripravene sablone, openpyxl neni potreba
+        return xlsx_writer.Workbook()
+
+    # openpyxl se importuje az zde, aby --help, --version a start GUI byly rychle
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=write_only)
+    if not write_only:
+        wb.remove(wb.active)
+    _register_styles(wb)
+    return wb
+
+
+def _answer_workbook(wb, answers, write_only=False, writer="openpyxl"):
+    """Vrati sesit pro listy s resenim podle rezimu answers (nebo None)."""
+    if answers == "sheet":
+        return wb
+    if answers == "file":
+        return _new_workbook(write_only, writer)
+    return None
+
+
+def _row_sheet(wb, name, writer):
+    """Zalozi list pro zapis po radcich (begin/append) v sesitu zvoleneho zapisovace."""
+    ws = wb.create_sheet(name)
+    return ws if writer == "fast" else _WriteOnlySheet(ws)
+
+
+def _save_workbook(wb, file_name, writer="openpyxl", stable=False):
+    """Ulozi sesit; se stable=True bajtove stabilne (pevne casy v zipu i vlastnostech)."""
+    if writer == "fast":
+        wb.save(file_name, stable=stable)
+    elif stable:
+        import xlsx_writer
+
+        xlsx_writer.save_openpyxl(wb, file_name)
     else:
-        min_val = 0  # povolit vse
-
-    candidates = []
-    max_a = min(max_number, max_result)
-    # Zajistit, ze max_a je alespon min_val
-    if max_a < min_val:
-        max_a = min_val
-
-    for a in range(min_val, max_a + 1):
-        if a == 0 and not no_zero:
-            candidates.append((0, "×", 0, 0))
-            continue
-        if a == 0 and no_zero:  # Skip 0 when no_zero
-            continue
-        if a == 1 and no_one:  # Skip 1 when no_one
-            continue
-        max_b = max_result // a
-        max_b = min(max_b, max_number)  # omezit i b podle max_number
-        # Urceni min_b na zaklade no_zero a no_one
-        if no_one:
-            min_b = 2
-        elif no_zero:
-            min_b = 1
-        else:
-            min_b = 0
-        if max_b < min_b:
-            continue
-        b = random.randint(min_b, max_b)
-        candidates.append((a, "×", b, a * b))
+        wb.save(file_name)
+
 
-    # Fallback pokud nejsou zadne candidates
-    if not candidates:
-        return (min_val, "×", min_val, min_val * min_val)
-    return random.choice(candidates)
+def _save_workbooks(wb, answer_wb, file_name, writer="openpyxl", stable=False):
+    """Ulozi sesit s priklady a pripadne samostatny sesit s resenim."""
+    _save_workbook(wb, file_name, writer, stable)
+    if answer_wb is not None and answer_wb is not wb:
+        _save_workbook(answer_wb, answer_file_name(file_name), writer, stable)
 
 
-def gen_div(max_result=None, max_digits=None, no_zero=False, no_one=False):
+def _cache_store(cache, key, file_name, answer_name):
+    """Ulozi vygenerovany vystup do cache (soubor, nebo cely obsah io.BytesIO bez kopie)."""
+    if not hasattr(file_name, "getbuffer"):
+        cache.store(key, file_name, answer_name)
+        return
+    with file_name.getbuffer() as view:
+        cache.store(key, view)
+
+
+def cache_params(
+    ops, count, max_result=None, max_digits=None, seed=None, title=None, cols=2, fill_mode="down", no_zero=False,
+    no_one=False, engine="python", stream=False, unique=False, answers=None, writer="openpyxl", difficulty=None,
+    terms=2, workers=1, rng_mode="sequential"
+):
     """
-    Generuje priklad na deleni.
+    Vrati normalizovane parametry generate_sheet, ktere urcuji obsah souboru.
+
+    Slouzi jako klic cache (viz cache.SheetCache): aliasy operaci, pocet
+    sloupcu, zpusob vyplnovani, engine a obtiznost se normalizuji stejne
+    jako v generate_sheet, takze parametry se stejnym vysledkem maji stejny klic.
+
+    Returns:
+        Slovnik serializovatelny do JSON
+    """
+    level = None
+    if difficulty is not None:
+        from difficulty import parse_difficulty
+
+        level = parse_difficulty(difficulty)
+    params = {
+        # Poradi operaci ovlivnuje tahy generatoru, aliasy ne
+        "ops": [SAMPLER_MAP[o].symbol for o in ops if o in SAMPLER_MAP],
+        "count": count,
+        "max_result": max_result,
+        "max_digits": max_digits,
+        "seed": seed,
+        "title": title,
+        "cols": max(1, cols),
+        "fill_mode": fill_mode if fill_mode in ("down", "across") else "down",
+        "no_zero": bool(no_zero),
+        "no_one": bool(no_one),
+        "engine": (
+            "numpy" if engine == "numpy" and not unique and level is None and terms == 2
+            and rng_mode == "sequential" and use_numpy_engine(ops, max_result, max_digits, no_zero, no_one)
+            else "python"
+        ),
+        "stream": bool(stream),
+        "unique": bool(unique),
+        "answers": answers,
+        "writer": writer,
+    }
+    # Bez obtiznosti se klic nemeni, zaznamy cache z drivejsich verzi plati dal
+    if level is not None:
+        params["difficulty"] = str(level)
+    if terms != 2:
+        params["terms"] = terms
+    # Seedy dilu zavisi na poctu procesu (citacovy generator na nem nezavisi)
+    if workers != 1 and rng_mode == "sequential":
+        params["workers"] = workers
+    if rng_mode != "sequential":
+        params["rng_mode"] = rng_mode
+    return params
+
+
+def problem_config(ops, max_result=None, max_digits=None, no_zero=False, no_one=False, difficulty=None, terms=2):
+    """
+    Vrati normalizovane parametry, na kterych zavisi samotne priklady.
+
+    Spolu se seedem urcuji klic citacoveho generatoru (viz
+    counter_rng.counter_key); rozlozeni listu, pocet prikladu ani zapis
+    do nej nevstupuji, takze priklad k je stejny na listu libovolne delky.
+
+    Returns:
+        Slovnik serializovatelny do JSON
+    """
+    level = None
+    if difficulty is not None:
+        from difficulty import parse_difficulty
+
+        level = parse_difficulty(difficulty)
+    return {
+        "ops": [SAMPLER_MAP[o].symbol for o in ops if o in SAMPLER_MAP],
+        "max_result": max_result,
+        "max_digits": max_digits,
+        "no_zero": bool(no_zero),
+        "no_one": bool(no_one),
+        "difficulty": str(level) if level is not None else None,
+        "terms": terms,
+    }
+
+
+def problems_at(
+    ops, start, stop, seed, max_result=None, max_digits=None, no_zero=False, no_one=False, difficulty=None, terms=2
+):
+    """
+    Vrati priklady start .. stop - 1 listu s rng_mode="counter" bez generovani predchozich.
+
+    Priklady jsou stejne jako na listu z generate_sheet se stejnym seedem
+    a parametry prikladu (rozlozeni a pocet prikladu listu nehraji roli),
+    takze lze znovu vytvorit jeden priklad nebo strankovat velky list.
 
     Args:
-        max_result: Maximalni hodnota vysledku (omezuje vysledek a/b)
-        max_digits: Maximalni pocet cislic v cislech (omezuje a a b)
-        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
-        no_one: Pokud True, vyloucit jednicku z delitele (default: False)
+        ops: Seznam operaci k pouziti ('+', '-', '*', '/')
+        start: Index prvniho prikladu (od 0)
+        stop: Index za poslednim prikladem
+        seed: Seed listu
+        max_result, max_digits, no_zero, no_one, difficulty, terms: Stejne jako u generate_sheet
 
     Returns:
-        Tuple (a, "/", b, vysledek) kde a / b = cely vysledek bez zbytku
+        List tuplu (a, op, b, vysledek); u retezcu (x0, op1, x1, ..., vysledek)
+    """
+    from counter_rng import CounterStream, counter_key
 
-    Note:
-        Vysledek je vzdy cele cislo (a = b * vysledek).
-        Pokud jsou zadany oba parametry, pouzije se prisnejsi limit.
+    plan = GenerationPlan(
+        ops, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one, difficulty=difficulty,
+        terms=terms,
+    )
+    config = problem_config(ops, max_result, max_digits, no_zero, no_one, difficulty, terms)
+    return CounterStream(counter_key(seed, config), start).sample_many(plan, max(0, stop - start))
+
+
+def _sample_problems(plan, count, rng, np_seed, use_numpy, unique, progress=NO_PROGRESS, counter=None):
+    """Vygeneruje vsechny priklady listu zvolenym zpusobem jako ProblemSet (s counter citacovym generatorem)."""
+    if unique:
+        problems = ProblemSet.from_records(plan.sample_unique(count, rng))
+    elif use_numpy:
+        import numpy_engine
+
+        # Cele sloupce operandu najednou; seed predavame primo numpy generatoru
+        problems = numpy_engine.problem_set(*numpy_engine.sample_columns(plan, count, seed=np_seed))
+    else:
+        # Po blocich kvuli hlaseni prubehu; posloupnost je stejna jako pri jednom volani
+        records = []
+        for n in _chunks(count, STREAM_CHUNK_ROWS):
+            records.extend(counter.sample_many(plan, n) if counter is not None else plan.sample_many(n, rng))
+            progress.advance(n)
+        return ProblemSet.from_records(records)
+    progress.advance(count)
+    return problems
+
+
+def _shard_sizes(count, shards):
+    """Rozdeli count na shards po sobe jdoucich dilu (prvnich count % shards je o jeden vetsich)."""
+    base, extra = divmod(count, shards)
+    return [base + (i < extra) for i in range(shards)]
+
+
+def _layout_spans(sheet_counts, cols, fill_mode):
     """
-    # Urceni maximalni hodnoty pro jednotliva cisla
-    max_number = None
-    if max_digits is not None:
-        max_number = 10 ** max_digits - 1
-
-    # Pokud neni zadano ani jedno, pouzijeme vychozi 2 cislice
-    if max_result is None and max_number is None:
-        max_result = 99
-        max_number = 99
-    elif max_number is None:
-        max_number = max_result * max_result  # deleni muze mit velke delence
-    elif max_result is None:
-        max_result = max_number
-
-    # Urceni min_b (delitel) na zaklade no_one
-    min_b = 2 if no_one else 1
-
-    if max_result <= 0:
-        return min_b, "/", min_b, 1 if no_zero else (0, "/", min_b, 0)
-
-    min_val = 1 if no_zero else 0
-    c = random.randint(min_val, min(max_number, max_result))  # vysledek
-    # delitel musi respektovat min_b (1 nebo 2 podle no_one)
-    b = random.randint(min_b, min(max_number, max(min_b, max_result)))  # delitel
-    a = b * c  # delenec
-
-    # Kontrola: pokud a prekracuje max_number nebo max_result, musime upravit b nebo c
-    # Chceme zajistit, ze VSECHNA cisla (a, b, c) jsou v limitech
-    max_a = min(max_number, max_result) if max_result is not None else max_number
-    if a > max_a:
-        # Zkusime najit validni kombinaci b a c
-        # a = b * c, tedy b <= max_a / c
-        max_b_allowed = max_a // c if c > 0 else max_a
-        # b musi respektovat min_b
-        if max_b_allowed < min_b:
-            # c je prilis velke, zkusime mensi c
-            c = random.randint(min_val, min(max_number, max_result, max_a // min_b))
-            max_b_allowed = max_a // c if c > 0 else min_b
-        b = random.randint(min_b, min(max_number, max_b_allowed, max_result))
-        a = b * c
-
-    return a, "/", b, c
+    Vrati sloupce rozlozeni vsech listu v globalnich indexech prikladu.
 
+    Returns:
+        List trojic (start, stop, step) - po cols sloupcich pro kazdy list
+    """
+    spans = []
+    offset = 0
+    for n in sheet_counts:
+        for sl in column_slices(n, cols, fill_mode):
+            start, stop, step = sl.indices(n)
+            spans.append((offset + start, offset + stop, step))
+        offset += n
+    return spans
+
+
+def _span_widths(widths, lo, spans):
+    """Vrati nejvetsi sirku v kazdem sloupci spans jen z prikladu lo .. lo + len(widths) - 1."""
+    hi = lo + len(widths)
+    result = []
+    for start, stop, step in spans:
+        if start < lo:
+            # Prvni index sloupce uvnitr dilu
+            start += -(-(lo - start) // step) * step
+        stop = min(stop, hi)
+        result.append(max(widths[start - lo:stop - lo:step], default=0) if start < stop else 0)
+    return result
+
+
+def _sample_shard(plan_kwargs, n, seed, use_numpy, lo, spans, counter=None):
+    """
+    Vygeneruje jeden dil listu (bezi v pracovnim procesu).
 
-# Mapovani operacnich symbolu na generatory
-# Podporuje aliasy: 'x' pro '*' a '÷' pro '/'
-GEN_MAP = {
-    "+": gen_add,
-    "-": gen_sub,
-    "*": gen_mul,
-    "x": gen_mul,
-    "/": gen_div,
-    "÷": gen_div,
-}
+    S counter (CounterStream na indexu lo) se seed nepouzije - dil obsahuje
+    presne priklady lo .. lo + n - 1 celeho listu.
+
+    Returns:
+        Tuple (ProblemSet dilu, sirky sloupcu spans z prikladu dilu, pocty nahradnich vetvi)
+    """
+    plan = GenerationPlan(**plan_kwargs)
+    problems = _sample_problems(plan, n, random.Random(seed), seed, use_numpy, False, counter=counter)
+    return problems, _span_widths(problems.left_widths(), lo, spans), plan.fallback_counts()
 
 
-def make_problem_text(ops, max_result=None, max_digits=None, no_zero=False, no_one=False):
+def _sample_sharded(plan_kwargs, count, workers, rng, use_numpy, spans, progress=NO_PROGRESS, counter=None):
     """
-    Vytvori textovou reprezentaci prikladu.
+    Vygeneruje priklady listu po dilech v pracovnich procesech.
+
+    count se rozdeli na workers po sobe jdoucich dilu. Kazdy dil ma vlastni
+    seed odvozeny z rng v poradi dilu a dily se spojuji ve stejnem poradi,
+    takze vysledek zavisi jen na seedu a poctu procesu, ne na planovani
+    procesu. Kazdy dil spocita i nejvetsi sirky svych casti sloupcu
+    rozlozeni; ty se jen slouci (max), nad spojenym listem se znovu
+    nepocitaji. S citacovym generatorem (counter) generuje kazdy dil
+    primo svuj usek indexu a vysledek je stejny pro libovolny pocet procesu.
 
     Args:
-        ops: Seznam operaci k pouziti
-        max_result: Maximalni vysledek pro generovani (deprecated)
-        max_digits: Maximalni pocet cislic v cislech (doporuceno)
-        no_zero: Pokud True, vyloucit nulu z cisel (default: False)
-        no_one: Pokud True, vyloucit jednicku z nasobeni/deleni (default: False)
+        plan_kwargs: Argumenty GenerationPlan (plan se sestavi v kazdem procesu)
+        count: Pocet prikladu
+        workers: Pocet dilu a pracovnich procesu
+        rng: Zdroj seedu dilu (random.Random)
+        use_numpy: Pokud True, dily generuje vektorovy engine
+        spans: Sloupce rozlozeni vsech listu (viz _layout_spans)
+        progress: Volitelny ProgressReporter; hlasi se po dilech
+        counter: Volitelny CounterStream celeho listu (rng_mode="counter")
 
     Returns:
-        String ve formatu "a op b = ___"
+        Tuple (ProblemSet, sirky sloupcu v poradi spans, soucty nahradnich
+        vetvi vsech dilu jako GenerationPlan.fallback_counts)
     """
-    op_key = random.choice(ops)
-    a, op_sym, b, _ = GEN_MAP[op_key](max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
-    return f"{a} {op_sym} {b} = ___"
+    from concurrent.futures import ProcessPoolExecutor
+
+    sizes = _shard_sizes(count, workers)
+    seeds = [rng.getrandbits(64) for _ in sizes]
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = []
+        lo = 0
+        for n, seed in zip(sizes, seeds):
+            if n:
+                part_counter = None if counter is None else counter.at(lo)
+                futures.append(executor.submit(_sample_shard, plan_kwargs, n, seed, use_numpy, lo, spans, part_counter))
+            lo += n
+        parts = []
+        widths = [0] * len(spans)
+        fallbacks = {}
+        for future in futures:
+            part, part_widths, part_fallbacks = future.result()
+            parts.append(part)
+            widths = list(map(max, widths, part_widths))
+            for name, n in part_fallbacks.items():
+                fallbacks[name] = fallbacks.get(name, 0) + n
+            progress.advance(len(part))
+    finally:
+        # Pri chybe nebo zruseni se cekajici dily uz nespousti
+        executor.shutdown(cancel_futures=True)
+    return ProblemSet.concat(parts), widths, fallbacks
 
 
-# ----------------------------
-# Generovani Excel listu
-# ----------------------------
 def generate_sheet(
-    ops, count, file_name, max_result=None, max_digits=None, seed=None, title=None, cols=2, fill_mode="down", no_zero=False, no_one=False
+    ops, count, file_name, max_result=None, max_digits=None, seed=None, title=None, cols=2, fill_mode="down", no_zero=False, no_one=False,
+    engine="python", stream=False, rng=None, unique=False, profile=False, answers=None,
+    progress=None, cancel=None, writer="openpyxl", cache=None, difficulty=None, terms=2, workers=1,
+    rng_mode="sequential"
 ):
     """
     Hlavni funkce pro generovani Excel souboru s priklady.
@@ -277,7 +2289,9 @@ def generate_sheet(
     Args:
         ops: Seznam operaci k pouziti ('+', '-', '*', '/')
         count: Pocet prikladu k vygenerovani
-        file_name: Nazev vystupniho .xlsx souboru
+        file_name: Nazev vystupniho .xlsx souboru, nebo zapisovatelny binarni
+            proud (napr. io.BytesIO, soket, polozka zip archivu); do proudu se
+            sesit zapise primo bez docasneho souboru (viz generate_sheet_bytes)
         max_result: Maximalni vysledek prikladu (deprecated, pouzijte max_digits)
         max_digits: Maximalni pocet cislic v cislech (doporuceno, vychozi: 2)
         seed: Volitelny seed pro reprodukovatelnost (default: None)
@@ -286,141 +2300,302 @@ def generate_sheet(
         fill_mode: Zpusob vyplnovani "down" (po sloupcich) nebo "across" (po radcich)
         no_zero: Pokud True, vyloucit nulu z cisel (default: False)
         no_one: Pokud True, vyloucit jednicku z nasobeni/deleni (default: False)
+        engine: "python" (po jednom prikladu) nebo "numpy" (vektorove po sloupcich);
+            pokud NumPy neni nainstalovano, pouzije se "python" (default: "python")
+        stream: Pokud True, zapisuje se po radcich pres write-only workbook
+            s konstantni spotrebou pameti (default: False)
+        rng: Vlastni zdroj nahody (random.Random nebo kompatibilni); pokud je
+            zadan, seed se ignoruje. Globalni modul random se nikdy nemeni.
+        unique: Pokud True, zadny priklad (a, op, b) se na listu neopakuje;
+            generuje se vzdy cistym Python enginem (default: False)
+        profile: Pokud True, meri se faze generovani a vraci se i report
+            (default: False)
+        answers: Reseni se stejnym rozlozenim: "sheet" = dalsi list (Reseni)
+            ve stejnem souboru, "file" = samostatny soubor (viz
+            answer_file_name, jen pri zapisu do souboru), None = bez reseni
+            (default: None)
+        progress: Volitelna funkce progress(stage, done, total) volana po
+            blocich prikladu (viz ProgressReporter); vola se ve vlakne,
+            ktere generuje
+        cancel: Volitelny priznak zruseni s metodou is_set() (napr.
+            threading.Event); kontroluje se mezi bloky prikladu
+        writer: "openpyxl" nebo "fast" (primy zapis XML pres xlsx_writer,
+            bez openpyxl a radove rychlejsi; vzhled listu je stejny)
+            (default: "openpyxl")
+        cache: Volitelna cache.SheetCache; seedovany list se stejnymi
+            parametry se pak vezme z cache misto generovani a novy se do ni
+            ulozi. Bez seedu, s vlastnim rng nebo s profile se cache
+            nepouziva; z proudu jen pri zapisu do prazdneho io.BytesIO
+            (default: None)
+        difficulty: Obtiznost prikladu jako text, napr. "carries=1" nebo
+            "digits=2,table=3" (viz difficulty.py); priklady s obtiznosti
+            se generuji cistym Python enginem (default: None)
+        terms: Pocet operandu prikladu; 3 az 5 = retezce jako "a + b - c"
+            nebo "(a + b) × c" vyhodnocovane zleva doprava, s nezapornymi
+            mezivysledky a delenim beze zbytku (viz chain.py); generuji se
+            cistym Python enginem a nelze je kombinovat s difficulty (default: 2)
+        workers: Pocet pracovnich procesu; pri vice nez 1 se list rozdeli na
+            tolik po sobe jdoucich dilu generovanych soubezne, kazdy s vlastnim
+            seedem odvozenym ze seed/rng. Vystup je pro stejny seed a pocet
+            procesu vzdy stejny (ale jiny nez s workers=1); nelze kombinovat
+            s unique ani stream (default: 1)
+        rng_mode: "sequential" = vsechny priklady z jedne posloupnosti
+            random.Random(seed) (puvodni chovani seedu), "counter" = priklad k
+            je funkci (seed, parametry prikladu, k) nezavislou na verzi Pythonu
+            a na poctu procesu (viz counter_rng.py a problems_at); bez seedu
+            se seed vylosuje, s rng se z nej odvodi. "counter" nelze
+            kombinovat s unique a vzdy pouziva Python engine (default: "sequential")
 
     Returns:
-        Cesta k vytvorenememu souboru
+        Cesta k vytvorenememu souboru (nebo predany proud); pri profile=True tuple (cesta, report),
+        kde report je slovnik s casy fazi, prikladu za sekundu, spickou pameti
+        a pocty nahradnich vetvi generatoru
 
     Raises:
-        ValueError: Pokud nejsou zadany platne operace
+        ValueError: Pokud nejsou zadany platne operace, pokud ruznych prikladu
+            je mene nez count (unique), pri kombinaci unique se stream,
+            pri workers > 1 s unique nebo stream, pri rng_mode="counter" s unique,
+            pri neplatne hodnote answers, writer, difficulty, terms, workers nebo rng_mode,
+            pri answers="file" se zapisem do proudu, nebo pokud s obtiznosti
+            nebo retezci neexistuje zadny priklad
+        GenerationCancelled: Pokud byl nastaven priznak cancel pred ulozenim;
+            soubor se v tom pripade nezapise
+
+    Note:
+        Pokud se priklady nevejdou do limitu radku Excelu (1 048 576),
+        pokracuji automaticky na dalsich listech (Priklady 2, Priklady 3, ...).
+        Seedovany vystup je bajtove stabilni - stejne parametry davaji
+        stejny soubor (pevne casy v zipu i vlastnostech dokumentu).
     """
-    # Nastaveni seedu pro reprodukovatelnost
-    if seed is not None:
-        random.seed(seed)
+    profiler = SheetProfiler(writer, engine) if profile else NO_PROFILER
+    reporter = ProgressReporter(progress, cancel) if progress or cancel else NO_PROGRESS
 
-    # Filtrace platnych operaci
-    ops = [o for o in ops if o in GEN_MAP]
-    if not ops:
-        raise ValueError("Zadna platna operace (+ - * /).")
+    # Predkompilace planu generovani (meze se vyhodnoti jen jednou pro cely list)
+    with profiler.phase("plan"):
+        plan = GenerationPlan(
+            ops, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one, difficulty=difficulty,
+            terms=terms,
+        )
 
     # Validace poctu sloupcu
     cols = max(1, cols)
 
-    # Vytvoreni Excel workbooku
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Priklady"
+    # Validace fill_mode
+    if fill_mode not in ("down", "across"):
+        fill_mode = "down"
 
-    # Stylovani - pouzijeme monospace font pro spravne zarovnani
-    font = Font(name="Consolas", size=16)
-    align_left = Alignment(horizontal="left", vertical="center")
+    # Unikatni priklady vyzaduji index celeho listu, streamovat je nelze
+    if unique and stream:
+        raise ValueError("Rezim bez opakovani (unique) nelze kombinovat se streamovanim (stream).")
+
+    # Dily se generuji nezavisle a cele v pameti - bez indexu celeho listu a bez streamovani
+    if workers < 1:
+        raise ValueError("Pocet procesu (workers) musi byt alespon 1.")
+    if workers > 1 and (unique or stream):
+        raise ValueError("Generovani po dilech (workers) nelze kombinovat s unique ani se streamovanim (stream).")
+
+    if rng_mode not in RNG_MODES:
+        raise ValueError(f"Neplatny zdroj nahody: {rng_mode} (mozne: {', '.join(RNG_MODES)})")
+    # Vyber bez opakovani zavisi na vsech predchozich prikladech, priklad k nelze adresovat
+    if rng_mode == "counter" and unique:
+        raise ValueError("Citacovy generator (rng_mode counter) nelze kombinovat s rezimem bez opakovani (unique).")
+
+    if answers is not None and answers not in ANSWER_MODES:
+        raise ValueError(f"Neplatny rezim reseni: {answers} (mozne: {', '.join(ANSWER_MODES)})")
+
+    if writer not in WRITERS:
+        raise ValueError(f"Neplatny zapisovac: {writer} (mozne: {', '.join(WRITERS)})")
+
+    # Do proudu jde jen jeden sesit - samostatny soubor s resenim by nebylo kam zapsat
+    to_stream = hasattr(file_name, "write")
+    if to_stream and answers == "file":
+        raise ValueError("Rezim reseni 'file' vyzaduje cestu k souboru, pri zapisu do proudu pouzijte 'sheet'.")
+
+    # Vektorovy engine nema obdobu generatoru obtiznosti ani retezcu a pocita v int64
+    use_numpy = (
+        engine == "numpy" and numpy_available() and not unique and plan.difficulty is None and terms == 2
+        and rng_mode == "sequential" and numpy_fits(plan)
+    )
 
-    # Hlavicka / titulek
-    start_row = 1
-    if title:
-        title_cell = ws.cell(row=start_row, column=1)
-        title_cell.value = title
-        title_cell.font = Font(name="Calibri", size=18, bold=True)
-        start_row += 2
+    # Deterministicky (seedovany) vystup se uklada bajtove stabilne a muze jit z cache
+    stable = seed is not None and rng is None
+    answer_name = answer_file_name(file_name) if answers == "file" else None
+    cache_key = None
+    # Z proudu lze zaznam ulozit jen pri zapisu do prazdneho io.BytesIO (offsety
+    # v zipu jsou od zacatku proudu, neseekovatelny proud zapisuje jine hlavicky)
+    cacheable = not to_stream or (hasattr(file_name, "getbuffer") and file_name.tell() == 0)
+    if cache is not None and stable and not profile and cacheable:
+        cache_key = cache.key(cache_params(
+            ops, count, max_result, max_digits, seed, title, cols, fill_mode, no_zero, no_one,
+            engine, stream, unique, answers, writer, plan.difficulty, terms, workers, rng_mode,
+        ))
+        if cache.fetch(cache_key, file_name, answer_name):
+            return file_name
+
+    start_row = 3 if title else 1
+    sheet_counts = _sheet_counts(count, cols, start_row)
+
+    # Vlastni instance generatoru - soubezna generovani (vlakna GUI, server)
+    # si navzajem neprepisuji stav a globalni modul random zustava netknuty
+    if rng is None:
+        rng = random.Random(seed)
+        np_seed = seed
+    else:
+        # NumPy engine odvodi svuj seed z predaneho generatoru
+        np_seed = rng.getrandbits(64) if use_numpy else None
+
+    counter = None
+    if rng_mode == "counter":
+        from counter_rng import CounterStream, counter_key
+
+        # Klic ze seedu a parametru prikladu - priklad k nezavisi na rozlozeni ani poctu prikladu
+        if not stable:
+            seed = rng.getrandbits(64)
+        config = problem_config(ops, max_result, max_digits, no_zero, no_one, difficulty, terms)
+        counter = CounterStream(counter_key(seed, config))
+
+    if stream:
+        if use_numpy:
+            import numpy_engine
+
+            source = numpy_engine.make_generator(np_seed)
+            take = numpy_engine.problem_sampler(plan)
+        elif counter is not None:
+            source = counter
+            take = _counter_take(plan)
+        else:
+            source = rng
+            take = _python_take(plan)
+
+        wb = _new_workbook(write_only=True, writer=writer)
+        answer_wb = _answer_workbook(wb, answers, write_only=True, writer=writer)
+        # Listy s resenim se zakladaji predem, aby v sesitu byly az za vsemi listy s priklady
+        sheets = [_row_sheet(wb, _sheet_title(i), writer) for i in range(len(sheet_counts))]
+        answer_sheets = [
+            _row_sheet(answer_wb, _sheet_title(i, ANSWER_SHEET), writer) if answer_wb else None
+            for i in range(len(sheet_counts))
+        ]
+        # Kazdy priklad se generuje dvakrat (sirky sloupcu a zapis)
+        reporter.start("writing", 2 * count)
+        for ws, answer_ws, n in zip(sheets, answer_sheets, sheet_counts):
+            source = _stream_sheet(ws, source, take, n, cols, fill_mode, title, profiler, answer_ws, reporter)
+        reporter.start("saving", 0)
+        with profiler.phase("save"):
+            _save_workbooks(wb, answer_wb, file_name, writer, stable)
+        if cache_key:
+            _cache_store(cache, cache_key, file_name, answer_name)
+        if profile:
+            return file_name, profiler.finish(
+                count, plan, engine="numpy" if use_numpy else "python", stream=True, writer=writer, rng_mode=rng_mode,
+            )
+        return file_name
 
     # Vygenerovani vsech prikladu najednou
-    problems = [make_problem_text(ops, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one) for _ in range(count)]
+    reporter.start("sampling", count)
+    widths = None
+    fallbacks = {}
+    with profiler.phase("sampling"):
+        if workers > 1:
+            plan_kwargs = dict(
+                ops=ops, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one,
+                difficulty=difficulty, terms=terms,
+            )
+            spans = _layout_spans(sheet_counts, cols, fill_mode)
+            problems, widths, fallbacks = _sample_sharded(
+                plan_kwargs, count, workers, rng, use_numpy, spans, reporter, counter,
+            )
+        else:
+            problems = _sample_problems(plan, count, rng, np_seed, use_numpy, unique, reporter, counter)
 
-    # Validace fill_mode
-    if fill_mode not in ("down", "across"):
-        fill_mode = "down"
+    # Vytvoreni Excel workbooku
+    wb = _new_workbook(writer=writer)
+    answer_wb = _answer_workbook(wb, answers, writer=writer)
+    # Primy zapisovac plni listy jen po radcich, openpyxl po sloupcich
+    write_sheet = _append_sheet if writer == "fast" else _write_sheet
+    reporter.start("writing", 2 * count if answer_wb else count)
+    # Sirky sloupcu z dilu (po cols pro kazdy list); jinak se spocitaji pri zapisu listu
+    sheet_widths = [widths[i * cols:(i + 1) * cols] if widths else None for i in range(len(sheet_counts))]
+    offset = 0
+    for i, n in enumerate(sheet_counts):
+        ws = wb.create_sheet(_sheet_title(i))
+        write_sheet(
+            ws, problems[offset:offset + n], cols, fill_mode, title, profiler, progress=reporter, widths=sheet_widths[i],
+        )
+        offset += n
+
+    # Reseni ze stejnych zaznamu (vysledky uz jsou spocitane), stejne rozlozeni
+    if answer_wb is not None:
+        offset = 0
+        for i, n in enumerate(sheet_counts):
+            ws = answer_wb.create_sheet(_sheet_title(i, ANSWER_SHEET))
+            write_sheet(
+                ws, problems[offset:offset + n], cols, fill_mode, _answer_title(title), profiler,
+                answer=True, progress=reporter, widths=sheet_widths[i],
+            )
+            offset += n
 
-    # Vypocet potrebneho poctu radku
-    rows_needed = math.ceil(count / cols)
+    # Ulozeni souboru
+    reporter.start("saving", 0)
+    with profiler.phase("save"):
+        _save_workbooks(wb, answer_wb, file_name, writer, stable)
+    if cache_key:
+        _cache_store(cache, cache_key, file_name, answer_name)
+    if profile:
+        # Pri generovani po dilech bezely generatory v pracovnich procesech
+        extra = {"workers": workers, "fallbacks": fallbacks} if workers > 1 else {}
+        return file_name, profiler.finish(
+            count, plan, engine="numpy" if use_numpy else "python", stream=False, writer=writer, rng_mode=rng_mode,
+            **extra,
+        )
+    return file_name
 
-    # Rozdeleni prikladu do sloupcu pro zjisteni max delky v kazdem sloupci
-    # Nejprve vytvorime 2D strukturu prikladu podle fill_mode
-    grid = [[None for _ in range(cols)] for _ in range(rows_needed)]
-    idx = 0
 
-    if fill_mode == "down":
-        # Column-major: plneni po sloupcich
-        for c in range(cols):
-            for r in range(rows_needed):
-                if idx >= count:
-                    break
-                grid[r][c] = problems[idx]
-                idx += 1
-    else:  # across
-        # Row-major: plneni po radcich
-        for r in range(rows_needed):
-            for c in range(cols):
-                if idx >= count:
-                    break
-                grid[r][c] = problems[idx]
-                idx += 1
+def generate_sheet_bytes(ops, count, **kwargs):
+    """
+    Vygeneruje sesit do pameti bez zapisu na disk.
 
-    # Najdeme maximalni delku leve casti (pred "= ___") v kazdem sloupci
-    max_lens = [0] * cols
-    for c in range(cols):
-        for r in range(rows_needed):
-            if grid[r][c] is not None:
-                # Ziskame cast pred "= ___"
-                left_part = grid[r][c].split(" = ")[0]
-                max_lens[c] = max(max_lens[c], len(left_part))
-
-    # Zarovname priklady v kazdem sloupci podle nejdelsiho
-    # Mezery budou na zacatku pro zarovnani k "="
-    for c in range(cols):
-        for r in range(rows_needed):
-            if grid[r][c] is not None:
-                parts = grid[r][c].split(" = ")
-                left_part = parts[0]
-                # Pridame mezery na zacatek pro zarovnani zprava
-                padding = max_lens[c] - len(left_part)
-                grid[r][c] = " " * padding + left_part + " = ___"
-
-    # Zapsani zarovnanych prikladu do buniek
-    for r in range(rows_needed):
-        for c in range(cols):
-            if grid[r][c] is not None:
-                cell = ws.cell(row=start_row + r, column=1 + c)
-                cell.value = grid[r][c]
-                cell.font = font
-                cell.alignment = align_left
-
-    # Nastaveni jednotne sirky sloupcu (cca 200 px)
-    EXCEL_WIDTH = 29
-    for c in range(1, cols + 1):
-        ws.column_dimensions[get_column_letter(c)].width = EXCEL_WIDTH
+    Sesit se zapise do io.BytesIO a vrati se memoryview nad jeho bufferem
+    (bez dalsi kopie), ktery lze poslat primo do HTTP odpovedi nebo zip
+    archivu. bytes(...) z nej vytvori samostatnou kopii.
 
-    # Zvyseni radkovani pro lepsi citelnost
-    ROW_HEIGHT = 24
-    for r in range(start_row, start_row + rows_needed):
-        ws.row_dimensions[r].height = ROW_HEIGHT
+    Args:
+        ops: Seznam operaci k pouziti ('+', '-', '*', '/')
+        count: Pocet prikladu k vygenerovani
+        **kwargs: Dalsi parametry jako u generate_sheet (bez file_name;
+            reseni jen jako answers="sheet")
 
-    # Nastaveni uzkych okraju (narrow margins) pro tisk
-    # Hodnoty jsou v palcich
-    ws.page_margins.left = 0.25
-    ws.page_margins.right = 0.25
-    ws.page_margins.top = 0.75
-    ws.page_margins.bottom = 0.75
-    ws.page_margins.header = 0.3
-    ws.page_margins.footer = 0.3
+    Returns:
+        memoryview s obsahem souboru .xlsx; pri profile=True tuple (memoryview, report)
 
-    # Ulozeni souboru
-    wb.save(file_name)
-    return file_name
+    Raises:
+        ValueError: Stejne jako generate_sheet
+        GenerationCancelled: Stejne jako generate_sheet
+    """
+    buffer = io.BytesIO()
+    result = generate_sheet(ops, count, buffer, **kwargs)
+    if kwargs.get("profile"):
+        return buffer.getbuffer(), result[1]
+    return buffer.getbuffer()
 
 
 # ----------------------------
 # CLI rozhrani
 # ----------------------------
-def parse_args():
+def build_parser():
     """
-    Parsuje argumenty prikazove radky.
+    Vytvori parser argumentu prikazove radky.
 
     Returns:
-        Namespace s argumenty CLI
+        argparse.ArgumentParser s argumenty CLI
     """
+    # argparse je potreba jen pro prikazovou radku, ne pro GUI a knihovni pouziti
+    import argparse
+
     p = argparse.ArgumentParser(
         prog="python src/main.py",
         description=f"Generator matematickych prikladu | v{__version__}",
-        epilog="Pro GUI rozhrani pouzijte: python src/main.py --gui",
+        epilog="Pro GUI rozhrani pouzijte: python src/main.py --gui\n"
+               "Pro hromadne generovani podle manifestu: python src/main.py batch --help",
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
 
@@ -504,27 +2679,175 @@ def parse_args():
         action="store_true",
         help="Vyloucit cislo 1 z nasobeni a deleni (napr. zabrany priklady jako 5 × 1 nebo 6 ÷ 1)",
     )
+    p.add_argument(
+        "--engine",
+        type=str,
+        default="python",
+        choices=["python", "numpy"],
+        metavar="ENGINE",
+        help="Zpusob generovani: 'python' (po jednom prikladu) nebo 'numpy' (vektorove, vyzaduje NumPy). Vychozi: 'python'",
+    )
+    p.add_argument(
+        "--difficulty",
+        type=str,
+        default=None,
+        metavar="OBTIZNOST",
+        help="Obtiznost prikladu jako klic=hodnota oddelene carkami: carries=N (presne N prenosu u scitani "
+             "a vypujcek u odcitani), digits=N (operandy maji presne N cislic), table=T (trida nasobilky "
+             "u nasobeni a deleni: 1 = 0,1,2,5,10; 2 = 3,4; 3 = 6-9; 4 = nad 10). Napr. 'carries=1'",
+    )
+    p.add_argument(
+        "--terms",
+        type=int,
+        default=2,
+        metavar="CISLO",
+        help="Pocet cisel v prikladu. 3-5 = retezce jako 'a + b - c' nebo '(a + b) × c' s operacemi z --ops, "
+             "nezapornymi mezivysledky a delenim beze zbytku. Bez --max je nejvetsi mezivysledek odvozen "
+             "z --digits a omezen na 1000000 (s --max nad 1000000 skonci chybou). Vychozi: 2",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="CISLO",
+        help="Generovat list po dilech v CISLO procesech (pro velmi velke listy). Se stejnym --seed "
+             "a poctem procesu je vystup vzdy stejny. Nelze kombinovat s --unique ani --stream. Vychozi: 1",
+    )
+    p.add_argument(
+        "--rng-mode",
+        choices=RNG_MODES,
+        default="sequential",
+        help="Zdroj nahody: 'sequential' = vsechny priklady z jedne posloupnosti podle --seed (puvodni chovani), "
+             "'counter' = priklad k zavisi jen na seedu, parametrech prikladu a k (stejny pro libovolny "
+             "pocet procesu i verzi Pythonu). Vychozi: 'sequential'",
+    )
+    p.add_argument(
+        "--unique",
+        action="store_true",
+        help="Zadny priklad se na listu neopakuje. Pokud ruznych platnych prikladu neni dost, skonci chybou.",
+    )
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Zapisovat list po radcich s konstantni spotrebou pameti (pro velmi velke pocty prikladu)",
+    )
+    p.add_argument(
+        "--answers",
+        choices=ANSWER_MODES,
+        default=None,
+        help="Pridat reseni se stejnym rozlozenim: 'sheet' = list Reseni ve stejnem souboru, "
+             "'file' = samostatny soubor <out>_reseni.xlsx",
+    )
+    p.add_argument(
+        "--writer",
+        choices=WRITERS,
+        default="openpyxl",
+        help="Zapis XLSX: 'openpyxl' nebo 'fast' (primy zapis XML, radove rychlejsi, stejny vzhled). "
+             "Vychozi: 'openpyxl'",
+    )
+    p.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        metavar="ADRESAR",
+        help="Adresar cache hotovych souboru; seedovany list se stejnymi parametry se vezme z cache",
+    )
+    p.add_argument(
+        "--cache-size",
+        type=int,
+        default=512,
+        metavar="MB",
+        help="Nejvyssi velikost cache v MB, pri prekroceni se mazou nejdele nepouzite soubory. Vychozi: 512",
+    )
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="SOUBOR",
+        help="Zmerit faze generovani (cas, priklady/s, spicka pameti, nahradni vetve) a vypsat JSON report; "
+             "se SOUBOREM ulozit report do souboru",
+    )
+
+    return p
+
+
+def parse_args(argv=None):
+    """
+    Parsuje argumenty prikazove radky.
+
+    Args:
+        argv: Seznam argumentu (default: None = sys.argv[1:])
 
-    return p.parse_args()
+    Returns:
+        Namespace s argumenty CLI
+    """
+    return build_parser().parse_args(argv)
 
 
 def main():
     """Hlavni entry point pro CLI aplikaci."""
     args = parse_args()
-    file_path = generate_sheet(
-        ops=list(args.ops),
-        count=args.count,
-        file_name=args.out,
-        max_result=args.max,
-        max_digits=args.digits,
-        seed=args.seed,
-        title=args.title,
-        cols=args.cols,
-        fill_mode=args.fill,
-        no_zero=args.no_zero,
-        no_one=args.no_one,
-    )
+    if args.engine == "numpy" and not numpy_available():
+        print("Upozorneni: NumPy neni nainstalovano, pouzije se engine 'python'.", file=sys.stderr)
+    elif args.engine == "numpy" and not use_numpy_engine(list(args.ops), args.max, args.digits, args.no_zero, args.no_one):
+        print("Upozorneni: Limity presahuji rozsah int64, pouzije se engine 'python'.", file=sys.stderr)
+    if args.terms > 2 and args.max is None and args.digits is not None:
+        from chain import MAX_VALUE, implied_max_result
+
+        symbols = [SAMPLER_MAP[o].symbol for o in args.ops if o in SAMPLER_MAP]
+        implied = implied_max_result(symbols, args.terms, 10 ** args.digits - 1)
+        if implied > MAX_VALUE:
+            print(
+                f"Upozorneni: Nejvetsi mezivysledek retezce je omezen na {MAX_VALUE} (z --digits by byl {implied}), "
+                "mensi mez lze zadat pomoci --max.",
+                file=sys.stderr,
+            )
+    try:
+        cache = None
+        if args.cache:
+            from cache import SheetCache
+
+            cache = SheetCache(args.cache, args.cache_size * 1024 * 1024)
+        file_path = generate_sheet(
+            ops=list(args.ops),
+            count=args.count,
+            file_name=args.out,
+            max_result=args.max,
+            max_digits=args.digits,
+            seed=args.seed,
+            title=args.title,
+            cols=args.cols,
+            fill_mode=args.fill,
+            no_zero=args.no_zero,
+            no_one=args.no_one,
+            engine=args.engine,
+            stream=args.stream,
+            unique=args.unique,
+            profile=args.profile is not None,
+            answers=args.answers,
+            writer=args.writer,
+            cache=cache,
+            difficulty=args.difficulty,
+            terms=args.terms,
+            workers=args.workers,
+            rng_mode=args.rng_mode,
+        )
+    except ValueError as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        sys.exit(2)
+    if args.profile is not None:
+        import json
+
+        file_path, report = file_path
+        if args.profile == "-":
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            with open(args.profile, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
     print(f"Hotovo: {file_path}")
+    if args.answers == "file":
+        print(f"Reseni: {answer_file_name(file_path)}")
 
 
 if __name__ == "__main__":
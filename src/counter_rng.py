@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Citacovy generator nahody: priklad k je funkce (seed, parametry, k).
+
+Bezny seedovany list (rng_mode="sequential") bere vsechny priklady z jedne
+posloupnosti Mersenne Twisteru, takze k-ty priklad lze ziskat jen
+prehranim vsech predchozich tahu. V rezimu rng_mode="counter" ma kazdy
+priklad vlastni zdroj nahody: tahy prikladu k jsou slova z
+
+    BLAKE2b(klic, k || blok)
+
+kde klic je BLAKE2b normalizovanych parametru prikladu a seedu (viz
+counter_key) a blok je citac 64bajtovych bloku v ramci prikladu (prvni
+blok = 8 slov po 64 bitech obvykle staci na cely priklad). Priklad k tak
+lze vygenerovat samostatne (strankovani velkeho listu, jeden priklad
+znovu), dily listu lze generovat v libovolnem poctu procesu bez
+koordinace a vystup nezavisi na vnitrnostech random.randint v ruznych
+verzich Pythonu - randrange, randint a choice jsou zde implementovane
+primo nad bity (zamitani mimo rozsah jako v random.Random).
+"""
+import hashlib
+import json
+import struct
+
+# Slova jednoho bloku a adresa bloku (index prikladu, poradi bloku)
+_WORDS = struct.Struct("<8Q")
+_COUNTER = struct.Struct("<QQ")
+
+
+def counter_key(seed, config):
+    """
+    Vrati klic posloupnosti prikladu.
+
+    Args:
+        seed: Seed listu (cele cislo)
+        config: Normalizovane parametry prikladu (slovnik serializovatelny do
+            JSON, viz cli.problem_config)
+
+    Returns:
+        32 bajtu klice pro CounterStream
+    """
+    data = json.dumps({"seed": seed, "config": config}, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=32, person=b"priklady").digest()
+
+
+class ProblemRandom:
+    """
+    Zdroj nahody jednoho prikladu s rozhranim random.Random (randrange, randint, choice).
+
+    Args:
+        hasher: Klicovany hashlib.blake2b (digest_size=64); pro kazdy blok se kopiruje
+        index: Index prikladu
+    """
+
+    __slots__ = ("_hasher", "_index", "_block", "_words", "_pos")
+
+    def __init__(self, hasher, index):
+        self._hasher = hasher
+        self._index = index
+        self._block = 0
+        self._words = ()
+        self._pos = 8
+
+    def _word(self):
+        """Vrati dalsi 64bitove slovo (novy blok se spocita az pri potrebe)."""
+        if self._pos == 8:
+            h = self._hasher.copy()
+            h.update(_COUNTER.pack(self._index, self._block))
+            self._block += 1
+            self._words = _WORDS.unpack(h.digest())
+            self._pos = 0
+        word = self._words[self._pos]
+        self._pos += 1
+        return word
+
+    def getrandbits(self, k):
+        """Vrati nahodne cele cislo s k bity."""
+        if k <= 64:
+            return self._word() >> (64 - k)
+        value = 0
+        while k > 0:
+            take = min(k, 64)
+            value = (value << take) | (self._word() >> (64 - take))
+            k -= take
+        return value
+
+    def randrange(self, start, stop=None):
+        """Vrati rovnomerne cislo z range(start, stop) (s jednim argumentem z range(start))."""
+        if stop is None:
+            start, stop = 0, start
+        n = stop - start
+        if n <= 0:
+            raise ValueError(f"Prazdny rozsah pro randrange ({start}, {stop})")
+        k = (n - 1).bit_length()
+        if k == 0:
+            return start
+        r = self.getrandbits(k)
+        while r >= n:
+            r = self.getrandbits(k)
+        return start + r
+
+    def randint(self, a, b):
+        """Vrati rovnomerne cislo z intervalu a .. b vcetne."""
+        return self.randrange(a, b + 1)
+
+    def choice(self, seq):
+        """Vrati rovnomerne vybrany prvek neprazdne posloupnosti."""
+        if not seq:
+            raise IndexError("Nelze vybrat z prazdne posloupnosti")
+        return seq[self.randrange(len(seq))]
+
+
+class CounterStream:
+    """
+    Kurzor nad posloupnosti prikladu jednoho klice.
+
+    Na rozdil od random.Random nenese zadny stav krome indexu dalsiho
+    prikladu, takze kopie (copy.deepcopy ve streamovanem zapisu) i prenos
+    do jineho procesu jsou levne.
+
+    Args:
+        key: Klic posloupnosti (viz counter_key)
+        index: Index dalsiho prikladu (default: 0)
+    """
+
+    __slots__ = ("key", "index", "_hasher")
+
+    def __init__(self, key, index=0):
+        self.key = key
+        self.index = index
+        self._hasher = hashlib.blake2b(key=key, digest_size=64)
+
+    def __reduce__(self):
+        # Objekt hashlib nejde kopirovat ani picklovat, znovu se odvodi z klice
+        return CounterStream, (self.key, self.index)
+
+    def at(self, index):
+        """Vrati novy kurzor stejne posloupnosti na indexu index."""
+        return CounterStream(self.key, index)
+
+    def sample_many(self, plan, n):
+        """
+        Vygeneruje n dalsich prikladu a posune kurzor.
+
+        Args:
+            plan: cli.GenerationPlan
+            n: Pocet prikladu
+
+        Returns:
+            List tuplu jako GenerationPlan.sample
+        """
+        sample = plan.sample
+        hasher = self._hasher
+        start = self.index
+        self.index += n
+        return [sample(ProblemRandom(hasher, k)) for k in range(start, start + n)]
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Obtiznost prikladu: prenosy a vypujcky, velikost operandu a tridy nasobilky.
+
+Obtiznost se zadava textem "klic=hodnota" oddelenym carkami (--difficulty):
+
+    carries=N   presne N prenosu u scitani a N vypujcek u odcitani
+                (alias borrows=N)
+    digits=N    oba operandy maji presne N cislic (u deleni delenec a delitel)
+    table=T     trida nasobilky u nasobeni a deleni podle tezsiho cinitele:
+                1 = 0, 1, 2, 5, 10; 2 = 3, 4; 3 = 6 az 9; 4 = vetsi nez 10
+
+Kazda slozka se uplatni jen u operaci, pro ktere ma smysl (carries pro
++ a -, table pro × a /). Generatory obtiznosti nevybiraji nahodny priklad
+a pak ho nezamitaji - vsechny platne priklady s pozadovanou obtiznosti se
+spocitaji predem a tah je jedno rng.randrange(size) a sestaveni prikladu
+s danym poradim (problem(index)):
+
+- scitani a odcitani: cislicove dynamicke programovani po radech od
+  jednotek. Stav je prenos, zbyvajici pocet prenosu a priznaky porovnani
+  dosud vytvorenych nizsich radu s mezemi operandu a souctu; pro kazdy rad
+  a stav jsou predpocitane kumulativni pocty dokonceni. Sestaveni prikladu
+  je jedno binarni vyhledani na kazdy rad. Odcitani a - b = r se generuje
+  jako scitani b + r = a (vypujcky odcitani jsou prenosy tohoto scitani).
+- nasobeni a deleni: bloky prvnich cinitelu se stejnou mnozinou
+  povolenych druhych cinitelu s kumulativnimi pocty jako u DivSampler
+  v cli.py; deleni b * c = a je nasobeni delitele a vysledku.
+
+Vsechny priklady s danou obtiznosti jsou stejne pravdepodobne a splnuji
+stejne meze jako bezne generatory (max_result, max_digits, no_zero, no_one).
+"""
+from array import array
+from bisect import bisect_right
+
+from cli import AddSampler, DivSampler, MulSampler, SubSampler
+
+# Cinitele trid nasobilky 1-3 (trida 4 = cinitele vetsi nez 10)
+TABLE_FACTORS = {1: (0, 1, 2, 5, 10), 2: (3, 4), 3: (6, 7, 8, 9)}
+TABLE_TIERS = (1, 2, 3, 4)
+
+# Nejvyssi podporovany pocet cislic operandu v digits=N (--digits sam
+# horni mez nema, vetsi operandy zvladaji jen bezne generatory)
+MAX_DIGITS = 18
+
+
+def table_tier(factor):
+    """Vrati tridu nasobilky cinitele (1-4, viz TABLE_FACTORS)."""
+    for tier, factors in TABLE_FACTORS.items():
+        if factor in factors:
+            return tier
+    return 4
+
+
+class Difficulty:
+    """
+    Pozadovana obtiznost prikladu (None = slozka se neomezuje).
+
+    Args:
+        carries: Presny pocet prenosu (+) a vypujcek (-)
+        digits: Presny pocet cislic operandu
+        table: Trida nasobilky (1-4) pro nasobeni a deleni
+    """
+
+    __slots__ = ("carries", "digits", "table")
+
+    def __init__(self, carries=None, digits=None, table=None):
+        if carries is not None and carries < 0:
+            raise ValueError("Pocet prenosu (carries) nesmi byt zaporny.")
+        if digits is not None and not 1 <= digits <= MAX_DIGITS:
+            raise ValueError(f"Pocet cislic (digits) musi byt 1-{MAX_DIGITS}.")
+        if table is not None and table not in TABLE_TIERS:
+            raise ValueError("Trida nasobilky (table) musi byt 1-4.")
+        self.carries = carries
+        self.digits = digits
+        self.table = table
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Prevede text obtiznosti na Difficulty.
+
+        Args:
+            text: Napr. "carries=1", "digits=2,table=3"; prazdny text = bez obtiznosti
+
+        Returns:
+            Difficulty nebo None
+
+        Raises:
+            ValueError: Pri neznamem klici nebo neplatne hodnote
+        """
+        values = {}
+        for part in text.replace(";", ",").split(","):
+            if not part.strip():
+                continue
+            key, sep, value = part.partition("=")
+            key = key.strip().lower()
+            key = "carries" if key == "borrows" else key
+            if not sep or key not in cls.__slots__:
+                raise ValueError(f"Neplatna obtiznost: '{part.strip()}' (mozne: carries=N, digits=N, table=1-4)")
+            try:
+                values[key] = int(value)
+            except ValueError:
+                raise ValueError(f"Neplatna hodnota obtiznosti: '{part.strip()}'") from None
+        return cls(**values) if values else None
+
+    def __str__(self):
+        """Vrati normalizovany text obtiznosti (vstup pro parse)."""
+        return ",".join(f"{key}={getattr(self, key)}" for key in self.__slots__ if getattr(self, key) is not None)
+
+    def applies_to(self, symbol):
+        """Vrati True, pokud obtiznost omezuje operaci se symbolem symbol."""
+        if self.digits is not None:
+            return True
+        if symbol in "+-":
+            return self.carries is not None
+        return self.table is not None
+
+
+def parse_difficulty(value):
+    """Vrati Difficulty z textu, existujici Difficulty nebo None."""
+    if value is None or isinstance(value, Difficulty):
+        return value
+    return Difficulty.parse(value)
+
+
+def _digit_range(digits, low, high):
+    """Zuzi interval [low, high] na cisla s presne digits cislicemi (None = beze zmeny)."""
+    if digits is None:
+        return low, high
+    return max(low, 10 ** (digits - 1) if digits > 1 else 0), min(high, 10 ** digits - 1)
+
+
+class DigitPairs:
+    """
+    Index vsech dvojic (x, y) s danymi mezemi a presnym poctem prenosu v x + y.
+
+    Meze jsou x_low <= x <= x_high, y_low <= y <= y_high a
+    s_low <= x + y <= s_high. Radky se zpracovavaji od jednotek; stav po
+    radu i je (prenos, zbyvajici prenosy, priznaky porovnani). Priznaky
+    rikaji, zda dosavadni nizsi rady cisla jsou <= (resp. >=) odpovidajicim
+    nizsim radum meze - vyssi rad porovnani prepise, shodny ho zachova.
+
+    Args:
+        x_low, x_high, y_low, y_high, s_low, s_high: Meze (nezaporne)
+        carries: Presny pocet prenosu, None = libovolny
+    """
+
+    __slots__ = ("positions", "size", "_tables", "_start")
+
+    def __init__(self, x_low, x_high, y_low, y_high, s_low, s_high, carries=None):
+        y_high = min(y_high, s_high)
+        x_high = min(x_high, s_high)
+        bounds = (x_high, x_low, y_high, y_low, s_high, s_low)
+        positions = len(str(max(bounds)))
+        digits = [[b // 10 ** i % 10 for b in bounds] for i in range(positions)]
+        self.positions = positions
+        self._tables = {}
+        counts = [dict() for _ in range(positions + 1)]
+        # Vsechny priznaky (6 bitu) na zacatku plati - prazdne nizsi rady se rovnaji
+        start = (0, carries, 0b111111)
+        self._start = start
+
+        def count(i, state):
+            memo = counts[i]
+            if state in memo:
+                return memo[state]
+            carry, left, flags = state
+            if i == positions:
+                total = int(carry == 0 and flags == 0b111111 and left in (0, None))
+                memo[state] = total
+                return total
+            xh, xl, yh, yl, sh, sl = digits[i]
+            # Pocty dvojic mohou presahnout 64 bitu (operandy nad 9 cislic), proto list
+            cums = []
+            moves = []
+            total = 0
+            for x in range(10):
+                fx = (
+                    (1 if x < xh or (x == xh and flags & 1) else 0)
+                    | (2 if x > xl or (x == xl and flags & 2) else 0)
+                )
+                for y in range(10):
+                    t = x + y + carry
+                    out = t // 10
+                    rest = left
+                    if rest is not None:
+                        rest -= out
+                        if rest < 0 or rest > positions - i - 1:
+                            continue
+                    s = t % 10
+                    nflags = (
+                        fx
+                        | (4 if y < yh or (y == yh and flags & 4) else 0)
+                        | (8 if y > yl or (y == yl and flags & 8) else 0)
+                        | (16 if s < sh or (s == sh and flags & 16) else 0)
+                        | (32 if s > sl or (s == sl and flags & 32) else 0)
+                    )
+                    nstate = (out, rest, nflags)
+                    n = count(i + 1, nstate)
+                    if n:
+                        total += n
+                        cums.append(total)
+                        moves.append((x, y, nstate))
+            memo[state] = total
+            if total:
+                self._tables[(i, state)] = (cums, moves)
+            return total
+
+        self.size = count(0, start)
+
+    def pair(self, index):
+        """
+        Vrati dvojici (x, y) s danym poradim.
+
+        Args:
+            index: Poradi v rozsahu 0 .. size - 1
+
+        Returns:
+            Tuple (x, y)
+        """
+        tables = self._tables
+        state = self._start
+        x = y = 0
+        scale = 1
+        for i in range(self.positions):
+            cums, moves = tables[(i, state)]
+            j = bisect_right(cums, index)
+            if j:
+                index -= cums[j - 1]
+            dx, dy, state = moves[j]
+            x += dx * scale
+            y += dy * scale
+            scale *= 10
+        return x, y
+
+
+class ProductPairs:
+    """
+    Index vsech dvojic (a, b) s danymi mezemi, product_low <= a * b <= product_high
+    a pripadne danou tridou nasobilky.
+
+    Pro kazde a je mnozina povolenych b malou n-tici cinitelu do 10
+    a/nebo intervalem. Po sobe jdouci a se stejnou mnozinou b tvori blok
+    (nad 10 jsou to a se stejnym product_high // a a product_low / a
+    zaokrouhlenym nahoru, bloku je tedy jen O(sqrt(product_high))); bloky
+    se ukladaji s kumulativnimi pocty stejne jako v cli.DivSampler.
+
+    Args:
+        a_low, a_high, b_low, b_high: Meze cinitelu
+        product_high: Nejvyssi povoleny soucin
+        table: Trida nasobilky (1-4) podle tezsiho cinitele, None = libovolna
+        product_low: Nejmensi povoleny soucin (default: 0)
+        zero_high: Nejvetsi b pro a = 0 (default: None = b_high; 0 = jen 0 × 0
+            jako v cli.MulSampler)
+    """
+
+    __slots__ = ("size", "_firsts", "_widths", "_smalls", "_lows", "_starts", "_ends")
+
+    def __init__(self, a_low, a_high, b_low, b_high, product_high, table=None, product_low=0, zero_high=None):
+        self._firsts = array("q")
+        self._widths = array("q")
+        self._smalls = []
+        self._lows = array("q")
+        # Kumulativni pocty mohou presahnout 64 bitu, proto listy
+        self._starts = []
+        self._ends = []
+        total = 0
+        a = a_low
+        while a <= a_high:
+            if a == 0:
+                top = b_high if zero_high is None else min(b_high, zero_high)
+                bottom, last = b_low if product_low <= 0 else top + 1, 0
+            else:
+                q = product_high // a
+                if q < b_low:
+                    break  # pro vetsi a je horni mez b jen mensi
+                top = min(b_high, q)
+                # Nejvetsi a se stejnymi mezemi b; cinitele do 10 maji vlastni radky
+                if q >= b_high:
+                    last = product_high // b_high if b_high else a_high
+                else:
+                    last = product_high // q if q else a_high
+                v = -(-product_low // a)
+                bottom = max(b_low, v)
+                if v > b_low and v > 1:
+                    last = min(last, (product_low - 1) // (v - 1))
+                last = min(a_high, last) if a > 10 else a
+            smalls, low, high = (), bottom, top
+            if table is not None:
+                tier = table_tier(a)
+                if tier > table:
+                    if table < 4 and a > 10:
+                        break  # vsechna dalsi a jsou mimo malou nasobilku
+                    a = last + 1
+                    continue
+                if table == 4:
+                    # Tezsi cinitel je a (libovolne b), nebo b > 10
+                    if tier < 4:
+                        low = max(low, 11)
+                else:
+                    allowed = TABLE_FACTORS[table] if tier < table else sum(
+                        (TABLE_FACTORS[t] for t in range(1, table + 1)), ()
+                    )
+                    smalls = tuple(sorted(b for b in allowed if bottom <= b <= top))
+                    low, high = 1, 0
+            width = len(smalls) + max(0, high - low + 1)
+            if width:
+                self._firsts.append(a)
+                self._widths.append(width)
+                self._smalls.append(smalls)
+                self._lows.append(low)
+                self._starts.append(total)
+                total += (last - a + 1) * width
+                self._ends.append(total)
+            a = last + 1
+        self.size = total
+
+    def pair(self, index):
+        """Vrati dvojici (a, b) s danym poradim (0 .. size - 1)."""
+        block = bisect_right(self._ends, index)
+        a, k = divmod(index - self._starts[block], self._widths[block])
+        smalls = self._smalls[block]
+        if k < len(smalls):
+            return self._firsts[block] + a, smalls[k]
+        return self._firsts[block] + a, self._lows[block] + k - len(smalls)
+
+
+class _RankedSampler:
+    """
+    Spolecny zaklad generatoru obtiznosti: tah je rng.randrange(size)
+    a sestaveni prikladu s danym poradim (viz problem).
+    """
+
+    FALLBACKS = ()
+
+    __slots__ = ("pairs", "size")
+
+    NAME = ""
+
+    def _init_pairs(self, pairs, level):
+        if not pairs.size:
+            raise ValueError(f"Pro {self.NAME} s obtiznosti {level} neexistuje zadny platny priklad.")
+        self.pairs = pairs
+        self.size = pairs.size
+
+    def sample(self, rng):
+        """
+        Vygeneruje jeden priklad.
+
+        Args:
+            rng: Zdroj nahody s metodou randrange (napr. modul random)
+
+        Returns:
+            Tuple (a, op, b, vysledek)
+        """
+        return self.problem(rng.randrange(self.size))
+
+    def sample_many(self, n, rng):
+        """Vygeneruje seznam n prikladu (viz sample)."""
+        problem = self.problem
+        size = self.size
+        randrange = rng.randrange
+        return [problem(randrange(size)) for _ in range(n)]
+
+    def space_size(self, cap=None):
+        """Vrati pocet ruznych prikladu (viz GenerationPlan.space_size)."""
+        return self.size
+
+
+class AddDifficultySampler(_RankedSampler):
+    """Scitani s obtiznosti; meze stejne jako AddSampler (viz Difficulty)."""
+
+    symbol = "+"
+    NAME = "scitani"
+    __slots__ = ()
+
+    def __init__(self, level, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        base = AddSampler(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+        low, high = _digit_range(level.digits, base.min_val, base.max_number)
+        self._init_pairs(DigitPairs(low, high, low, high, 0, base.max_result, level.carries), level)
+
+    def problem(self, index):
+        """Vrati priklad s danym poradim (0 .. size - 1)."""
+        a, b = self.pairs.pair(index)
+        return a, "+", b, a + b
+
+
+class SubDifficultySampler(_RankedSampler):
+    """Odcitani s obtiznosti; a - b = r se sklada jako scitani b + r = a."""
+
+    symbol = "-"
+    NAME = "odcitani"
+    __slots__ = ()
+
+    def __init__(self, level, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        base = SubSampler(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+        b_low, b_high = _digit_range(level.digits, base.min_val, base.max_number)
+        a_low, a_high = _digit_range(level.digits, base.min_a, base.max_a)
+        self._init_pairs(
+            DigitPairs(b_low, b_high, base.b_offset, a_high, a_low, a_high, level.carries), level,
+        )
+
+    def problem(self, index):
+        """Vrati priklad s danym poradim (0 .. size - 1)."""
+        b, r = self.pairs.pair(index)
+        return b + r, "-", b, r
+
+
+class MulDifficultySampler(_RankedSampler):
+    """Nasobeni s obtiznosti; meze stejne jako MulSampler, rovnomerne pres dvojice."""
+
+    symbol = "×"
+    NAME = "nasobeni"
+    __slots__ = ()
+
+    def __init__(self, level, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        base = MulSampler(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+        # Cinitel a je jako v MulSampler omezen i vysledkem (a * 0 by jinak prosel)
+        a_low, a_high = _digit_range(level.digits, base.min_val, min(base.max_number, base.max_result))
+        low, high = _digit_range(level.digits, base.min_val, base.max_number)
+        # Pro a = 0 je jako v MulSampler jediny priklad 0 × 0
+        self._init_pairs(ProductPairs(a_low, a_high, low, high, base.max_result, level.table, zero_high=0), level)
+
+    def problem(self, index):
+        """Vrati priklad s danym poradim (0 .. size - 1)."""
+        a, b = self.pairs.pair(index)
+        return a, "×", b, a * b
+
+
+class DivDifficultySampler(_RankedSampler):
+    """Deleni s obtiznosti; dvojice (delitel, vysledek) jako u nasobeni, delenec je jejich soucin."""
+
+    symbol = "/"
+    NAME = "deleni"
+    __slots__ = ()
+
+    def __init__(self, level, max_result=None, max_digits=None, no_zero=False, no_one=False):
+        # Jen meze - index DivSampler se tu nepouziva
+        _, _, min_b, max_b, min_val, max_c, max_a = DivSampler.limits(max_result, max_digits, no_zero, no_one)
+        b_low, b_high = _digit_range(level.digits, min_b, max_b)
+        a_low, a_high = _digit_range(level.digits, 0, max_a)
+        self._init_pairs(
+            ProductPairs(b_low, b_high, min_val, max_c, a_high, level.table, product_low=a_low), level,
+        )
+
+    def problem(self, index):
+        """Vrati priklad s danym poradim (0 .. size - 1)."""
+        b, c = self.pairs.pair(index)
+        return b * c, "/", b, c
+
+
+# Generatory obtiznosti podle symbolu operace
+DIFFICULTY_SAMPLERS = {
+    "+": AddDifficultySampler,
+    "-": SubDifficultySampler,
+    "×": MulDifficultySampler,
+    "/": DivDifficultySampler,
+}
@@ -6,8 +6,48 @@ Poskytuje graficke rozhrani pro vsechny funkce generatoru.
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
+import queue
 import subprocess
-from cli import generate_sheet, __version__
+import threading
+import time
+from cli import GenerationCancelled, generate_sheet, preview_lines, warm_up, __version__
+from chain import MAX_TERMS
+from difficulty import Difficulty
+
+# Interval kontroly fronty zprav z pracovniho vlakna (ms)
+POLL_INTERVAL_MS = 100
+
+# Nahled: pocet zobrazenych radku listu, sirka v znacich a zpozdeni po posledni zmene (ms)
+PREVIEW_ROWS = 30
+PREVIEW_WIDTH = 60
+PREVIEW_DELAY_MS = 150
+
+# Interval kontroly vysledku nahledu z vlakna nahledu (ms)
+PREVIEW_POLL_MS = 20
+
+# Text nahledu pri rozepsane nebo neplatne hodnote
+PREVIEW_INVALID = "(neplatné nastavení)"
+
+# Nejmensi velikost okna a okraj, ktery okno nechava volny na obrazovce (px)
+MIN_WINDOW_SIZE = (700, 450)
+SCREEN_MARGIN = 80
+
+# Volby obtiznosti: popisek v nabidce -> hodnota slozky Difficulty (None = libovolne)
+CARRY_CHOICES = {"libovolně": None, "0": 0, "1": 1, "2": 2, "3": 3, "4": 4, "5": 5}
+TABLE_CHOICES = {
+    "libovolná": None,
+    "1 – ×0, 1, 2, 5, 10": 1,
+    "2 – ×3, 4": 2,
+    "3 – ×6 až 9": 3,
+    "4 – nad 10": 4,
+}
+
+# Popisky etap generovani (viz cli.ProgressReporter)
+STAGE_LABELS = {
+    "sampling": "Generování příkladů",
+    "writing": "Zápis listu",
+    "saving": "Ukládání souboru",
+}
 
 
 class MathGeneratorGUI:
@@ -22,11 +62,7 @@ class MathGeneratorGUI:
         """
         self.root = root
         self.root.title(f"Generátor matematických příkladů | v{__version__}")
-        self.root.geometry("600x690")
-        self.root.resizable(False, False)
-
-        # Vycentrovani okna na obrazovce
-        self._center_window()
+        self.root.minsize(*MIN_WINDOW_SIZE)
 
         # Vytvoreni hlavniho framu s paddingem
         main_frame = ttk.Frame(root, padding="20")
@@ -40,14 +76,29 @@ class MathGeneratorGUI:
         )
         title_label.grid(row=0, column=0, columnspan=2, pady=(0, 20))
 
+        # Nastaveni se posouva ve vlastnim ramci - tlacitka pod nim zustanou
+        # videt i na nizkych obrazovkach (768 nebo 800 px)
+        options_canvas = tk.Canvas(main_frame, highlightthickness=0)
+        options_canvas.grid(row=1, column=0, sticky=(tk.N, tk.S, tk.W, tk.E))
+        options_scroll = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=options_canvas.yview)
+        options_scroll.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        options_canvas.configure(yscrollcommand=options_scroll.set)
+        options_frame = ttk.Frame(options_canvas)
+        options_canvas.create_window((0, 0), window=options_frame, anchor=tk.NW)
+        self._options_canvas = options_canvas
+        self._options_frame = options_frame
+        options_frame.bind("<Configure>", self._resize_options)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            root.bind_all(sequence, self._on_wheel, add="+")
+
         # Sekce operaci
-        row = 1
-        ttk.Label(main_frame, text="Operace:", font=("Arial", 10, "bold")).grid(
+        row = 0
+        ttk.Label(options_frame, text="Operace:", font=("Arial", 10, "bold")).grid(
             row=row, column=0, sticky=tk.W, pady=(0, 10)
         )
         row += 1
 
-        ops_frame = ttk.Frame(main_frame)
+        ops_frame = ttk.Frame(options_frame)
         ops_frame.grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(0, 15))
 
         # Checkboxy pro vyber operaci
@@ -72,16 +123,16 @@ class MathGeneratorGUI:
         row += 2
 
         # Maximalni pocet cislic
-        ttk.Label(main_frame, text="Maximální počet číslic:").grid(
+        ttk.Label(options_frame, text="Maximální počet číslic:").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 10)
         )
         self.max_digits = tk.IntVar(value=2)
         digits_spinbox = ttk.Spinbox(
-            main_frame, from_=1, to=5, textvariable=self.max_digits, width=20
+            options_frame, from_=1, to=5, textvariable=self.max_digits, width=20
         )
         digits_spinbox.grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
         ttk.Label(
-            main_frame,
+            options_frame,
             text="(např. 2 = čísla 0-99, 3 = čísla 0-999)",
             font=("Arial", 8),
             foreground="gray"
@@ -89,26 +140,43 @@ class MathGeneratorGUI:
         row += 2
 
         # Maximalni vysledek
-        ttk.Label(main_frame, text="Maximální výsledek:").grid(
+        ttk.Label(options_frame, text="Maximální výsledek:").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 10)
         )
         self.max_result = tk.IntVar(value=0)  # 0 = neomezeno
         max_result_spinbox = ttk.Spinbox(
-            main_frame, from_=0, to=10000, textvariable=self.max_result, width=20
+            options_frame, from_=0, to=10000, textvariable=self.max_result, width=20
         )
         max_result_spinbox.grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
         ttk.Label(
-            main_frame,
+            options_frame,
             text="(0 = neomezeno, jinak max hodnota výsledku)",
             font=("Arial", 8),
             foreground="gray"
         ).grid(row=row+1, column=1, sticky=tk.W, pady=(0, 10))
         row += 2
 
+        # Pocet cisel v prikladu (3 a vice = retezce)
+        ttk.Label(options_frame, text="Počet čísel v příkladu:").grid(
+            row=row, column=0, sticky=tk.W, pady=(0, 10)
+        )
+        self.terms = tk.IntVar(value=2)
+        terms_spinbox = ttk.Spinbox(
+            options_frame, from_=2, to=MAX_TERMS, textvariable=self.terms, width=20
+        )
+        terms_spinbox.grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
+        ttk.Label(
+            options_frame,
+            text="(2 = a + b, 3 a více = řetězce jako a + b - c nebo (a + b) × c)",
+            font=("Arial", 8),
+            foreground="gray"
+        ).grid(row=row+1, column=1, sticky=tk.W, pady=(0, 10))
+        row += 2
+
         # Checkbox pro vylouceni nuly
         self.no_zero = tk.BooleanVar(value=False)
         ttk.Checkbutton(
-            main_frame,
+            options_frame,
             text="Bez nuly (vyloučit číslo 0 z příkladů)",
             variable=self.no_zero
         ).grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
@@ -117,40 +185,85 @@ class MathGeneratorGUI:
         # Checkbox pro vylouceni jednicky
         self.no_one = tk.BooleanVar(value=False)
         ttk.Checkbutton(
-            main_frame,
+            options_frame,
             text="Bez jedničky (vyloučit 1 z násobení a dělení)",
             variable=self.no_one
+        ).grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
+        row += 1
+
+        # Obtiznost: presny pocet prenosu/vypujcek, trida nasobilky, plny pocet cislic
+        ttk.Label(options_frame, text="Přenosy / výpůjčky:").grid(
+            row=row, column=0, sticky=tk.W, pady=(0, 10)
+        )
+        self.carries = tk.StringVar(value="libovolně")
+        ttk.Combobox(
+            options_frame, textvariable=self.carries, values=list(CARRY_CHOICES), state="readonly", width=18
+        ).grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
+        row += 1
+
+        ttk.Label(options_frame, text="Násobilka (× a /):").grid(
+            row=row, column=0, sticky=tk.W, pady=(0, 10)
+        )
+        self.table = tk.StringVar(value="libovolná")
+        ttk.Combobox(
+            options_frame, textvariable=self.table, values=list(TABLE_CHOICES), state="readonly", width=18
+        ).grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
+        row += 1
+
+        self.full_digits = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options_frame,
+            text="Plný počet číslic (všechna čísla v zadání mají přesně max. počet číslic)",
+            variable=self.full_digits
+        ).grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
+        row += 1
+
+        # Checkbox pro priklady bez opakovani
+        self.unique = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options_frame,
+            text="Bez opakování (každý příklad na listu nejvýše jednou)",
+            variable=self.unique
+        ).grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
+        row += 1
+
+        # Checkbox pro list s resenim
+        self.answers = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            options_frame,
+            text="Přidat list s řešením (stejné rozložení, doplněné výsledky)",
+            variable=self.answers
         ).grid(row=row, column=0, columnspan=2, sticky=tk.W, pady=(0, 15))
         row += 1
 
         # Pocet prikladu
-        ttk.Label(main_frame, text="Počet příkladů:").grid(
+        ttk.Label(options_frame, text="Počet příkladů:").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 10)
         )
         self.count = tk.IntVar(value=90)
         count_spinbox = ttk.Spinbox(
-            main_frame, from_=1, to=500, textvariable=self.count, width=20
+            options_frame, from_=1, to=500, textvariable=self.count, width=20
         )
         count_spinbox.grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
         row += 1
 
         # Pocet sloupcu
-        ttk.Label(main_frame, text="Počet sloupců:").grid(
+        ttk.Label(options_frame, text="Počet sloupců:").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 10)
         )
         self.cols = tk.IntVar(value=3)
         cols_spinbox = ttk.Spinbox(
-            main_frame, from_=1, to=10, textvariable=self.cols, width=20
+            options_frame, from_=1, to=10, textvariable=self.cols, width=20
         )
         cols_spinbox.grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
         row += 1
 
         # Zpusob vyplnovani
-        ttk.Label(main_frame, text="Způsob vyplňování:").grid(
+        ttk.Label(options_frame, text="Způsob vyplňování:").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 10)
         )
         self.fill_mode = tk.StringVar(value="down")
-        fill_frame = ttk.Frame(main_frame)
+        fill_frame = ttk.Frame(options_frame)
         fill_frame.grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
         ttk.Radiobutton(
             fill_frame, text="Po sloupcích", variable=self.fill_mode, value="down"
@@ -161,23 +274,23 @@ class MathGeneratorGUI:
         row += 1
 
         # Titulek
-        ttk.Label(main_frame, text="Titulek:").grid(
+        ttk.Label(options_frame, text="Titulek:").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 10)
         )
         self.title_text = tk.StringVar(value="Matematické příklady")
-        title_entry = ttk.Entry(main_frame, textvariable=self.title_text, width=35)
+        title_entry = ttk.Entry(options_frame, textvariable=self.title_text, width=35)
         title_entry.grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
         row += 1
 
         # Seed (volitelny)
-        ttk.Label(main_frame, text="Seed (volitelné):").grid(
+        ttk.Label(options_frame, text="Seed (volitelné):").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 10)
         )
         self.seed = tk.StringVar(value="")
-        seed_entry = ttk.Entry(main_frame, textvariable=self.seed, width=35)
+        seed_entry = ttk.Entry(options_frame, textvariable=self.seed, width=35)
         seed_entry.grid(row=row, column=1, sticky=tk.W, pady=(0, 10))
         ttk.Label(
-            main_frame,
+            options_frame,
             text="(ponechte prázdné pro náhodné generovaní)",
             font=("Arial", 8),
             foreground="gray"
@@ -185,10 +298,10 @@ class MathGeneratorGUI:
         row += 2
 
         # Vystupni soubor
-        ttk.Label(main_frame, text="Výstupní soubor:").grid(
+        ttk.Label(options_frame, text="Výstupní soubor:").grid(
             row=row, column=0, sticky=tk.W, pady=(0, 15)
         )
-        file_frame = ttk.Frame(main_frame)
+        file_frame = ttk.Frame(options_frame)
         file_frame.grid(row=row, column=1, sticky=(tk.W, tk.E), pady=(0, 15))
 
         self.output_file = tk.StringVar(value="priklady.xlsx")
@@ -201,36 +314,232 @@ class MathGeneratorGUI:
         browse_button.grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
         row += 1
 
-        # Tlacitko Generovat
-        generate_button = ttk.Button(
-            main_frame,
+        # Tlacitka Generovat a Zrusit
+        row = 2
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.grid(row=row, column=0, columnspan=2, pady=(15, 0))
+        self.generate_button = ttk.Button(
+            buttons_frame,
             text="Generovat příklady",
             command=self.generate,
             width=30
         )
-        generate_button.grid(row=row, column=0, columnspan=2, pady=(15, 0))
+        self.generate_button.grid(row=0, column=0, padx=(0, 10))
+        self.cancel_button = ttk.Button(
+            buttons_frame,
+            text="Zrušit",
+            command=self.cancel,
+            width=12,
+            state=tk.DISABLED
+        )
+        self.cancel_button.grid(row=0, column=1)
+        row += 1
+
+        # Prubeh generovani
+        self.progress = ttk.Progressbar(main_frame, mode="determinate", maximum=1.0)
+        self.progress.grid(row=row, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(15, 5))
+        row += 1
+        self.status_text = tk.StringVar(value="")
+        ttk.Label(
+            main_frame,
+            textvariable=self.status_text,
+            font=("Arial", 8),
+            foreground="gray"
+        ).grid(row=row, column=0, columnspan=2, sticky=tk.W)
+
+        # Zivy nahled zacatku listu vpravo od nastaveni
+        preview_frame = ttk.LabelFrame(main_frame, text="Náhled", padding="10")
+        preview_frame.grid(row=1, column=2, rowspan=row, sticky=(tk.N, tk.S, tk.W, tk.E), padx=(20, 0))
+        preview_frame.rowconfigure(0, weight=1)
+        preview_frame.columnconfigure(0, weight=1)
+        self.preview = tk.Text(
+            preview_frame,
+            width=PREVIEW_WIDTH,
+            height=PREVIEW_ROWS + 2,
+            wrap=tk.NONE,
+            font="TkFixedFont",
+            state=tk.DISABLED
+        )
+        self.preview.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.W, tk.E))
+        preview_scroll = ttk.Scrollbar(preview_frame, orient=tk.HORIZONTAL, command=self.preview.xview)
+        preview_scroll.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.preview.configure(xscrollcommand=preview_scroll.set)
+
+        # Kazda zmena nastaveni naplanuje prekresleni nahledu (s odstupem, viz _schedule_preview);
+        # nahled se generuje ve vlakne, bezi nejvyse jedno a zastarale vysledky se zahodi
+        self._preview_job = None
+        self._preview_serial = 0
+        self._preview_thread = None
+        self._preview_pending = None
+        self._preview_results = queue.Queue()
+        for var in (
+            self.op_add, self.op_sub, self.op_mul, self.op_div, self.max_digits, self.max_result, self.terms,
+            self.no_zero, self.no_one, self.count, self.cols, self.fill_mode, self.title_text, self.seed,
+            self.carries, self.table, self.full_digits,
+        ):
+            var.trace_add("write", self._schedule_preview)
+        self._update_preview()
+
+        # Stav bezici ulohy (pracovni vlakno, fronta zprav, priznak zruseni)
+        self._worker = None
+        self._messages = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._stage = None
+        self._stage_start = 0.0
+
+        # Konfigurace gridu pro roztahovani: nastaveni na vysku, nahled do sirky i vysky
+        root.rowconfigure(0, weight=1)
+        root.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+        main_frame.columnconfigure(2, weight=1)
+        options_frame.columnconfigure(1, weight=1)
+
+        # Okno podle obsahu, nejvyse velikost obrazovky (zbytek nastaveni se posouva)
+        self._fit_window()
+
+        # Okno se zobrazi hned; openpyxl se naimportuje na pozadi, az bude okno necinne
+        self.root.after_idle(self._warm_up_writer)
+
+    def _schedule_preview(self, *_):
+        """
+        Naplanuje prekresleni nahledu (debounce).
 
-        # Konfigurace gridu pro roztahovani
-        main_frame.columnconfigure(1, weight=1)
+        Pri rychlych zmenach (drzeni sipky u spinboxu, psani) se predchozi
+        naplanovane prekresleni zrusi, takze se nahled generuje az po
+        PREVIEW_DELAY_MS bez dalsi zmeny.
+        """
+        if self._preview_job is not None:
+            self.root.after_cancel(self._preview_job)
+        self._preview_job = self.root.after(PREVIEW_DELAY_MS, self._update_preview)
 
-    def _center_window(self):
-        """Vycentruje okno na stredu obrazovky."""
-        self.root.update_idletasks()
+    def _update_preview(self):
+        """
+        Precte nastaveni a spusti generovani nahledu ve vlakne (viz _run_preview).
+
+        Tk promenne cte jen hlavni vlakno. Pokud nahled uz bezi, zapamatuje
+        se jen posledni pozadavek a spusti se po jeho dokonceni; vysledek
+        starsiho nastaveni se nezobrazi.
+        """
+        self._preview_job = None
+        self._preview_serial += 1
+        try:
+            max_result = self.max_result.get()
+            seed_text = self.seed.get().strip()
+            params = dict(
+                ops=self._get_selected_operations(),
+                count=self.count.get(),
+                rows=PREVIEW_ROWS,
+                max_result=max_result if max_result > 0 else None,
+                max_digits=self.max_digits.get(),
+                seed=int(seed_text) if seed_text else None,
+                cols=self.cols.get(),
+                fill_mode=self.fill_mode.get(),
+                no_zero=self.no_zero.get(),
+                no_one=self.no_one.get(),
+                difficulty=self._get_difficulty(),
+                terms=self.terms.get()
+            )
+            title = self.title_text.get()
+        except (tk.TclError, ValueError):
+            # Rozepsana nebo neplatna hodnota (prazdny spinbox, zadna operace, ...)
+            self._preview_pending = None
+            self._show_preview([PREVIEW_INVALID])
+            return
+
+        request = (self._preview_serial, params, title)
+        if self._preview_thread is not None:
+            self._preview_pending = request
+            return
+        self._start_preview(request)
+
+    def _start_preview(self, request):
+        """Spusti vlakno nahledu pro pozadavek (poradi, argumenty preview_lines, nadpis)."""
+        self._preview_thread = threading.Thread(target=self._run_preview, args=request, daemon=True)
+        self._preview_thread.start()
+        self.root.after(PREVIEW_POLL_MS, self._poll_preview)
+
+    def _run_preview(self, serial, params, title):
+        """
+        Vlakno nahledu: vygeneruje radky (bez openpyxl) a posle je do fronty.
+
+        Velke limity (zejmena retezce) mohou trvat i sekundy, hlavni vlakno
+        zatim obsluhuje okno; s Tk widgety pracuje jen _poll_preview.
+        """
+        try:
+            lines = preview_lines(**params)
+            if title:
+                lines = [title, ""] + lines
+        except ValueError:
+            lines = [PREVIEW_INVALID]
+        except Exception as e:
+            lines = [f"(chyba náhledu: {e})"]
+        self._preview_results.put((serial, lines))
 
-        # Ziskani rozmeru okna
-        window_width = self.root.winfo_width()
-        window_height = self.root.winfo_height()
+    def _poll_preview(self):
+        """Zobrazi hotovy nahled, pokud odpovida aktualnimu nastaveni, a spusti cekajici pozadavek."""
+        try:
+            serial, lines = self._preview_results.get_nowait()
+        except queue.Empty:
+            self.root.after(PREVIEW_POLL_MS, self._poll_preview)
+            return
+
+        self._preview_thread = None
+        if serial == self._preview_serial:
+            self._show_preview(lines)
+        if self._preview_pending is not None:
+            request, self._preview_pending = self._preview_pending, None
+            self._start_preview(request)
+
+    def _show_preview(self, lines):
+        """Prepise text nahledu."""
+        self.preview.config(state=tk.NORMAL)
+        self.preview.delete("1.0", tk.END)
+        self.preview.insert("1.0", "\n".join(lines))
+        self.preview.config(state=tk.DISABLED)
+
+    def _warm_up_writer(self):
+        """Spusti import knihoven pro zapis Excelu ve vlakne na pozadi."""
+        threading.Thread(target=warm_up, daemon=True).start()
+
+    def _resize_options(self, _event=None):
+        """Prizpusobi platno ramci nastaveni (sirka, pozadovana vyska a oblast posouvani)."""
+        frame = self._options_frame
+        self._options_canvas.configure(
+            width=frame.winfo_reqwidth(),
+            height=frame.winfo_reqheight(),
+            scrollregion=(0, 0, frame.winfo_reqwidth(), frame.winfo_reqheight()),
+        )
+
+    def _on_wheel(self, event):
+        """Posune nastaveni koleckem mysi, pokud je kurzor nad nimi."""
+        canvas = str(self._options_canvas)
+        widget = str(event.widget)
+        if widget != canvas and not widget.startswith(canvas + "."):
+            return
+        # Windows a macOS posilaji delta, Linux tlacitka 4 a 5
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self._options_canvas.yview_scroll(step, "units")
+
+    def _fit_window(self):
+        """Nastavi velikost okna podle obsahu, nejvyse velikost obrazovky, a okno vycentruje."""
+        self.root.update_idletasks()
+        self._resize_options()
+        self.root.update_idletasks()
 
         # Ziskani rozmeru obrazovky
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
 
+        # Na nizsi obrazovce se okno zmensi, nastaveni se pak posouvaji
+        window_width = max(MIN_WINDOW_SIZE[0], min(self.root.winfo_reqwidth(), screen_width - SCREEN_MARGIN))
+        window_height = max(MIN_WINDOW_SIZE[1], min(self.root.winfo_reqheight(), screen_height - SCREEN_MARGIN))
+
         # Vypocet pozice pro vycentrovani
-        x = (screen_width // 2) - (window_width // 2)
-        y = (screen_height // 2) - (window_height // 2)
+        x = max(0, (screen_width - window_width) // 2)
+        y = max(0, (screen_height - window_height) // 2)
 
-        # Nastaveni pozice okna
-        self.root.geometry(f"+{x}+{y}")
+        # Nastaveni velikosti a pozice okna
+        self.root.geometry(f"{window_width}x{window_height}+{x}+{y}")
 
     def browse_file(self):
         """Otevre dialog pro vyber umisteni souboru."""
@@ -260,6 +569,20 @@ class MathGeneratorGUI:
             ops.append("/")
         return ops
 
+    def _get_difficulty(self):
+        """
+        Sestavi obtiznost z ovladacich prvku.
+
+        Returns:
+            Text obtiznosti pro generate_sheet (napr. "carries=1") nebo None
+        """
+        level = Difficulty(
+            carries=CARRY_CHOICES[self.carries.get()],
+            digits=self.max_digits.get() if self.full_digits.get() else None,
+            table=TABLE_CHOICES[self.table.get()],
+        )
+        return str(level) or None
+
     def _validate_inputs(self, ops, max_digits, count, cols, output_file):
         """
         Validuje vstupy od uzivatele.
@@ -290,7 +613,9 @@ class MathGeneratorGUI:
         return True
 
     def generate(self):
-        """Vygeneruje priklady podle zadanych parametru."""
+        """Spusti generovani prikladu podle zadanych parametru ve vlakne na pozadi."""
+        if self._worker is not None:
+            return
         try:
             # Ziskani operaci
             ops = self._get_selected_operations()
@@ -316,13 +641,16 @@ class MathGeneratorGUI:
             output_file = self.output_file.get()
             no_zero = self.no_zero.get()
             no_one = self.no_one.get()
+            unique = self.unique.get()
+            answers = "sheet" if self.answers.get() else None
+            difficulty = self._get_difficulty()
+            terms = self.terms.get()
 
             # Validace vstupu
             if not self._validate_inputs(ops, max_digits, count, cols, output_file):
                 return
 
-            # Generovani souboru
-            file_path = generate_sheet(
+            params = dict(
                 ops=ops,
                 count=count,
                 file_name=output_file,
@@ -333,8 +661,114 @@ class MathGeneratorGUI:
                 cols=cols,
                 fill_mode=fill_mode,
                 no_zero=no_zero,
-                no_one=no_one
+                no_one=no_one,
+                unique=unique,
+                answers=answers,
+                difficulty=difficulty,
+                terms=terms
             )
+        except Exception as e:
+            messagebox.showerror("Chyba", f"Nastala chyba při generování:\n{str(e)}")
+            return
+
+        # Generovani bezi ve vlakne, okno zustava responzivni
+        self._cancel_event.clear()
+        self._stage = None
+        self.generate_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress.config(mode="determinate", value=0)
+        self.status_text.set("Spouštím generování...")
+        self._worker = threading.Thread(target=self._run_job, args=(params,), daemon=True)
+        self._worker.start()
+        self.root.after(POLL_INTERVAL_MS, self._poll_messages)
+
+    def cancel(self):
+        """Pozada bezici generovani o zruseni (projevi se po nejblizsim bloku prikladu)."""
+        self._cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_text.set("Ruším generování...")
+
+    def _run_job(self, params):
+        """
+        Pracovni vlakno: vygeneruje soubor a vysledek posle do fronty zprav.
+
+        S Tk widgety pracuje jen hlavni vlakno (_poll_messages), vlakno
+        komunikuje vyhradne pres thread-safe frontu.
+
+        Args:
+            params: Argumenty pro generate_sheet
+        """
+        def report(stage, done, total):
+            # Cas se meri ve vlakne, zpravy se ve fronte mohou hromadit
+            self._messages.put(("progress", stage, done, total, time.perf_counter()))
+
+        try:
+            file_path = generate_sheet(progress=report, cancel=self._cancel_event, **params)
+        except GenerationCancelled:
+            self._messages.put(("cancelled",))
+        except Exception as e:
+            self._messages.put(("error", str(e)))
+        else:
+            self._messages.put(("done", file_path))
+
+    def _poll_messages(self):
+        """Zpracuje zpravy z pracovniho vlakna; dokud uloha bezi, naplanuje dalsi kontrolu."""
+        finished = None
+        try:
+            while True:
+                message = self._messages.get_nowait()
+                if message[0] == "progress":
+                    self._show_progress(*message[1:])
+                else:
+                    finished = message
+        except queue.Empty:
+            pass
+
+        if finished is None:
+            self.root.after(POLL_INTERVAL_MS, self._poll_messages)
+            return
+        self._finish_job(finished)
+
+    def _show_progress(self, stage, done, total, now):
+        """Aktualizuje progressbar a rychlost generovani (priklady za sekundu)."""
+        if stage != self._stage:
+            self._stage = stage
+            self._stage_start = now
+            if stage == "saving":
+                # Delku ukladani nelze odhadnout, progressbar jen ukazuje cinnost
+                self.progress.config(mode="indeterminate")
+                self.progress.start(20)
+
+        label = STAGE_LABELS.get(stage, stage)
+        if stage == "saving":
+            self.status_text.set(f"{label}...")
+            return
+
+        self.progress.config(value=done / total if total else 0)
+        text = f"{label}: {done:,} / {total:,}".replace(",", " ")
+        elapsed = now - self._stage_start
+        if elapsed > 0 and done:
+            rate = f"{done / elapsed:,.0f}".replace(",", " ")
+            text += f", {rate} příkladů/s"
+        self.status_text.set(text)
+
+    def _finish_job(self, message):
+        """Obnovi ovladaci prvky po dokonceni ulohy a zobrazi vysledek."""
+        self._worker = None
+        self.progress.stop()
+        self.progress.config(mode="determinate", value=0)
+        self.generate_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+
+        kind = message[0]
+        if kind == "cancelled":
+            self.status_text.set("Generování bylo zrušeno.")
+        elif kind == "error":
+            self.status_text.set("")
+            messagebox.showerror("Chyba", f"Nastala chyba při generování:\n{message[1]}")
+        else:
+            file_path = message[1]
+            self.status_text.set(f"Hotovo: {file_path}")
 
             # Zobrazeni uspesne zpravy
             messagebox.showinfo(
@@ -346,9 +780,6 @@ class MathGeneratorGUI:
             if messagebox.askyesno("Otevřít soubor?", "Chcete soubor otevřít?"):
                 self.open_file(file_path)
 
-        except Exception as e:
-            messagebox.showerror("Chyba", f"Nastala chyba při generování:\n{str(e)}")
-
     def open_file(self, file_path):
         """
         Otevre vygenerovany soubor v defaultni aplikaci.
@@ -374,7 +805,8 @@ class MathGeneratorGUI:
 def main():
     """Hlavni entry point pro GUI aplikaci."""
     root = tk.Tk()
-    app = MathGeneratorGUI(root)
+    # Okno drzi odkazy na aplikaci pres callbacky widgetu
+    MathGeneratorGUI(root)
     root.mainloop()
 
 
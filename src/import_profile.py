@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Diagnostika casu startu jednotlivych vstupnich bodu.
+
+Pro kazdy vstupni bod spusti novy interpret s volbou -X importtime,
+z jeho vystupu secte cas importu a vypise nejdrazsi moduly. Vysledek
+lze ulozit jako JSON a sledovat tak naklady startu v case.
+
+Pouziti:
+    python src/main.py --import-profile [--json SOUBOR] [--top N] [VSTUPNI_BOD ...]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from cli import __version__
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Vstupni body a prikaz, ktery jejich start nasimuluje (argumenty pro python)
+ENTRY_POINTS = {
+    "cli": ["main.py", "--version"],
+    "gui": ["-c", "import gui"],
+    "batch": ["-c", "import batch"],
+    "server": ["-c", "import server"],
+    "audit": ["-c", "import audit"],
+    "writer": ["-c", "import cli; cli.warm_up()"],
+}
+
+
+def parse_importtime(stderr):
+    """
+    Rozparsuje vystup -X importtime.
+
+    Args:
+        stderr: Text standardniho chyboveho vystupu interpretu
+
+    Returns:
+        List slovniku {"module", "self_us", "cumulative_us", "depth"}
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        modules.append({
+            "module": stripped,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+            # Vnoreni je v -X importtime vyjadreno odsazenim po dvou mezerach
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+    return modules
+
+
+def profile_entry_point(name, top=10):
+    """
+    Zmeri start jednoho vstupniho bodu v novem interpretu.
+
+    Args:
+        name: Nazev vstupniho bodu (klic ENTRY_POINTS)
+        top: Pocet nejdrazsich modulu ve vysledku
+
+    Returns:
+        Slovnik s celkovym casem procesu, casem importu a nejdrazsimi moduly
+    """
+    cmd = [sys.executable, "-X", "importtime"] + ENTRY_POINTS[name]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=SRC_DIR, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    modules = parse_importtime(proc.stderr)
+    # Celkovy cas importu je soucet kumulativnich casu modulu nejvyssi urovne
+    import_us = sum(m["cumulative_us"] for m in modules if m["depth"] == 0)
+    top_level = sorted((m for m in modules if m["depth"] == 0), key=lambda m: m["cumulative_us"], reverse=True)
+    return {
+        "entry_point": name,
+        "command": " ".join(["python", "-X", "importtime"] + ENTRY_POINTS[name]),
+        "returncode": proc.returncode,
+        "wall_ms": round(wall * 1000, 1),
+        "import_ms": round(import_us / 1000, 1),
+        "modules": len(modules),
+        "openpyxl_loaded": any(m["module"] == "openpyxl" for m in modules),
+        "top": [
+            {"module": m["module"], "cumulative_ms": round(m["cumulative_us"] / 1000, 1)}
+            for m in top_level[:top]
+        ],
+    }
+
+
+def parse_args(argv=None):
+    """
+    Parsuje argumenty diagnostiky startu.
+
+    Returns:
+        Namespace s argumenty
+    """
+    p = argparse.ArgumentParser(
+        prog="python src/main.py --import-profile",
+        description=f"Mereni casu startu vstupnich bodu (-X importtime) | v{__version__}",
+    )
+    p.add_argument(
+        "entry_points",
+        nargs="*",
+        metavar="VSTUPNI_BOD",
+        help=f"Vstupni body k mereni: {', '.join(ENTRY_POINTS)}. Vychozi: vsechny",
+    )
+    p.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        metavar="CISLO",
+        help="Pocet nejdrazsich modulu ve vypisu. Vychozi: 10",
+    )
+    p.add_argument(
+        "--json",
+        type=str,
+        default=None,
+        metavar="SOUBOR",
+        help="Ulozit vysledky jako JSON pro sledovani v case",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    """Hlavni entry point diagnostiky startu."""
+    args = parse_args(argv)
+    unknown = [name for name in args.entry_points if name not in ENTRY_POINTS]
+    if unknown:
+        print(f"Chyba: neznamy vstupni bod: {', '.join(unknown)} (mozne: {', '.join(ENTRY_POINTS)})", file=sys.stderr)
+        sys.exit(2)
+    if getattr(sys, "frozen", False):
+        print("Chyba: diagnostika startu vyzaduje spusteni ze zdrojovych kodu, ne z buildu.", file=sys.stderr)
+        sys.exit(2)
+
+    results = [profile_entry_point(name, top=args.top) for name in (args.entry_points or ENTRY_POINTS)]
+    for r in results:
+        loaded = "ano" if r["openpyxl_loaded"] else "ne"
+        print(f"{r['entry_point']}: proces {r['wall_ms']:.1f} ms, importy {r['import_ms']:.1f} ms, "
+              f"modulu {r['modules']}, openpyxl nacten: {loaded}")
+        for m in r["top"]:
+            print(f"    {m['cumulative_ms']:8.1f} ms  {m['module']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"version": __version__, "python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"Vysledky ulozeny: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
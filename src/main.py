@@ -4,10 +4,13 @@ Jednotný vstupní bod pro generátor matematických příkladů.
 
 Bez argumentů nebo s běžnými CLI argumenty spouští CLI rozhraní.
 S argumentem --gui spouští grafické rozhraní.
+S prvním argumentem batch spouští hromadné generování podle manifestu.
+S prvním argumentem serve spouští lokální HTTP službu pro generování listů.
+S prvním argumentem audit měří rozložení, opakování a propustnost generátorů.
+S argumentem --import-profile měří čas startu jednotlivých vstupních bodů.
 """
 
 import sys
-import argparse
 
 def main():
     """Hlavní vstupní funkce."""
@@ -19,6 +22,23 @@ def main():
         # Importovat a spustit GUI
         from gui import main as gui_main
         gui_main()
+    elif '--import-profile' in sys.argv:
+        # Diagnostika startu (-X importtime) pro jednotlive vstupni body
+        sys.argv.remove('--import-profile')
+        from import_profile import main as profile_main
+        profile_main()
+    elif len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        # Importovat a spustit hromadne generovani (bez slova batch v argumentech)
+        from batch import main as batch_main
+        batch_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        # Lokalni HTTP sluzba (asyncio), generovani v pracovnich procesech
+        from server import main as server_main
+        server_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == 'audit':
+        # Audit generatoru (rozlozeni, poruseni omezeni, propustnost)
+        from audit import main as audit_main
+        audit_main(sys.argv[2:])
     else:
         # Importovat a spustit CLI
         from cli import main as cli_main
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Vektorovy engine pro hromadne generovani prikladu pomoci NumPy.
+
+Misto generovani prikladu po jednom vytvori cele sloupce operandu a vysledku
+najednou. Omezeni (max_result, max_digits, no_zero, no_one, nezaporne
+odcitani, deleni beze zbytku) se aplikuji maskovanou vektorovou aritmetikou
+nad mezemi, ktere uz predpocital GenerationPlan z cli.py.
+
+NumPy je volitelna zavislost - pokud neni nainstalovana, is_available()
+vraci False a generate_sheet pouzije ciste Python generovani.
+"""
+from cli import OP_SYMBOLS, ProblemSet
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - zavisi na prostredi
+    np = None
+
+
+def is_available():
+    """Vrati True, pokud je NumPy k dispozici."""
+    return np is not None
+
+
+def _add_columns(sampler, n, gen):
+    """Vektorova obdoba AddSampler.sample."""
+    min_val = sampler.min_val
+    max_number = sampler.max_number
+    max_result = sampler.max_result
+    a = gen.integers(min_val, sampler.max_a, size=n, endpoint=True)
+    max_b = np.minimum(max_number, max_result - a)
+    # Kde je max_b moc male, vybereme mensi a (stejne jako fallback v AddSampler)
+    low = max_b < min_val
+    k = int(low.sum())
+    if k:
+        sampler.fallback_retry_a += k
+        a[low] = gen.integers(min_val, min(max_number, max_result - min_val), size=k, endpoint=True)
+        max_b[low] = np.minimum(max_number, max_result - a[low])
+    b = gen.integers(min_val, max_b, endpoint=True)
+    return a, b, a + b
+
+
+def _sub_columns(sampler, n, gen):
+    """Vektorova obdoba SubSampler.sample."""
+    a = gen.integers(sampler.min_a, sampler.max_a, size=n, endpoint=True)
+    b = gen.integers(sampler.min_val, np.minimum(sampler.max_number, a - sampler.b_offset), endpoint=True)
+    return a, b, a - b
+
+
+def _mul_columns(sampler, n, gen):
+    """Vektorova obdoba MulSampler.sample."""
+    min_val = sampler.min_val
+    # Fallback pokud neexistuje zadne platne a
+    if sampler.hi < min_val:
+        sampler.fallback_no_valid_a += n
+        a = np.full(n, min_val, dtype=np.int64)
+        return a, a.copy(), a * a
+
+    a = gen.integers(min_val, sampler.hi, size=n, endpoint=True)
+    # Pro a = 0 je jediny kandidat 0 × 0; deleni nulou obejdeme maskou
+    zero = a == 0
+    max_b = np.minimum(sampler.max_result // np.maximum(a, 1), sampler.max_number)
+    b = gen.integers(min_val, max_b, endpoint=True)
+    b[zero] = 0
+    return a, b, a * b
+
+
+def _div_columns(sampler, n, gen):
+    """Vektorova obdoba DivSampler.sample (rovnomerne z indexu bloku nebo pasem delitelu)."""
+    ends = np.asarray(sampler._ends, dtype=np.int64)
+    starts = np.asarray(sampler._starts, dtype=np.int64)
+    widths = np.asarray(sampler._widths, dtype=np.int64)
+    firsts = np.asarray(sampler._firsts, dtype=np.int64)
+    b = np.empty(n, dtype=np.int64)
+    c = np.empty(n, dtype=np.int64)
+    # Bez indexu se body nad hyperbolou zamitnou a tahaji znovu (viz DivSampler)
+    todo = np.arange(n)
+    while todo.size:
+        i = gen.integers(0, sampler.size, size=todo.size)
+        block = np.searchsorted(ends, i, side="right")
+        tb, tc = np.divmod(i - starts[block], widths[block])
+        tb += firsts[block]
+        tc += sampler.min_val
+        ok = np.ones(todo.size, dtype=bool) if sampler.indexed else tc <= sampler.max_a // tb
+        b[todo[ok]] = tb[ok]
+        c[todo[ok]] = tc[ok]
+        todo = todo[~ok]
+    return b * c, b, c
+
+
+_COLUMN_FUNCS = {
+    "+": _add_columns,
+    "-": _sub_columns,
+    "×": _mul_columns,
+    "/": _div_columns,
+}
+
+
+def make_generator(seed=None):
+    """
+    Vytvori numpy.random.Generator pro dany seed.
+
+    Raises:
+        RuntimeError: Pokud NumPy neni nainstalovano
+    """
+    if np is None:
+        raise RuntimeError("NumPy neni nainstalovano (pip install numpy).")
+    return np.random.default_rng(seed)
+
+
+def sample_columns(plan, n, seed=None, gen=None):
+    """
+    Vygeneruje n prikladu jako sloupce celych cisel.
+
+    Args:
+        plan: GenerationPlan s predpocitanymi mezemi operaci
+        n: Pocet prikladu
+        seed: Volitelny seed pro numpy.random.Generator (default: None)
+        gen: Existujici numpy.random.Generator; pokud je zadan, seed se ignoruje
+
+    Returns:
+        Tuple (a, op, b, vysledek) numpy poli delky n; op obsahuje indexy
+        do OP_SYMBOLS
+
+    Raises:
+        RuntimeError: Pokud NumPy neni nainstalovano
+    """
+    if gen is None:
+        gen = make_generator(seed)
+    a = np.empty(n, dtype=np.int64)
+    b = np.empty(n, dtype=np.int64)
+    result = np.empty(n, dtype=np.int64)
+    op = np.empty(n, dtype=np.int8)
+
+    # Nahodny vyber operace pro kazdy priklad (se stejnymi vahami jako plan.ops)
+    choice = gen.integers(0, len(plan.ops), size=n)
+    by_sampler = {}
+    for i, o in enumerate(plan.ops):
+        by_sampler.setdefault(id(plan.samplers[o]), (plan.samplers[o], []))[1].append(i)
+
+    for sampler, indices in by_sampler.values():
+        mask = np.isin(choice, indices)
+        k = int(mask.sum())
+        if not k:
+            continue
+        col_a, col_b, col_r = _COLUMN_FUNCS[sampler.symbol](sampler, k, gen)
+        a[mask] = col_a
+        b[mask] = col_b
+        result[mask] = col_r
+        op[mask] = OP_SYMBOLS.index(sampler.symbol)
+
+    return a, op, b, result
+
+
+def problem_set(a, op, b, result):
+    """
+    Prevede sloupce ze sample_columns na ProblemSet bez prevodu na Python cisla.
+
+    Returns:
+        ProblemSet se stejnymi priklady
+    """
+    problems = ProblemSet()
+    for column, values in ((problems.a, a), (problems.op, op), (problems.b, b), (problems.result, result)):
+        column.frombytes(values.astype(np.dtype(column.typecode), copy=False).tobytes())
+    return problems
+
+
+def problem_sampler(plan):
+    """
+    Vrati funkci take(gen, n), ktera vygeneruje n prikladu jako ProblemSet.
+
+    Hodi se tam, kde se priklady zpracovavaji po blocich (streamovany zapis):
+    kazdy blok je jedno vektorove volani, vysledkem je ProblemSet stejne
+    jako u Python enginu.
+
+    Args:
+        plan: GenerationPlan s predpocitanymi mezemi operaci
+
+    Returns:
+        Funkce take(gen, n)
+    """
+    def take(gen, n):
+        return problem_set(*sample_columns(plan, n, gen=gen))
+
+    return take
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Lokalni HTTP sluzba pro generovani listu s priklady na vyzadani.
+
+Server bezi na asyncio a standardni knihovne (bez webovych frameworku).
+Endpoint /generate prijima stejne parametry jako CLI (klice jako v manifestu
+batch: ops, digits, max, count, cols, fill, seed, title, ...) v query stringu
+(GET) nebo jako JSON objekt v tele (POST) a vraci rovnou obsah .xlsx.
+
+Samotne generovani bezi v omezenem ProcessPoolExecutor, takze smycka
+udalosti nikdy neblokuje. Pocet soubeznych generovani omezuje semafor,
+kazdy pozadavek ma casovy limit (vcetne cekani ve fronte) a /metrics
+vraci pocty pozadavku, latence a propustnost jako JSON. S --cache se
+seedovane listy berou z cache.SheetCache bez pracovniho procesu; vypocet
+klice, hledani v cache i cteni souboru bezi ve vychozim executoru smycky.
+
+Pouziti:
+    python src/main.py serve [--host 127.0.0.1] [--port 8000] [--workers N]
+        [--max-concurrent N] [--timeout SEKUNDY] [--cache ADRESAR]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from urllib.parse import parse_qsl, urlsplit
+
+from batch import _cli_defaults, generate_kwargs, normalize_job
+from cli import cache_params, generate_sheet, __version__
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Parametry CLI, ktere server neprijima (vystup jde do odpovedi, ne na disk;
+# procesy si pozadavek nesmi vynutit)
+SERVER_EXCLUDED_KEYS = ("out", "profile", "cache", "cache_size", "workers")
+
+# Limity jednoho pozadavku
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+HEADER_TIMEOUT = 10.0
+
+# Velikost bloku pri odesilani souboru
+SEND_CHUNK_BYTES = 256 * 1024
+
+# Pocet poslednich latenci, ze kterych se pocitaji percentily v /metrics
+LATENCY_WINDOW = 4096
+
+STATUS_TEXTS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    504: "Gateway Timeout",
+}
+
+
+class HttpError(Exception):
+    """Chyba pozadavku, ktera se vrati klientovi s danym HTTP kodem."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Metrics:
+    """
+    Pocitadla pozadavku pro endpoint /metrics.
+
+    Latence se drzi jen pro poslednich LATENCY_WINDOW pozadavku, pamet
+    je tak omezena bez ohledu na dobu behu serveru.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.in_flight = 0
+        self.by_status = {}
+        self.sheets = 0
+        self.cache_hits = 0
+        self.problems = 0
+        self.bytes_sent = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, status, seconds, problems=0, sent=0):
+        """Zaznamena jeden dokonceny pozadavek (mimo /metrics)."""
+        self.requests += 1
+        self.by_status[str(status)] = self.by_status.get(str(status), 0) + 1
+        self.latencies.append(seconds)
+        if status == 200 and problems:
+            self.sheets += 1
+            self.problems += problems
+        self.bytes_sent += sent
+
+    def snapshot(self):
+        """Vrati aktualni stav jako slovnik (pro JSON)."""
+        uptime = time.monotonic() - self.started
+        ordered = sorted(self.latencies)
+
+        def percentile(q):
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4) if ordered else None
+
+        return {
+            "version": __version__,
+            "uptime_seconds": round(uptime, 3),
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "by_status": dict(self.by_status),
+            "sheets": self.sheets,
+            "cache_hits": self.cache_hits,
+            "problems": self.problems,
+            "bytes_sent": self.bytes_sent,
+            "requests_per_second": round(self.requests / uptime, 3) if uptime else 0.0,
+            "problems_per_second": round(self.problems / uptime, 1) if uptime else 0.0,
+            "latency_seconds": {
+                "window": len(ordered),
+                "mean": round(sum(ordered) / len(ordered), 4) if ordered else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(ordered[-1], 4) if ordered else None,
+            },
+        }
+
+
+def parse_params(query, body, defaults):
+    """
+    Sestavi normalizovanou ulohu z query stringu a pripadneho JSON tela.
+
+    Args:
+        query: Query string URL (napr. "ops=%2B-&count=40")
+        body: Telo pozadavku (bytes, JSON objekt) nebo prazdne
+        defaults: Vychozi hodnoty CLI (viz batch._cli_defaults)
+
+    Returns:
+        Normalizovana uloha (viz batch.normalize_job)
+
+    Raises:
+        HttpError: 400 pri neplatnem JSON, neznamem nebo nepovolenem parametru
+    """
+    raw = dict(parse_qsl(query, keep_blank_values=True))
+    if body:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HttpError(400, "Telo pozadavku neni platny JSON.") from None
+        if not isinstance(data, dict):
+            raise HttpError(400, "Telo pozadavku musi byt JSON objekt.")
+        raw.update(data)
+
+    excluded = sorted(set(raw) & set(SERVER_EXCLUDED_KEYS))
+    if excluded:
+        raise HttpError(400, f"Parametr neni na serveru povolen: {', '.join(excluded)}")
+    try:
+        job = normalize_job(raw, defaults)
+    except (TypeError, ValueError) as e:
+        raise HttpError(400, str(e)) from None
+    # Druhy soubor by nebylo kam vratit - reseni jde jen jako dalsi list
+    if job["answers"] == "file":
+        raise HttpError(400, "Rezim reseni 'file' neni na serveru podporovan, pouzijte 'sheet'.")
+    return job
+
+
+def render_sheet(kwargs, cache=None):
+    """
+    Vygeneruje list do pameti (bezi v pracovnim procesu).
+
+    Returns:
+        Obsah souboru .xlsx jako bytes (bez docasneho souboru na disku).
+        Vysledek se z pracovniho procesu vraci picklovanim, ktere data
+        zkopiruje, a memoryview z getbuffer (jako v cli.generate_sheet_bytes)
+        picklovat nelze - proto getvalue.
+    """
+    buffer = io.BytesIO()
+    generate_sheet(file_name=buffer, cache=cache, **kwargs)
+    return buffer.getvalue()
+
+
+def open_cached(cache, kwargs):
+    """
+    Najde seedovany list v cache a otevre ho (bezi mimo smycku udalosti).
+
+    Returns:
+        Tuple (otevreny soubor, velikost) nebo None, pokud list v cache neni
+
+    Raises:
+        ValueError: Pri neplatnych parametrech (napr. obtiznosti)
+    """
+    paths = cache.lookup(cache.key(cache_params(**kwargs)))
+    if not paths:
+        return None
+    try:
+        # Otevre se pred odeslanim hlavicek - pozdejsi smazani (cache) uz odpoved nerozbije
+        f = open(paths[0], "rb")
+    except FileNotFoundError:
+        return None  # Zaznam mezitim vyrazen z cache, vygeneruje se znovu
+    return f, os.fstat(f.fileno()).st_size
+
+
+class SheetServer:
+    """
+    HTTP server s omezenym poctem soubeznych generovani.
+
+    Args:
+        executor: concurrent.futures executor pro generate_sheet
+        max_concurrent: Nejvyssi pocet soubezne generovanych listu;
+            dalsi pozadavky cekaji ve fronte
+        timeout: Casovy limit jednoho generovani vcetne cekani ve fronte (s)
+        max_count: Nejvyssi povoleny pocet prikladu v jednom pozadavku
+        cache: Volitelna cache.SheetCache pro seedovane listy
+    """
+
+    def __init__(self, executor, max_concurrent=4, timeout=60.0, max_count=1_000_000, cache=None):
+        self.executor = executor
+        self.cache = cache
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.timeout = timeout
+        self.max_count = max_count
+        self.metrics = Metrics()
+        self.defaults = {k: v for k, v in _cli_defaults().items() if k not in SERVER_EXCLUDED_KEYS}
+
+    async def handle(self, reader, writer):
+        """Obslouzi jedno spojeni (jeden pozadavek, pak Connection: close)."""
+        start = time.perf_counter()
+        self.metrics.in_flight += 1
+        path, status, problems, sent = None, 500, 0, 0
+        try:
+            try:
+                method, path, query, body = await self._read_request(reader)
+                status, problems, sent = await self._dispatch(writer, method, path, query, body)
+            except HttpError as e:
+                status = e.status
+                sent = await self._send_json(writer, e.status, {"error": str(e)})
+            except Exception as e:  # pragma: no cover - neocekavana chyba serveru
+                if isinstance(e, (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError)):
+                    raise
+                status = 500
+                sent = await self._send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            # Klient zavrel spojeni nebo neposlal pozadavek vcas
+            status = 400 if status == 500 else status
+        finally:
+            self.metrics.in_flight -= 1
+            # Latence /metrics by zkreslovaly statistiku generovani
+            if path != "/metrics":
+                self.metrics.record(status, time.perf_counter() - start, problems, sent)
+            writer.close()
+
+    async def _read_request(self, reader):
+        """
+        Precte pozadavek (radek, hlavicky, pripadne telo).
+
+        Returns:
+            Tuple (method, path, query, body)
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), HEADER_TIMEOUT)
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "Hlavicky pozadavku jsou prilis dlouhe.") from None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Neplatny radek pozadavku.") from None
+
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(400, "Neplatna hlavicka Content-Length.") from None
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, f"Telo pozadavku je vetsi nez {MAX_BODY_BYTES} B.")
+        body = await asyncio.wait_for(reader.readexactly(length), HEADER_TIMEOUT) if length else b""
+
+        url = urlsplit(target)
+        return method.upper(), url.path, url.query, body
+
+    async def _dispatch(self, writer, method, path, query, body):
+        """
+        Vybere endpoint podle cesty.
+
+        Returns:
+            Tuple (status, pocet prikladu, odeslane bajty)
+        """
+        if path == "/metrics":
+            if method != "GET":
+                raise HttpError(405, "Endpoint /metrics podporuje jen GET.")
+            return 200, 0, await self._send_json(writer, 200, self.metrics.snapshot())
+        if path == "/generate":
+            if method not in ("GET", "POST"):
+                raise HttpError(405, "Endpoint /generate podporuje GET a POST.")
+            job = parse_params(query, body, self.defaults)
+            if not 0 <= job["count"] <= self.max_count:
+                raise HttpError(400, f"Pocet prikladu musi byt 0 az {self.max_count}.")
+            sent = await self._generate(writer, job)
+            return 200, job["count"], sent
+        raise HttpError(404, f"Neznamy endpoint: {path}")
+
+    async def _generate(self, writer, job):
+        """Vygeneruje list v executoru a posle ho klientovi; vrati odeslane bajty."""
+        kwargs = generate_kwargs(job)
+        loop = asyncio.get_running_loop()
+        if self.cache is not None and job["seed"] is not None:
+            try:
+                cached = await loop.run_in_executor(None, open_cached, self.cache, kwargs)
+            except ValueError as e:
+                raise HttpError(400, str(e)) from None
+            if cached is not None:
+                self.metrics.cache_hits += 1
+                return await self._send_file(writer, *cached)
+
+        async def run():
+            await self.semaphore.acquire()
+            future = loop.run_in_executor(self.executor, render_sheet, kwargs, self.cache)
+            # Misto se uvolni, az generovani opravdu skonci (i po vyprseni limitu)
+            future.add_done_callback(lambda _: self.semaphore.release())
+            return await asyncio.shield(future)
+
+        try:
+            data = await asyncio.wait_for(run(), self.timeout)
+        except asyncio.TimeoutError:
+            # Bezici generovani nelze prerusit, jeho vysledek se zahodi
+            raise HttpError(504, f"Generovani nestihlo casovy limit {self.timeout:g} s.") from None
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+        return await self._send_xlsx(writer, data)
+
+    async def _send_file(self, writer, f, size):
+        """Posle otevreny soubor .xlsx po blocich a zavre ho; cteni bezi mimo smycku udalosti."""
+        loop = asyncio.get_running_loop()
+        with f:
+            sent = await self._send_head(writer, 200, XLSX_CONTENT_TYPE, size, {
+                "Content-Disposition": 'attachment; filename="priklady.xlsx"',
+            })
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, SEND_CHUNK_BYTES)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+                sent += len(chunk)
+        return sent
+
+    async def _send_xlsx(self, writer, data):
+        """Posle obsah .xlsx z pameti; vrati odeslane bajty."""
+        sent = await self._send_head(writer, 200, XLSX_CONTENT_TYPE, len(data), {
+            "Content-Disposition": 'attachment; filename="priklady.xlsx"',
+        })
+        writer.write(data)
+        await writer.drain()
+        return sent + len(data)
+
+    async def _send_json(self, writer, status, data):
+        """Posle JSON odpoved; vrati odeslane bajty."""
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        sent = await self._send_head(writer, status, "application/json; charset=utf-8", len(payload))
+        writer.write(payload)
+        await writer.drain()
+        return sent + len(payload)
+
+    async def _send_head(self, writer, status, content_type, length, extra=None):
+        """Posle stavovy radek a hlavicky odpovedi; vrati odeslane bajty."""
+        headers = {"Content-Type": content_type, "Content-Length": str(length), "Connection": "close"}
+        headers.update(extra or {})
+        head = f"HTTP/1.1 {status} {STATUS_TEXTS.get(status, '')}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1"))
+        await writer.drain()
+        return len(head)
+
+
+async def serve(
+    host, port, workers=None, max_concurrent=None, timeout=60.0, max_count=1_000_000, cache=None, ready=None
+):
+    """
+    Spusti server a obsluhuje pozadavky az do preruseni.
+
+    Args:
+        host: Adresa, na ktere server nasloucha
+        port: Port (0 = libovolny volny)
+        workers: Pocet pracovnich procesu (default: None = pocet CPU)
+        max_concurrent: Nejvyssi pocet soubeznych generovani (default: None = workers)
+        timeout: Casovy limit jednoho generovani v sekundach
+        max_count: Nejvyssi povoleny pocet prikladu v jednom pozadavku
+        cache: Volitelna cache.SheetCache sdilena se pracovnimi procesy
+        ready: Volitelna funkce ready(host, port) zavolana po otevreni portu
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    # Procesy se nesmi forkovat z bezici smycky - zdedily by sokety prijatych
+    # spojeni a klient by po zavreni spojeni serverem nedostal konec dat
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        app = SheetServer(executor, max_concurrent or workers, timeout, max_count, cache)
+        server = await asyncio.start_server(app.handle, host, port, limit=MAX_HEADER_BYTES)
+        async with server:
+            if ready:
+                ready(*server.sockets[0].getsockname()[:2])
+            await server.serve_forever()
+
+
+def parse_args(argv=None):
+    """
+    Parsuje argumenty prikazu serve.
+
+    Returns:
+        Namespace s argumenty
+    """
+    p = argparse.ArgumentParser(
+        prog="python src/main.py serve",
+        description=f"Lokalni HTTP sluzba pro generovani listu | v{__version__}",
+    )
+    p.add_argument("--host", type=str, default="127.0.0.1", help="Adresa serveru. Vychozi: 127.0.0.1")
+    p.add_argument("--port", type=int, default=8000, help="Port serveru. Vychozi: 8000")
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="CISLO",
+        help="Pocet pracovnich procesu pro generovani. Vychozi: pocet CPU",
+    )
+    p.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=None,
+        metavar="CISLO",
+        help="Nejvyssi pocet soubezne generovanych listu, dalsi pozadavky cekaji. Vychozi: pocet procesu",
+    )
+    p.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        metavar="SEKUNDY",
+        help="Casovy limit jednoho pozadavku vcetne cekani ve fronte. Vychozi: 60",
+    )
+    p.add_argument(
+        "--max-count",
+        type=int,
+        default=1_000_000,
+        metavar="CISLO",
+        help="Nejvyssi pocet prikladu v jednom pozadavku. Vychozi: 1000000",
+    )
+    p.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        metavar="ADRESAR",
+        help="Adresar cache hotovych souboru pro seedovane pozadavky",
+    )
+    p.add_argument(
+        "--cache-size",
+        type=int,
+        default=512,
+        metavar="MB",
+        help="Nejvyssi velikost cache v MB. Vychozi: 512",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    """Hlavni entry point HTTP sluzby."""
+    args = parse_args(argv)
+
+    def ready(host, port):
+        print(f"Server bezi na http://{host}:{port}/ (generate, metrics), ukonceni Ctrl+C")
+
+    try:
+        cache = None
+        if args.cache:
+            from cache import SheetCache
+
+            cache = SheetCache(args.cache, args.cache_size * 1024 * 1024)
+        asyncio.run(serve(
+            args.host, args.port, workers=args.workers, max_concurrent=args.max_concurrent,
+            timeout=args.timeout, max_count=args.max_count, cache=cache, ready=ready,
+        ))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Chyba: {e}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Primy zapis XLSX pro pevne rozlozeni listu s priklady (bez openpyxl).
+
+Listy generatoru maji vzdy stejny tvar: volitelny titulek, mrizku textovych
+bunek se stejnym stylem, pevnou sirku sloupcu, vychozi vysku radku a uzke
+okraje. Misto obecneho objektoveho modelu openpyxl se XML listu sklada
+primo z textu radku a zapisuje do zipfile; ostatni casti balicku (styly,
+sesit, typy obsahu) jsou predpripravene sablony.
+
+Texty se zapisuji jako inline strings - priklady se na listu skoro
+neopakuji, takze tabulka sdilenych retezcu by soubor jen zvetsila a zapis
+by musel drzet vsechny texty v pameti.
+
+Vystup odpovida openpyxl (stejne styly Priklad a Nadpis, sirky sloupcu,
+vyska radku, okraje), jen bez tematu a s mensi tabulkou stylu.
+
+StableZipFile zapisuje vsechny casti s pevnym casem a atributy; s nim je
+vystup bajtove stabilni (stejne vstupy = stejny soubor) pro tento zapisovac
+i pro openpyxl (save_openpyxl).
+"""
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from cli import EXCEL_WIDTH, PAGE_MARGINS, PROBLEM_STYLE, ROW_HEIGHT, TITLE_STYLE
+
+# Pocet radku, po kterych se XML listu zapise do docasneho souboru
+FLUSH_ROWS = 1024
+
+# Pevny cas casti zipu a vlastnosti dokumentu pro bajtove stabilni vystup
+STABLE_DATE_TIME = (2000, 1, 1, 0, 0, 0)
+
+# Casti vetsi nez tato mez (s rezervou na rozsireni deflate) mohou presahnout
+# 2 GiB a potrebuji hlavicky ZIP64; mensi casti se zapisuji bez nich
+ZIP64_PART_BYTES = zipfile.ZIP64_LIMIT - (zipfile.ZIP64_LIMIT >> 8)
+
+# Indexy stylu v cellXfs (viz STYLES_XML)
+TITLE_XF = 1
+PROBLEM_XF = 2
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+STYLES_XML = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<styleSheet xmlns="{MAIN_NS}">'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><sz val="16"/><name val="Consolas"/></font>'
+    '<font><b/><sz val="18"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" applyAlignment="1">'
+    '<alignment horizontal="left" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="0"/>'
+    '</cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="0" xfId="2" applyFont="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="1" applyFont="1" applyAlignment="1">'
+    '<alignment horizontal="left" vertical="center"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="3">'
+    '<cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    f'<cellStyle name="{PROBLEM_STYLE}" xfId="1"/>'
+    f'<cellStyle name="{TITLE_STYLE}" xfId="2"/>'
+    '</cellStyles>'
+    '</styleSheet>'
+)
+
+ROOT_RELS_XML = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{PKG_REL_NS}">'
+    f'<Relationship Id="rId1" Type="{REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    f'<Relationship Id="rId2" Type="{PKG_REL_NS}/metadata/core-properties" Target="docProps/core.xml"/>'
+    f'<Relationship Id="rId3" Type="{REL_NS}/extended-properties" Target="docProps/app.xml"/>'
+    '</Relationships>'
+)
+
+APP_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+    '<Application>Microsoft Excel Compatible</Application></Properties>'
+)
+
+CORE_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+    'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+    '<dcterms:created xsi:type="dcterms:W3CDTF">{created}</dcterms:created>'
+    '<dcterms:modified xsi:type="dcterms:W3CDTF">{created}</dcterms:modified>'
+    '</cp:coreProperties>'
+)
+
+_SHEET_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+
+
+def _escape(text):
+    """Escapuje text pro XML vcetne uvozovek v atributech (titulky a nazvy listu zadava uzivatel)."""
+    return escape(text, {'"': "&quot;"})
+
+
+class StableZipFile(zipfile.ZipFile):
+    """
+    ZipFile, ktery kazdou cast zapise s pevnym casem, systemem a pravy.
+
+    Beznym zapisem se do zipu dostava aktualni cas (a u write() cas zmeny
+    docasneho souboru), takze dva jinak shodne soubory se lisi v bajtech.
+    """
+
+    def _stable_info(self, name):
+        info = zipfile.ZipInfo(name, STABLE_DATE_TIME)
+        info.compress_type = self.compression
+        info.create_system = 3
+        info.external_attr = 0o600 << 16
+        return info
+
+    def writestr(self, zinfo_or_arcname, data, compress_type=None, compresslevel=None):
+        if not isinstance(zinfo_or_arcname, zipfile.ZipInfo):
+            zinfo_or_arcname = self._stable_info(zinfo_or_arcname)
+        super().writestr(zinfo_or_arcname, data, compress_type, compresslevel)
+
+    def write(self, filename, arcname=None, compress_type=None, compresslevel=None):
+        with open(filename, "rb") as src:
+            with self.open_stable(arcname or filename, os.fstat(src.fileno()).st_size) as out:
+                shutil.copyfileobj(src, out, 1 << 20)
+
+    def open_stable(self, name, size=None):
+        """
+        Otevre novou cast pro zapis (s pevnymi metadaty).
+
+        Args:
+            name: Nazev casti v archivu
+            size: Velikost nekomprimovanych dat; ZIP64 se vynuti jen pro casti
+                nad ZIP64_PART_BYTES nebo neznamou velikost (default: None)
+        """
+        force_zip64 = size is None or size > ZIP64_PART_BYTES
+        return self.open(self._stable_info(name), "w", force_zip64=force_zip64)
+
+
+def save_openpyxl(wb, file_name):
+    """
+    Ulozi sesit openpyxl bajtove stabilne.
+
+    Casy vytvoreni a zmeny dokumentu se nastavi na STABLE_DATE_TIME a vsechny
+    casti se zapisi pres StableZipFile (jinak stejne jako Workbook.save).
+    """
+    from openpyxl.writer.excel import ExcelWriter
+
+    wb.properties.created = wb.properties.modified = datetime.datetime(*STABLE_DATE_TIME)
+    ExcelWriter(wb, StableZipFile(file_name, "w", zipfile.ZIP_DEFLATED, allowZip64=True)).save()
+
+
+def column_letter(index):
+    """Vrati pismeno sloupce Excelu pro index od 1 (1 -> A, 27 -> AA)."""
+    letters = ""
+    while index > 0:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class Worksheet:
+    """
+    List zapisovany po radcich do docasneho souboru.
+
+    Rozhrani odpovida listum, ktere pouziva cli._stream_sheet: begin(cols,
+    title) a append(texts). Hlavicka listu (rozmer, sloupce) se doplni az
+    pri ulozeni sesitu, kdy je znamy pocet radku.
+
+    Args:
+        name: Nazev listu
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.cols = 0
+        self.row = 0
+        self._file = tempfile.TemporaryFile()
+        self._buffer = []
+        self._cell_starts = []
+
+    def begin(self, cols, title=None):
+        """
+        Pripravi list pro cols sloupcu a zapise pripadny titulek.
+
+        Args:
+            cols: Pocet sloupcu s priklady
+            title: Volitelny titulek v bunce A1 (priklady pak zacinaji na radku 3)
+        """
+        self.cols = cols
+        # Zacatek bunky bez cisla radku, napr. '<c r="B' - cislo se doplni pri zapisu
+        self._cell_starts = [f'<c r="{column_letter(c)}' for c in range(1, cols + 1)]
+        if title:
+            self._buffer.append(
+                f'<row r="1"><c r="A1" s="{TITLE_XF}" t="inlineStr">'
+                f'<is><t xml:space="preserve">{_escape(title)}</t></is></c></row>'
+            )
+            self.row = 2
+
+    def append(self, texts):
+        """
+        Zapise jeden radek textu do sloupcu zleva (texty se escapuji pro XML).
+
+        Args:
+            texts: Texty bunek radku; kratsi radek nechava posledni sloupce prazdne
+        """
+        self.row += 1
+        row = str(self.row)
+        cell_end = f'{row}" s="{PROBLEM_XF}" t="inlineStr"><is><t xml:space="preserve">'
+        starts = self._cell_starts
+        self._buffer.append(
+            f'<row r="{row}">'
+            + "".join(f"{starts[c]}{cell_end}{escape(text)}</t></is></c>" for c, text in enumerate(texts))
+            + "</row>"
+        )
+        if len(self._buffer) >= FLUSH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        self._file.write("".join(self._buffer).encode("utf-8"))
+        self._buffer.clear()
+
+    def _header(self):
+        """Vrati zacatek XML listu (az po otevreni sheetData)."""
+        last = f"{column_letter(max(self.cols, 1))}{max(self.row, 1)}"
+        cols_xml = "".join(
+            f'<col min="{c}" max="{c}" width="{EXCEL_WIDTH}" customWidth="1"/>' for c in range(1, self.cols + 1)
+        )
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+            f'<dimension ref="A1:{last}"/>'
+            '<sheetViews><sheetView workbookViewId="0"/></sheetViews>'
+            f'<sheetFormatPr defaultRowHeight="{ROW_HEIGHT}" customHeight="1"/>'
+            + (f"<cols>{cols_xml}</cols>" if cols_xml else "")
+            + "<sheetData>"
+        )
+
+    def _footer(self):
+        """Vrati konec XML listu (za sheetData)."""
+        margins = " ".join(f'{side}="{inches}"' for side, inches in PAGE_MARGINS)
+        return f"</sheetData><pageMargins {margins}/></worksheet>"
+
+    def write_to(self, zf, part_name):
+        """Zapise kompletni XML listu do zip archivu (StableZipFile) a uvolni docasny soubor."""
+        self._flush()
+        header = self._header().encode("utf-8")
+        footer = self._footer().encode("utf-8")
+        size = len(header) + self._file.tell() + len(footer)
+        self._file.seek(0)
+        with zf.open_stable(part_name, size) as out:
+            out.write(header)
+            shutil.copyfileobj(self._file, out, 1 << 20)
+            out.write(footer)
+        self._file.close()
+
+
+class Workbook:
+    """
+    Sesit s listy Worksheet; save() zapise cely balicek XLSX.
+
+    Rozhrani odpovida tomu, co z openpyxl pouziva generate_sheet:
+    create_sheet(name) a save(file_name).
+    """
+
+    def __init__(self):
+        self.sheets = []
+
+    def create_sheet(self, name):
+        """Prida novy list na konec sesitu a vrati ho."""
+        sheet = Worksheet(name)
+        self.sheets.append(sheet)
+        return sheet
+
+    def _content_types(self):
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{_SHEET_CONTENT_TYPE}"/>'
+            for i in range(1, len(self.sheets) + 1)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '<Override PartName="/docProps/core.xml" '
+            'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+            '<Override PartName="/docProps/app.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/>'
+            f"{overrides}</Types>"
+        )
+
+    def _workbook(self):
+        sheets = "".join(
+            f'<sheet name="{_escape(sheet.name)}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, sheet in enumerate(self.sheets, 1)
+        )
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+            '<bookViews><workbookView activeTab="0"/></bookViews>'
+            f"<sheets>{sheets}</sheets></workbook>"
+        )
+
+    def _workbook_rels(self):
+        n = len(self.sheets)
+        rels = "".join(
+            f'<Relationship Id="rId{i}" Type="{REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, n + 1)
+        )
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{PKG_REL_NS}">{rels}'
+            f'<Relationship Id="rId{n + 1}" Type="{REL_NS}/styles" Target="styles.xml"/>'
+            "</Relationships>"
+        )
+
+    def save(self, file_name, stable=False):
+        """
+        Zapise sesit do souboru .xlsx.
+
+        Args:
+            file_name: Cesta k vystupnimu souboru
+            stable: Pokud True, cas vytvoreni dokumentu je STABLE_DATE_TIME
+                a stejny sesit da vzdy stejne bajty (default: False)
+        """
+        created = "%04d-%02d-%02dT%02d:%02d:%02dZ" % (STABLE_DATE_TIME if stable else time.gmtime()[:6])
+        # Casti zipu maji pevna metadata vzdy; cas dokumentu je v core.xml
+        with StableZipFile(file_name, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("[Content_Types].xml", self._content_types())
+            zf.writestr("_rels/.rels", ROOT_RELS_XML)
+            zf.writestr("docProps/app.xml", APP_XML)
+            zf.writestr("docProps/core.xml", CORE_XML.format(created=created))
+            zf.writestr("xl/workbook.xml", self._workbook())
+            zf.writestr("xl/_rels/workbook.xml.rels", self._workbook_rels())
+            zf.writestr("xl/styles.xml", STYLES_XML)
+            for i, sheet in enumerate(self.sheets, 1):
+                sheet.write_to(zf, f"xl/worksheets/sheet{i}.xml")
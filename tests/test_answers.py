@@ -0,0 +1,61 @@
+"""Testy listu a souboru s resenim (generate_sheet s answers)."""
+import pytest
+
+import cli
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _values(path):
+    wb = openpyxl.load_workbook(path)
+    return {ws.title: [list(row) for row in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+
+
+def _check_answers(problems, answers):
+    """Reseni ma stejnou mrizku a kazda bunka je priklad se spravnym vysledkem."""
+    assert answers[0][0] == problems[0][0] + " - reseni"
+    assert len(answers) == len(problems)
+    for problem_row, answer_row in zip(problems[2:], answers[2:]):
+        assert len(problem_row) == len(answer_row)
+        for problem, answer in zip(problem_row, answer_row):
+            if problem is None:
+                assert answer is None
+                continue
+            left, _, result = answer.rpartition(" = ")
+            assert problem == f"{left} = ___"
+            # Retezce maji zavorky podle poradi vypoctu, takze plati bezna priorita operaci
+            assert eval(left.replace("×", "*").replace("/", "//")) == int(result)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("fill_mode", ["down", "across"])
+@pytest.mark.parametrize("terms", [2, 4])
+def test_answer_sheet(tmp_path, stream, fill_mode, terms):
+    path = tmp_path / "priklady.xlsx"
+    cli.generate_sheet(
+        list("+-*/"), 50, seed=3, cols=3, title="Test", fill_mode=fill_mode, terms=terms, stream=stream,
+        answers="sheet", writer="fast", file_name=str(path),
+    )
+    sheets = _values(path)
+    assert list(sheets) == [cli.PROBLEM_SHEET, cli.ANSWER_SHEET]
+    _check_answers(sheets[cli.PROBLEM_SHEET], sheets[cli.ANSWER_SHEET])
+
+
+@pytest.mark.parametrize("writer", ["openpyxl", "fast"])
+def test_answer_file(tmp_path, writer):
+    path = tmp_path / "priklady.xlsx"
+    cli.generate_sheet(["+", "/"], 40, seed=5, title="Test", answers="file", writer=writer, file_name=str(path))
+    problems = _values(path)
+    answers = _values(cli.answer_file_name(str(path)))
+    assert list(problems) == [cli.PROBLEM_SHEET]
+    assert list(answers) == [cli.ANSWER_SHEET]
+    _check_answers(problems[cli.PROBLEM_SHEET], answers[cli.ANSWER_SHEET])
+
+
+def test_answers_do_not_change_problems(tmp_path):
+    # Reseni se sestavi z uz spocitanych vysledku - priklady zustanou stejne
+    paths = {}
+    for answers in (None, "sheet"):
+        paths[answers] = tmp_path / f"{answers}.xlsx"
+        cli.generate_sheet(list("+-*/"), 60, seed=8, answers=answers, writer="fast", file_name=str(paths[answers]))
+    assert _values(paths["sheet"])[cli.PROBLEM_SHEET] == _values(paths[None])[cli.PROBLEM_SHEET]
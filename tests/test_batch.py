@@ -0,0 +1,52 @@
+"""Testy hromadneho generovani podle manifestu (batch.py)."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from batch import load_manifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "src", "main.py")
+
+
+def _manifest(tmp_path, jobs):
+    path = tmp_path / "ulohy.json"
+    path.write_text(json.dumps({"jobs": jobs}), encoding="utf-8")
+    return str(path)
+
+
+def test_rejects_cli_only_keys(tmp_path):
+    path = _manifest(tmp_path, [{"ops": "+", "out": "a.xlsx", "profile": "text"}])
+    with pytest.raises(ValueError, match="Uloha 1: Parametr neni v manifestu povolen: profile"):
+        load_manifest(path)
+
+
+def test_rejects_unknown_keys(tmp_path):
+    with pytest.raises(ValueError, match="Neznamy parametr"):
+        load_manifest(_manifest(tmp_path, [{"ops": "+", "out": "a.xlsx", "colour": "red"}]))
+
+
+@pytest.mark.parametrize("writer", ["fast", "openpyxl"])
+def test_matches_single_cli_run(tmp_path, writer):
+    if writer == "openpyxl":
+        pytest.importorskip("openpyxl")
+    job = {
+        "ops": "+-*/", "digits": 2, "count": 60, "cols": 2, "seed": 11, "title": "Test", "no_one": True,
+        "answers": "sheet", "writer": writer,
+    }
+    batch_out = tmp_path / "batch.xlsx"
+    manifest = _manifest(tmp_path, [dict(job, out=str(batch_out))])
+    subprocess.run(
+        [sys.executable, MAIN, "batch", manifest, "--workers", "1", "--report", str(tmp_path / "zprava.json")],
+        check=True, capture_output=True,
+    )
+    cli_out = tmp_path / "cli.xlsx"
+    subprocess.run(
+        [sys.executable, MAIN, "--ops", "+-*/", "--digits", "2", "--count", "60", "--cols", "2", "--seed", "11",
+         "--title", "Test", "--no-one", "--answers", "sheet", "--writer", writer, "--out", str(cli_out)],
+        check=True, capture_output=True,
+    )
+    assert batch_out.read_bytes() == cli_out.read_bytes()
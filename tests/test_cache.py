@@ -0,0 +1,62 @@
+"""Testy cache hotovych sesitu (cache.SheetCache)."""
+import os
+import time
+
+import pytest
+
+import cli
+from cache import SheetCache
+
+
+def _generate(path, cache, **kwargs):
+    params = dict(ops=list("+-*/"), count=60, seed=12, title="Cache", writer="fast")
+    params.update(kwargs)
+    cli.generate_sheet(file_name=str(path), cache=cache, **params)
+
+
+@pytest.mark.parametrize("answers", [None, "file"])
+def test_hit_returns_same_bytes(tmp_path, monkeypatch, answers):
+    cache = SheetCache(str(tmp_path / "cache"))
+    first = tmp_path / "prvni.xlsx"
+    _generate(first, cache, answers=answers)
+
+    # Pri zasahu se nic negeneruje
+    def fail(*_):
+        raise AssertionError("list se generoval znovu")
+
+    monkeypatch.setattr(cli, "_sheet_counts", fail)
+    second = tmp_path / "druhy.xlsx"
+    _generate(second, cache, answers=answers)
+    assert second.read_bytes() == first.read_bytes()
+    if answers == "file":
+        assert (
+            open(cli.answer_file_name(str(second)), "rb").read() == open(cli.answer_file_name(str(first)), "rb").read()
+        )
+
+
+def test_other_parameters_miss(tmp_path):
+    cache = SheetCache(str(tmp_path / "cache"))
+    _generate(tmp_path / "a.xlsx", cache)
+    _generate(tmp_path / "b.xlsx", cache, seed=13)
+    _generate(tmp_path / "c.xlsx", cache, cols=3)
+    # Alias operace a explicitne zadana vychozi hodnota maji stejny klic
+    _generate(tmp_path / "d.xlsx", cache, ops=list("+-x/"), cols=2)
+    assert len(os.listdir(cache.directory)) == 3
+    assert (tmp_path / "d.xlsx").read_bytes() == (tmp_path / "a.xlsx").read_bytes()
+
+
+def test_eviction_is_lru_by_mtime(tmp_path):
+    cache = SheetCache(str(tmp_path / "cache"))
+    now = time.time()
+    for i, key in enumerate(("a", "b", "c")):
+        cache.store(key, b"x" * 100)
+        # Vytvoreni postupne v minulosti: a nejstarsi, c nejnovejsi
+        os.utime(os.path.join(cache.directory, key + ".xlsx"), (now - 300 + 100 * i,) * 2)
+
+    # Zasah obnovi cas zmeny - nejdele nepouzity je ted b
+    assert cache.lookup("a")
+    cache.max_bytes = 250
+    assert cache.evict() == 1
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") and cache.lookup("c")
+    assert sorted(os.listdir(cache.directory)) == ["a.xlsx", "c.xlsx"]
@@ -0,0 +1,52 @@
+"""Testy retezovych prikladu (chain.py)."""
+import os
+import random
+import subprocess
+import sys
+import time
+
+import pytest
+
+from chain import MAX_VALUE, ChainSampler, implied_max_result
+from cli import GenerationPlan
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_implied_max_result():
+    assert implied_max_result(["+", "-"], 3, 99) == 297
+    assert implied_max_result(["+", "×"], 3, 9999) == 9999 * 9999
+
+
+def test_clamped_without_max():
+    sampler = ChainSampler(["×"], 3, max_digits=4)
+    assert sampler.max_result == MAX_VALUE
+
+
+def test_explicit_max_above_limit():
+    with pytest.raises(ValueError):
+        ChainSampler(["×"], 3, max_result=MAX_VALUE + 1)
+
+
+@pytest.mark.parametrize("digits,warned", [(2, False), (4, True)])
+def test_cli_warns_about_clamp(tmp_path, digits, warned):
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "src", "main.py"), "--digits", str(digits), "--terms", "3",
+         "--ops", "*", "--count", "10", "--writer", "fast", "--out", str(tmp_path / "retezce.xlsx")],
+        capture_output=True, text=True, check=True,
+    )
+    assert ("omezen na" in result.stderr) == warned
+
+
+def test_plans_share_prepared_sampler():
+    # Mapy vsech posloupnosti se spocitaji jednou; dalsi listy a nahledy uz jen losuji
+    settings = dict(max_digits=5, no_zero=True, no_one=True, terms=5)
+    start = time.perf_counter()
+    first = GenerationPlan(list("+-*/"), **settings)
+    assert time.perf_counter() - start < 10
+    for seed in range(3):
+        start = time.perf_counter()
+        plan = GenerationPlan(list("+-*/"), **settings)
+        assert plan.samplers["+"] is first.samplers["+"]
+        assert len(plan.sample_many(90, random.Random(seed))) == 90
+        assert time.perf_counter() - start < 1
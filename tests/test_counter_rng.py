@@ -0,0 +1,49 @@
+"""Testy citacoveho generatoru (rng_mode="counter", cli.problems_at)."""
+import random
+
+import pytest
+
+import cli
+from chain import chain_text
+
+openpyxl = pytest.importorskip("openpyxl")
+
+OPS = list("+-*/")
+COUNT = 75
+
+
+def _text(problem):
+    return f"{chain_text(problem[:-1:2], problem[1:-1:2])} = ___"
+
+
+def _sheet_texts(path):
+    """Texty bunek v poradi prikladu (rozlozeni across, bez titulku)."""
+    ws = openpyxl.load_workbook(path).active
+    return [" ".join(text.split()) for row in ws.iter_rows(values_only=True) for text in row if text]
+
+
+@pytest.mark.parametrize("terms", [2, 3])
+def test_random_access_matches_sheet_for_any_workers(tmp_path, terms):
+    expected = [_text(p) for p in cli.problems_at(OPS, 0, COUNT, 21, max_digits=2, no_one=True, terms=terms)]
+    for workers in (1, 2, 3):
+        path = tmp_path / f"w{workers}.xlsx"
+        cli.generate_sheet(
+            OPS, COUNT, max_digits=2, no_one=True, terms=terms, seed=21, cols=4, fill_mode="across", title=None,
+            rng_mode="counter", workers=workers, writer="fast", file_name=str(path),
+        )
+        assert _sheet_texts(path) == expected
+
+    # Jednotlive priklady v libovolnem poradi bez generovani predchozich
+    for i in random.Random(1).sample(range(COUNT), 10):
+        assert cli.problems_at(OPS, i, i + 1, 21, max_digits=2, no_one=True, terms=terms) == [
+            cli.problems_at(OPS, 0, COUNT, 21, max_digits=2, no_one=True, terms=terms)[i]
+        ]
+
+
+def test_problems_at_depends_on_seed_and_config():
+    base = cli.problems_at(OPS, 0, 20, 5)
+    assert cli.problems_at(OPS, 0, 20, 5) == base
+    assert cli.problems_at(OPS, 0, 20, 6) != base
+    assert cli.problems_at(OPS, 0, 20, 5, max_digits=3) != base
+    # Priklady nezavisi na tom, kde usek zacina
+    assert cli.problems_at(OPS, 7, 20, 5) == base[7:]
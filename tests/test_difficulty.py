@@ -0,0 +1,42 @@
+"""Testy generatoru obtiznosti (difficulty.py)."""
+import random
+
+import pytest
+
+from cli import DivSampler, MulSampler
+from difficulty import Difficulty, DivDifficultySampler, MulDifficultySampler, table_tier
+
+
+def _mul_pairs(sampler):
+    return {(a, b) for a, low, high in sampler.space_rows() for b in range(low, high + 1)}
+
+
+@pytest.mark.parametrize("max_digits,max_result", [(2, None), (3, 500), (2, 50)])
+@pytest.mark.parametrize("no_zero,no_one", [(False, False), (True, False), (False, True)])
+@pytest.mark.parametrize("level", [Difficulty(table=t) for t in (1, 2, 3, 4)] + [Difficulty(digits=1)])
+def test_mul_matches_mul_sampler(level, no_zero, no_one, max_digits, max_result):
+    # Stejne meze jako MulSampler, vcetne jedineho prikladu 0 × 0 pro a = 0
+    # a cinitele a omezeneho vysledkem, kdyz je max_result < max_number
+    base = MulSampler(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+    sampler = MulDifficultySampler(
+        level, max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one
+    )
+    expected = {
+        (a, b) for a, b in _mul_pairs(base)
+        if (level.table is None or max(table_tier(a), table_tier(b)) == level.table)
+        and (level.digits is None or len(str(a)) == len(str(b)) == level.digits)
+    }
+    assert {sampler.pairs.pair(i) for i in range(sampler.size)} == expected
+
+
+def test_div_limits_without_index():
+    assert DivSampler.limits(max_digits=2, no_one=True)[2:4] == (2, 99)
+    for digits in (18, 19, 25):
+        sampler = DivDifficultySampler(Difficulty(table=2), max_digits=digits)
+        a, _, b, c = sampler.sample(random.Random(digits))
+        assert a == b * c and 2 == max(table_tier(b), table_tier(c))
+
+
+def test_digits_level_is_bounded():
+    with pytest.raises(ValueError):
+        Difficulty(digits=19)
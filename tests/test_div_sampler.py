@@ -0,0 +1,57 @@
+"""Testy rovnomerneho generatoru deleni (cli.DivSampler)."""
+import random
+from collections import Counter
+
+import pytest
+
+import cli
+from cli import DivSampler, GenerationPlan
+
+
+def _check(sampler, problems):
+    for a, op, b, c in problems:
+        assert op == "/"
+        assert a == b * c
+        assert a <= sampler.max_a
+        assert sampler.min_b <= b <= sampler.max_b
+        assert c >= sampler.min_val
+
+
+@pytest.mark.parametrize("digits", [1, 2, 8, 9, 14, 18, 19, 25])
+@pytest.mark.parametrize("no_zero,no_one", [(False, False), (True, True)])
+def test_extreme_digits(digits, no_zero, no_one):
+    sampler = DivSampler(max_digits=digits, no_zero=no_zero, no_one=no_one)
+    _check(sampler, sampler.sample_many(500, random.Random(digits)))
+
+
+def test_large_limits_use_bands():
+    # Index bloku by mel ~2 * 10^7 polozek, pasem je jen O(log max_a)
+    sampler = DivSampler(max_digits=14)
+    assert not sampler.indexed
+    assert len(sampler._ends) < 64
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+@pytest.mark.parametrize("no_zero", [False, True])
+def test_uniform(monkeypatch, indexed, no_zero):
+    if not indexed:
+        monkeypatch.setattr(cli, "DIV_INDEX_LIMIT", 0)
+    sampler = DivSampler(max_result=20, no_zero=no_zero)
+    assert sampler.indexed == indexed
+    valid = {(b, c) for b, low, high in sampler.space_rows() for c in range(low, high + 1)}
+    n = 100 * len(valid)
+    counts = Counter((b, c) for _, _, b, c in sampler.sample_many(n, random.Random(7)))
+    assert set(counts) == valid
+    assert max(counts.values()) < 1.5 * n / len(valid)
+    assert min(counts.values()) > 0.5 * n / len(valid)
+
+
+def test_generate_extreme_digits(tmp_path):
+    out = tmp_path / "deleni.xlsx"
+    cli.generate_sheet(["/"], 50, max_digits=19, seed=1, file_name=str(out), writer="fast")
+    assert out.stat().st_size
+
+
+def test_plan_with_many_digits_is_fast():
+    plan = GenerationPlan(list("+-*/"), max_digits=14)
+    assert len(plan.sample_many(100, random.Random(1))) == 100
@@ -0,0 +1,45 @@
+"""Testy volby NumPy enginu a jeho mezi int64."""
+import io
+
+import pytest
+
+import cli
+from cli import GenerationPlan, cache_params, generate_sheet, numpy_fits, use_numpy_engine
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("ops,digits,fits", [
+    ("+", 18, True),
+    ("+", 19, False),
+    ("*", 9, True),
+    ("*", 10, False),
+    ("/", 17, True),
+    # Pocet bodu pasem deleni uz presahuje int64
+    ("/", 18, False),
+    ("+-*/", 3, True),
+])
+def test_numpy_fits(ops, digits, fits):
+    assert numpy_fits(GenerationPlan(list(ops), max_digits=digits)) == fits
+    assert use_numpy_engine(list(ops), max_digits=digits) == fits
+    assert cache_params(list(ops), 10, max_digits=digits, engine="numpy")["engine"] == ("numpy" if fits else "python")
+
+
+@pytest.mark.parametrize("ops,digits", [("*", 10), ("+", 19), ("/", 18)])
+def test_generate_falls_back_to_python(ops, digits):
+    buffer = io.BytesIO()
+    generate_sheet(list(ops), 40, buffer, max_digits=digits, seed=1, engine="numpy", writer="fast")
+    python = io.BytesIO()
+    generate_sheet(list(ops), 40, python, max_digits=digits, seed=1, engine="python", writer="fast")
+    assert buffer.getvalue() == python.getvalue()
+
+
+def test_numpy_columns_within_bounds():
+    import numpy_engine
+
+    plan = GenerationPlan(list("+-*/"), max_digits=9)
+    a, op, b, result = numpy_engine.sample_columns(plan, 20000, seed=3)
+    symbols = np.array(cli.OP_SYMBOLS)[op]
+    assert (result[symbols == "×"] == (a * b)[symbols == "×"]).all()
+    assert (a[symbols == "/"] == (b * result)[symbols == "/"]).all()
+    assert (a >= 0).all() and (b >= 0).all() and (result >= 0).all()
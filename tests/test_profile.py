@@ -0,0 +1,31 @@
+"""Testy profilovani generate_sheet (profile=True)."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Ciste spusteni - zapisovac jeste neni naimportovany
+SCRIPT = """
+import io, json, cli
+_, report = cli.generate_sheet(["+"], 90, io.BytesIO(), seed=1, profile=True, writer=WRITER)
+print(json.dumps(report))
+"""
+
+
+@pytest.mark.parametrize("writer", ["fast", "openpyxl"])
+def test_import_outside_wall_clock(writer):
+    if writer == "openpyxl":
+        pytest.importorskip("openpyxl")
+    out = subprocess.run(
+        [sys.executable, "-c", SCRIPT.replace("WRITER", repr(writer))],
+        cwd=SRC, capture_output=True, text=True, check=True,
+    ).stdout
+    report = json.loads(out)
+    assert report["import_seconds"] >= 0
+    assert {"plan", "sampling", "cells", "save"} <= set(report["phases"])
+    # Celkovy cas tvori faze a drobna rezie, ne import zapisovace
+    assert report["wall_seconds"] - sum(report["phases"].values()) < 0.2
@@ -0,0 +1,79 @@
+"""Smoke testy HTTP sluzby (server.SheetServer) nad endpointem /generate."""
+import asyncio
+import io
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cache import SheetCache
+from server import SheetServer
+
+
+async def _request(port, method, target, body=b""):
+    """Posle jeden pozadavek a vrati (HTTP kod, telo)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    return int(data.split(b" ", 2)[1]), data.partition(b"\r\n\r\n")[2]
+
+
+def _serve(requests, cache=None):
+    """Spusti server na volnem portu, posle postupne pozadavky a vrati (odpovedi, server)."""
+
+    async def run():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            app = SheetServer(executor, max_concurrent=1, timeout=30.0, cache=cache)
+            server = await asyncio.start_server(app.handle, "127.0.0.1", 0)
+            async with server:
+                port = server.sockets[0].getsockname()[1]
+                return [await _request(port, *request) for request in requests], app
+
+    return asyncio.run(run())
+
+
+def _call(method, target, body=b""):
+    """Posle jeden pozadavek na novy server (viz _serve)."""
+    return _serve([(method, target, body)])[0][0]
+
+
+def _assert_xlsx(status, body):
+    assert status == 200, body
+    with zipfile.ZipFile(io.BytesIO(body)) as zf:
+        assert "xl/workbook.xml" in zf.namelist()
+
+
+def test_generate_get():
+    _assert_xlsx(*_call("GET", "/generate?ops=%2B-&count=20&seed=1&writer=fast"))
+
+
+def test_generate_post():
+    body = json.dumps({"ops": "*/", "count": 20, "seed": 2, "writer": "fast"}).encode("utf-8")
+    _assert_xlsx(*_call("POST", "/generate", body))
+
+
+def test_generate_default_writer():
+    pytest.importorskip("openpyxl")
+    _assert_xlsx(*_call("GET", "/generate?count=20&seed=3"))
+
+
+def test_generate_rejects_workers():
+    status, body = _call("GET", "/generate?workers=4&writer=fast")
+    assert status == 400
+    assert "workers" in json.loads(body)["error"]
+
+
+def test_generate_from_cache(tmp_path):
+    target = "/generate?ops=%2B&count=30&seed=5&writer=fast"
+    (first, second, invalid), app = _serve(
+        [("GET", target), ("GET", target), ("GET", "/generate?seed=5&difficulty=carries%3D9&writer=fast")],
+        cache=SheetCache(str(tmp_path)),
+    )
+    _assert_xlsx(*first)
+    assert second == first
+    assert app.metrics.cache_hits == 1
+    assert invalid[0] == 400
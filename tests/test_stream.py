@@ -0,0 +1,42 @@
+"""Testy streamovaciho zapisu listu (generate_sheet se stream=True)."""
+import pytest
+
+import cli
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _values(path):
+    wb = openpyxl.load_workbook(path)
+    return {ws.title: [list(row) for row in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+
+
+def _generate(tmp_path, stream, writer, **kwargs):
+    path = tmp_path / f"{'stream' if stream else 'pamet'}-{writer}.xlsx"
+    cli.generate_sheet(
+        list("+-*/"), file_name=str(path), seed=9, title="Stream", answers="sheet", stream=stream, writer=writer,
+        **kwargs,
+    )
+    return _values(path)
+
+
+@pytest.mark.parametrize("writer", ["openpyxl", "fast"])
+@pytest.mark.parametrize("fill_mode", ["down", "across"])
+def test_stream_matches_in_memory(tmp_path, writer, fill_mode):
+    kwargs = dict(count=95, cols=4, fill_mode=fill_mode)
+    assert _generate(tmp_path, True, writer, **kwargs) == _generate(tmp_path, False, writer, **kwargs)
+
+
+@pytest.mark.parametrize("fill_mode", ["down", "across"])
+def test_stream_splits_at_row_limit(tmp_path, monkeypatch, fill_mode):
+    # Titulek zabere 2 radky, na list se vejde (10 - 2) * 3 = 24 prikladu
+    monkeypatch.setattr(cli, "EXCEL_MAX_ROWS", 10)
+    kwargs = dict(count=70, cols=3, fill_mode=fill_mode)
+    streamed = _generate(tmp_path, True, "fast", **kwargs)
+    assert streamed == _generate(tmp_path, False, "fast", **kwargs)
+    problems = [name for name in streamed if name.startswith(cli.PROBLEM_SHEET)]
+    assert problems == ["Priklady", "Priklady 2", "Priklady 3"]
+    for name in problems:
+        assert len(streamed[name]) <= 10
+    cells = [text for name in problems for row in streamed[name][2:] for text in row if text]
+    assert len(cells) == 70
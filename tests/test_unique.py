@@ -0,0 +1,44 @@
+"""Testy vyberu bez opakovani (GenerationPlan.sample_unique)."""
+import itertools
+import random
+import time
+
+import pytest
+
+from cli import AddSampler, DivSampler, GenerationPlan, MulSampler, ProblemSpace, SubSampler
+
+
+@pytest.mark.parametrize("cls", [AddSampler, SubSampler, MulSampler, DivSampler])
+def test_space_size_matches_space(cls):
+    for max_result, max_digits, no_zero, no_one in itertools.product(
+        (None, 0, 1, 5, 17, 99, 150), (None, 1, 2), (False, True), (False, True)
+    ):
+        try:
+            sampler = cls(max_result=max_result, max_digits=max_digits, no_zero=no_zero, no_one=no_one)
+        except ValueError:
+            continue
+        assert sampler.space_size() == ProblemSpace([sampler]).size
+
+
+@pytest.mark.parametrize("digits", [9, 18])
+def test_large_space_is_not_enumerated(digits):
+    plan = GenerationPlan(list("+-*/"), max_digits=digits)
+    start = time.perf_counter()
+    problems = plan.sample_unique(90, random.Random(1))
+    assert time.perf_counter() - start < 2
+    assert len({p[:3] for p in problems}) == 90
+
+
+def test_too_few_problems_fails_fast():
+    plan = GenerationPlan(["+"], max_digits=1)
+    assert plan.space_size() == 100
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="jen 100"):
+        plan.sample_unique(101, random.Random(1))
+    assert time.perf_counter() - start < 1
+
+
+def test_small_space_is_exhausted():
+    plan = GenerationPlan(["*"], max_digits=1, no_zero=True)
+    problems = plan.sample_unique(plan.space_size(), random.Random(3))
+    assert {p[:3] for p in problems} == {(a, "×", b) for a in range(1, 10) for b in range(1, 10)}
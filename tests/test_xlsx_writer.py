@@ -0,0 +1,48 @@
+"""Testy primeho zapisu XLSX (xlsx_writer.py) proti openpyxl."""
+import struct
+import zipfile
+
+import pytest
+
+import cli
+from xlsx_writer import Workbook
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+def _values(path):
+    wb = openpyxl.load_workbook(path)
+    return {ws.title: [list(row) for row in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+
+
+@pytest.mark.parametrize("answers", [None, "sheet"])
+@pytest.mark.parametrize("terms", [2, 3])
+def test_matches_openpyxl_writer(tmp_path, answers, terms):
+    files = {}
+    for writer in ("openpyxl", "fast"):
+        files[writer] = tmp_path / f"{writer}.xlsx"
+        cli.generate_sheet(
+            list("+-*/"), 45, max_digits=2, seed=4, cols=4, title='Třída 3.B "A & <B>"', answers=answers,
+            terms=terms, writer=writer, file_name=str(files[writer]),
+        )
+    assert _values(files["fast"]) == _values(files["openpyxl"])
+
+
+def test_escapes_cell_text(tmp_path):
+    wb = Workbook()
+    ws = wb.create_sheet("List <1>")
+    ws.begin(2)
+    ws.append(["1 < 2 & 3 > 0", "a&amp;b"])
+    path = tmp_path / "text.xlsx"
+    wb.save(str(path))
+    assert _values(path) == {"List <1>": [["1 < 2 & 3 > 0", "a&amp;b"]]}
+
+
+def test_small_parts_without_zip64(tmp_path):
+    path = tmp_path / "list.xlsx"
+    cli.generate_sheet(["+"], 100, seed=1, writer="fast", file_name=str(path))
+    with zipfile.ZipFile(path) as zf, open(path, "rb") as f:
+        for info in zf.infolist():
+            # Delka extra pole v lokalni hlavicce (ZIP64 by ji mel nenulovou)
+            f.seek(info.header_offset)
+            assert struct.unpack("<4s5H3L2H", f.read(30))[-1] == 0, info.filename